@@ -5,6 +5,8 @@ from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.ai.context import ProjectContext
+
 
 async def get_stage_data(
     project_id: UUID,
@@ -12,22 +14,14 @@ async def get_stage_data(
     db: AsyncSession,
 ) -> dict[str, Any] | None:
     """Get data from a stage (standalone utility function)."""
-    from sqlalchemy import select
-    from app.models.stage import Stage
-
-    result = await db.execute(
-        select(Stage)
-        .where(Stage.project_id == project_id)
-        .where(Stage.type == stage_type)
-        .order_by(Stage.version.desc())
-    )
-    stage = result.scalars().first()
+    context = await ProjectContext.load(project_id, db)
+    stage = context.stage(stage_type)
 
     if stage:
         return {
-            "input_data": stage.input_data,
-            "output_data": stage.output_data,
-            "selected_option": stage.selected_option,
+            "input_data": stage["input_data"],
+            "output_data": stage["output_data"],
+            "selected_option": stage["selected_option"],
         }
     return None
 
@@ -41,7 +35,6 @@ class BaseAgent(ABC):
         """Return the stage type this agent handles."""
         pass
 
-    @abstractmethod
     async def generate(
         self,
         project_id: UUID,
@@ -54,11 +47,39 @@ class BaseAgent(ABC):
             project_id: The project ID
             db: Database session
 
+        Returns:
+            Output data dictionary
+        """
+        context = await self.get_context(project_id, db)
+        return await self.generate_from_context(context)
+
+    @abstractmethod
+    async def generate_from_context(
+        self,
+        context: ProjectContext,
+    ) -> dict[str, Any]:
+        """
+        Generate output from an already loaded project context.
+
+        Implementations must not use the database, so callers can release
+        their connection for the duration of the model call.
+
+        Args:
+            context: Latest data of every stage of the project
+
         Returns:
             Output data dictionary
         """
         pass
 
+    async def get_context(
+        self,
+        project_id: UUID,
+        db: AsyncSession,
+    ) -> ProjectContext:
+        """Get the latest data of every stage, memoized on the session."""
+        return await ProjectContext.load(project_id, db)
+
     async def get_previous_stage_data(
         self,
         project_id: UUID,
@@ -66,21 +87,4 @@ class BaseAgent(ABC):
         db: AsyncSession,
     ) -> dict[str, Any] | None:
         """Get data from a previous stage."""
-        from sqlalchemy import select
-        from app.models.stage import Stage
-
-        result = await db.execute(
-            select(Stage)
-            .where(Stage.project_id == project_id)
-            .where(Stage.type == stage_type)
-            .order_by(Stage.version.desc())
-        )
-        stage = result.scalars().first()
-
-        if stage:
-            return {
-                "input_data": stage.input_data,
-                "output_data": stage.output_data,
-                "selected_option": stage.selected_option,
-            }
-        return None
+        return await get_stage_data(project_id, stage_type, db)
@@ -1,10 +1,8 @@
 """Demo generation agent."""
 from typing import Any
-from uuid import UUID
-
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.ai.agents.base import BaseAgent
+from app.ai.context import ProjectContext
 from app.ai.gemini_client import get_gemini_client
 from app.ai.prompts.demo import DEMO_SYSTEM_PROMPT, DEMO_USER_PROMPT
 
@@ -16,41 +14,24 @@ class DemoAgent(BaseAgent):
     def stage_type(self) -> str:
         return "demo"
 
-    async def generate(
+    async def generate_from_context(
         self,
-        project_id: UUID,
-        db: AsyncSession,
+        context: ProjectContext,
     ) -> dict[str, Any]:
         """Generate React code for interactive demo."""
-        # Get previous stage data
-        idea_data = await self.get_previous_stage_data(project_id, "idea", db)
-        direction_data = await self.get_previous_stage_data(project_id, "direction", db)
-        features_data = await self.get_previous_stage_data(project_id, "features", db)
-        platform_data = await self.get_previous_stage_data(project_id, "platform", db)
-
-        if not features_data:
+        if not context.stage("features"):
             raise ValueError("Features stage data not found")
 
-        idea_content = idea_data["input_data"].get("content", "") if idea_data else ""
-        selected_direction = direction_data.get("selected_option", {}) if direction_data else {}
+        idea_content = context.idea
+        selected_direction = context.selected_direction
 
         # Get selected features
-        output_data = features_data.get("output_data") or {}
-        modules = output_data.get("modules") or []
-        selected_option = features_data.get("selected_option") or {}
-        selected_ids = selected_option.get("selected_ids") or []
-
-        # Filter to selected modules if any
-        if selected_ids:
-            modules = self._filter_selected_modules(modules, selected_ids)
+        modules = context.selected_modules
 
         # Get platform info for responsive design hints
         platform_info = ""
-        if platform_data:
-            output = platform_data.get("output_data", {})
-            platforms_list = output.get("platforms", [])
-            if platforms_list:
-                platform_info = f"目标平台: {', '.join(platforms_list)}"
+        if context.platforms:
+            platform_info = f"目标平台: {', '.join(context.platforms)}"
 
         # Call Gemini API
         client = get_gemini_client("pro")
@@ -71,20 +52,6 @@ class DemoAgent(BaseAgent):
 
         return result
 
-    def _filter_selected_modules(self, modules: list, selected_ids: list) -> list:
-        """Filter modules by selected IDs."""
-        result = []
-        for module in modules:
-            if module.get("id") in selected_ids:
-                result.append(module)
-            elif "sub_features" in module:
-                sub = self._filter_selected_modules(module["sub_features"], selected_ids)
-                if sub:
-                    module_copy = module.copy()
-                    module_copy["sub_features"] = sub
-                    result.append(module_copy)
-        return result
-
     def _format_features(self, modules: list, indent: int = 0) -> str:
         """Format features/modules as text for prompt."""
         lines = []
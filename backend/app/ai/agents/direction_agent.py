@@ -1,10 +1,8 @@
 """Direction generation agent."""
 from typing import Any
-from uuid import UUID
-
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.ai.agents.base import BaseAgent
+from app.ai.context import ProjectContext
 from app.ai.gemini_client import get_gemini_client
 from app.ai.prompts.direction import DIRECTION_SYSTEM_PROMPT, DIRECTION_USER_PROMPT
 
@@ -16,19 +14,18 @@ class DirectionAgent(BaseAgent):
     def stage_type(self) -> str:
         return "direction"
 
-    async def generate(
+    async def generate_from_context(
         self,
-        project_id: UUID,
-        db: AsyncSession,
+        context: ProjectContext,
     ) -> dict[str, Any]:
         """Generate product direction options based on the idea."""
         # Get idea stage data
-        idea_data = await self.get_previous_stage_data(project_id, "idea", db)
+        idea_data = context.stage("idea")
 
         if not idea_data or not idea_data.get("input_data"):
             raise ValueError("Idea stage data not found")
 
-        idea_content = idea_data["input_data"].get("content", "")
+        idea_content = context.idea
 
         # Call Gemini API
         client = get_gemini_client("pro")
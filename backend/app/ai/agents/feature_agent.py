@@ -1,10 +1,8 @@
 """Feature generation agent."""
 from typing import Any
-from uuid import UUID
-
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.ai.agents.base import BaseAgent
+from app.ai.context import ProjectContext
 from app.ai.gemini_client import get_gemini_client
 from app.ai.prompts.features import FEATURE_SYSTEM_PROMPT, FEATURE_USER_PROMPT
 
@@ -16,29 +14,26 @@ class FeatureAgent(BaseAgent):
     def stage_type(self) -> str:
         return "features"
 
-    async def generate(
+    async def generate_from_context(
         self,
-        project_id: UUID,
-        db: AsyncSession,
+        context: ProjectContext,
     ) -> dict[str, Any]:
         """Generate feature modules based on selected direction and platform."""
         # Get idea, direction, and platform data
-        idea_data = await self.get_previous_stage_data(project_id, "idea", db)
-        direction_data = await self.get_previous_stage_data(project_id, "direction", db)
-        platform_data = await self.get_previous_stage_data(project_id, "platform", db)
+        idea_data = context.stage("idea")
 
         if not idea_data or not idea_data.get("input_data"):
             raise ValueError("Idea stage data not found")
 
-        if not direction_data or not direction_data.get("selected_option"):
+        if not context.selected_direction:
             raise ValueError("Direction not selected")
 
-        if not platform_data or not platform_data.get("selected_option"):
+        if not context.platform_selection:
             raise ValueError("Platform not selected")
 
-        idea_content = idea_data["input_data"].get("content", "")
-        selected_direction = direction_data["selected_option"]
-        platform_selection = platform_data["selected_option"]
+        idea_content = context.idea
+        selected_direction = context.selected_direction
+        platform_selection = context.platform_selection
 
         # Extract platform info
         platforms = platform_selection.get("platforms", ["pc", "mobile"])
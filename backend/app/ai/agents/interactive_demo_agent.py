@@ -1,4 +1,5 @@
 """Interactive demo generation agent with streaming support."""
+import asyncio
 from typing import Any, AsyncGenerator
 from uuid import UUID
 import json
@@ -6,6 +7,7 @@ import json
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.ai.agents.base import BaseAgent
+from app.ai.context import ProjectContext
 from app.ai.gemini_client import get_gemini_client
 from app.ai.prompts.demo import (
     DEMO_STRUCTURE_SYSTEM_PROMPT,
@@ -24,20 +26,19 @@ class InteractiveDemoAgent(BaseAgent):
     def stage_type(self) -> str:
         return "demo"
 
-    async def generate(
+    async def generate_from_context(
         self,
-        project_id: UUID,
-        db: AsyncSession,
+        project_context: ProjectContext,
     ) -> dict[str, Any]:
         """
         Generate complete demo with structure and code.
         This is the synchronous interface for workflow compatibility.
         """
         # Phase 1: Generate structure
-        result = await self.generate_structure(project_id, db)
+        result = await self.generate_structure_from_context(project_context)
 
         # Phase 2: Generate code for each page
-        context = await self._get_project_context(project_id, db)
+        context = self.build_generation_context(project_context)
 
         for platform in result.get("platforms", []):
             platform_type = platform.get("type", "pc")
@@ -63,7 +64,15 @@ class InteractiveDemoAgent(BaseAgent):
         Phase 1: Generate demo structure quickly.
         Uses flash model for speed.
         """
-        context = await self._get_project_context(project_id, db)
+        project_context = await self.get_context(project_id, db)
+        return await self.generate_structure_from_context(project_context)
+
+    async def generate_structure_from_context(
+        self,
+        project_context: ProjectContext,
+    ) -> dict[str, Any]:
+        """Phase 1 from an already loaded project context."""
+        context = self.build_generation_context(project_context)
 
         client = get_gemini_client("flash")
 
@@ -121,10 +130,12 @@ class InteractiveDemoAgent(BaseAgent):
         self,
         page: dict[str, Any],
         context: dict[str, Any],
+        cancel_event: asyncio.Event | None = None,
     ) -> AsyncGenerator[str, None]:
         """
         Phase 2: Generate code for a single page with streaming.
-        Uses pro model for quality.
+        Uses pro model for quality. Setting `cancel_event` aborts the
+        model stream (GenerationCancelled).
         """
         client = get_gemini_client("pro")
 
@@ -154,6 +165,7 @@ class InteractiveDemoAgent(BaseAgent):
             system_instruction=DEMO_PAGE_SYSTEM_PROMPT,
             temperature=0.6,
             max_output_tokens=8192,
+            cancel_event=cancel_event,
         ):
             yield chunk
 
@@ -162,6 +174,7 @@ class InteractiveDemoAgent(BaseAgent):
         instruction: str,
         current_code: str,
         page_info: dict[str, Any],
+        cancel_event: asyncio.Event | None = None,
     ) -> AsyncGenerator[str, None]:
         """
         Modify a page based on user instruction with streaming.
@@ -180,6 +193,7 @@ class InteractiveDemoAgent(BaseAgent):
             system_instruction=DEMO_MODIFY_SYSTEM_PROMPT,
             temperature=0.6,
             max_output_tokens=8192,
+            cancel_event=cancel_event,
         ):
             yield chunk
 
@@ -189,41 +203,26 @@ class InteractiveDemoAgent(BaseAgent):
         db: AsyncSession,
     ) -> dict[str, Any]:
         """Get all relevant project context for generation."""
-        idea_data = await self.get_previous_stage_data(project_id, "idea", db)
-        direction_data = await self.get_previous_stage_data(project_id, "direction", db)
-        features_data = await self.get_previous_stage_data(project_id, "features", db)
-        platform_data = await self.get_previous_stage_data(project_id, "platform", db)
-
-        idea_content = ""
-        if idea_data:
-            idea_content = idea_data["input_data"].get("content", "")
-
-        selected_direction = {}
-        if direction_data:
-            selected_direction = direction_data.get("selected_option", {})
+        project_context = await self.get_context(project_id, db)
+        return self.build_generation_context(project_context)
 
+    def build_generation_context(
+        self,
+        project_context: ProjectContext,
+    ) -> dict[str, Any]:
+        """Build the prompt context used for structure and page generation."""
         # Get selected features
-        modules = []
-        if features_data:
-            output_data = features_data.get("output_data") or {}
-            modules = output_data.get("modules") or []
-            selected_option = features_data.get("selected_option") or {}
-            selected_ids = selected_option.get("selected_ids") or []
-            if selected_ids:
-                modules = self._filter_selected_modules(modules, selected_ids)
+        modules = project_context.selected_modules
 
         # Get platform info
         platform_info = ""
-        platforms = []
-        if platform_data:
-            output_data = platform_data.get("output_data", {})
-            platforms = output_data.get("platforms", [])
-            if platforms:
-                platform_info = f"目标平台: {', '.join(platforms)}"
+        platforms = project_context.platforms
+        if platforms:
+            platform_info = f"目标平台: {', '.join(platforms)}"
 
         return {
-            "idea": idea_content,
-            "direction": selected_direction.get("title", ""),
+            "idea": project_context.idea,
+            "direction": project_context.selected_direction.get("title", ""),
             "features_text": self._format_features(modules),
             "platform_info": platform_info,
             "platforms": platforms,
@@ -231,20 +230,6 @@ class InteractiveDemoAgent(BaseAgent):
             "shared_state": {},
         }
 
-    def _filter_selected_modules(self, modules: list, selected_ids: list) -> list:
-        """Filter modules by selected IDs."""
-        result = []
-        for module in modules:
-            if module.get("id") in selected_ids:
-                result.append(module)
-            elif "sub_features" in module:
-                sub = self._filter_selected_modules(module["sub_features"], selected_ids)
-                if sub:
-                    module_copy = module.copy()
-                    module_copy["sub_features"] = sub
-                    result.append(module_copy)
-        return result
-
     def _format_features(self, modules: list, indent: int = 0) -> str:
         """Format features/modules as text for prompt."""
         lines = []
@@ -1,10 +1,8 @@
 """PRD generation agent."""
 from typing import Any
-from uuid import UUID
-
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.ai.agents.base import BaseAgent
+from app.ai.context import ProjectContext
 from app.ai.gemini_client import get_gemini_client
 from app.ai.prompts.prd import PRD_SYSTEM_PROMPT, PRD_USER_PROMPT
 
@@ -16,23 +14,15 @@ class PRDAgent(BaseAgent):
     def stage_type(self) -> str:
         return "prd"
 
-    async def generate(
+    async def generate_from_context(
         self,
-        project_id: UUID,
-        db: AsyncSession,
+        context: ProjectContext,
     ) -> dict[str, Any]:
         """Generate PRD documents for each module."""
-        # Get all previous stage data
-        idea_data = await self.get_previous_stage_data(project_id, "idea", db)
-        direction_data = await self.get_previous_stage_data(project_id, "direction", db)
-        features_data = await self.get_previous_stage_data(project_id, "features", db)
-        prototype_data = await self.get_previous_stage_data(project_id, "prototype", db)
-        demo_data = await self.get_previous_stage_data(project_id, "demo", db)
-
-        idea_content = idea_data["input_data"].get("content", "") if idea_data else ""
-        selected_direction = direction_data.get("selected_option", {}) if direction_data else {}
-        modules = features_data.get("output_data", {}).get("modules", []) if features_data else []
-        screens = prototype_data.get("output_data", {}).get("screens", []) if prototype_data else []
+        idea_content = context.idea
+        selected_direction = context.selected_direction
+        modules = context.modules
+        screens = context.prototype_screens
 
         # Call Gemini API
         client = get_gemini_client("pro")
@@ -1,14 +1,16 @@
 """Prototype generation agent."""
 import asyncio
+import logging
 from typing import Any
-from uuid import UUID
-
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.ai.agents.base import BaseAgent
-from app.ai.gemini_client import get_gemini_client
+from app.ai.context import ProjectContext
+from app.ai.gemini_client import ImageGenerationTimeout, get_gemini_client
+from app.config import get_settings
 from app.ai.prompts.prototype import PROTOTYPE_SYSTEM_PROMPT, PROTOTYPE_USER_PROMPT
 
+logger = logging.getLogger(__name__)
+
 
 class PrototypeAgent(BaseAgent):
     """Agent for generating high-fidelity prototypes."""
@@ -17,49 +19,23 @@ class PrototypeAgent(BaseAgent):
     def stage_type(self) -> str:
         return "prototype"
 
-    async def generate(
+    async def generate_from_context(
         self,
-        project_id: UUID,
-        db: AsyncSession,
+        context: ProjectContext,
     ) -> dict[str, Any]:
         """Generate prototype descriptions for each feature module."""
-        import sys
-        print(f"[PrototypeAgent] Starting generate for project {project_id}", flush=True)
-
-        # Get previous stage data
-        idea_data = await self.get_previous_stage_data(project_id, "idea", db)
-        print(f"[PrototypeAgent] idea_data: {idea_data is not None}", flush=True)
-
-        direction_data = await self.get_previous_stage_data(project_id, "direction", db)
-        print(f"[PrototypeAgent] direction_data: {direction_data}", flush=True)
+        logger.info(f"[PrototypeAgent] Starting generate for project {context.project_id}")
 
-        features_data = await self.get_previous_stage_data(project_id, "features", db)
-        print(f"[PrototypeAgent] features_data (v2): {features_data is not None}", flush=True)
-
-        if not features_data:
+        if not context.stage("features"):
             raise ValueError("Features stage data not found")
 
-        # Safely extract idea content
-        idea_content = ""
-        if idea_data:
-            input_data = idea_data.get("input_data") or {}
-            idea_content = input_data.get("content", "")
-
-        # Safely extract direction data
-        selected_direction = {}
-        if direction_data:
-            selected_direction = direction_data.get("selected_option") or {}
-
-        # Get selected features - handle None values safely
-        output_data = features_data.get("output_data") or {}
-        modules = output_data.get("modules") or []
-        selected_option = features_data.get("selected_option") or {}
-        selected_ids = selected_option.get("selected_ids") or []
+        idea_content = context.idea
+        selected_direction = context.selected_direction
 
-        print(f"[PrototypeAgent] modules count: {len(modules)}, selected_ids: {selected_ids}", flush=True)
+        logger.info(f"[PrototypeAgent] modules count: {len(context.modules)}, selected_ids: {context.selected_feature_ids}")
 
-        if selected_ids:
-            modules = self._filter_selected_modules(modules, selected_ids)
+        # Get selected features
+        modules = context.selected_modules
 
         # Call Gemini API to get screen descriptions
         client = get_gemini_client("pro")
@@ -96,36 +72,61 @@ class PrototypeAgent(BaseAgent):
         direction: str,
         client,
     ) -> list[dict]:
-        """Generate images for each screen using Imagen."""
+        """Generate images for each screen using Imagen.
+
+        Screens run in a sliding window: up to `prototype_image_concurrency`
+        at once, the next one starting as soon as any finishes. A screen that
+        fails or whose model call exceeds `prototype_image_timeout_seconds`
+        keeps its description without an image (and an `image_error`), so
+        one slow image never costs the others. Time spent waiting for a
+        window or rate-limit slot does not count toward the timeout, and a
+        timed-out screen holds its window slot until its render thread ends.
+        """
+        settings = get_settings()
+        window = asyncio.Semaphore(max(settings.prototype_image_concurrency, 1))
+        timeout = settings.prototype_image_timeout_seconds or None
+
         async def generate_single_image(screen: dict) -> dict:
             # Build image prompt from screen description
             image_prompt = self._build_image_prompt(screen, idea, direction)
-            print(f"[PrototypeAgent] Generating image for screen: {screen.get('name')}")
 
-            # Generate image
-            image_data = await client.generate_image(
-                prompt=image_prompt,
-                aspect_ratio="9:16",  # Mobile app aspect ratio
-            )
+            await window.acquire()
+            release_window = window.release
+            try:
+                logger.info(f"[PrototypeAgent] Generating image for screen: {screen.get('name')}")
+                image_data = await client.generate_image(
+                    prompt=image_prompt,
+                    aspect_ratio="9:16",  # Mobile app aspect ratio
+                    timeout=timeout,
+                )
+            except ImageGenerationTimeout as e:
+                logger.warning(f"[PrototypeAgent] Image generation timed out for: {screen.get('name')}")
+                # The render thread is still running; free the slot when it ends
+                e.pending.add_done_callback(lambda _: window.release())
+                release_window = None
+                screen["image_error"] = str(e)
+                return screen
+            except Exception as e:
+                logger.warning(f"[PrototypeAgent] Image generation error for: {screen.get('name')}: {e}")
+                screen["image_error"] = str(e)
+                return screen
+            finally:
+                if release_window is not None:
+                    release_window()
 
             if image_data:
                 screen["image_data"] = image_data
-                print(f"[PrototypeAgent] Image generated successfully for: {screen.get('name')}")
+                logger.info(f"[PrototypeAgent] Image generated successfully for: {screen.get('name')}")
             else:
-                print(f"[PrototypeAgent] Image generation failed for: {screen.get('name')}")
+                screen["image_error"] = "No image returned"
+                logger.warning(f"[PrototypeAgent] Image generation failed for: {screen.get('name')}")
 
             return screen
 
-        # Generate images concurrently (max 3 at a time to avoid rate limits)
-        results = []
-        for i in range(0, len(screens), 3):
-            batch = screens[i:i + 3]
-            batch_results = await asyncio.gather(
-                *[generate_single_image(screen) for screen in batch]
-            )
-            results.extend(batch_results)
-
-        return results
+        # Results keep the screen order regardless of completion order
+        return list(await asyncio.gather(
+            *[generate_single_image(screen) for screen in screens]
+        ))
 
     def _build_image_prompt(self, screen: dict, idea: str, direction: str) -> str:
         """Build image generation prompt for UI mockup using Gemini native image generation."""
@@ -178,20 +179,6 @@ IMPORTANT: Generate a realistic, production-quality mobile app screenshot. The C
 
         return prompt
 
-    def _filter_selected_modules(self, modules: list, selected_ids: list) -> list:
-        """Filter modules by selected IDs."""
-        result = []
-        for module in modules:
-            if module.get("id") in selected_ids:
-                result.append(module)
-            elif "sub_features" in module:
-                sub = self._filter_selected_modules(module["sub_features"], selected_ids)
-                if sub:
-                    module_copy = module.copy()
-                    module_copy["sub_features"] = sub
-                    result.append(module_copy)
-        return result
-
     def _format_modules(self, modules: list, indent: int = 0) -> str:
         """Format modules as text for prompt."""
         lines = []
@@ -1,10 +1,8 @@
 """Test case generation agent."""
 from typing import Any
-from uuid import UUID
-
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.ai.agents.base import BaseAgent
+from app.ai.context import ProjectContext
 from app.ai.gemini_client import get_gemini_client
 from app.ai.prompts.testcase import TESTCASE_SYSTEM_PROMPT, TESTCASE_USER_PROMPT
 
@@ -16,14 +14,13 @@ class TestCaseAgent(BaseAgent):
     def stage_type(self) -> str:
         return "testcases"
 
-    async def generate(
+    async def generate_from_context(
         self,
-        project_id: UUID,
-        db: AsyncSession,
+        context: ProjectContext,
     ) -> dict[str, Any]:
         """Generate test cases based on PRD."""
         # Get PRD data
-        prd_data = await self.get_previous_stage_data(project_id, "prd", db)
+        prd_data = context.stage("prd")
 
         if not prd_data or not prd_data.get("output_data"):
             raise ValueError("PRD stage data not found")
@@ -0,0 +1,239 @@
+"""Content-addressed response cache for Gemini API calls."""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(kind: str, model: str, params: dict[str, Any]) -> str:
+    """Hash the inputs that determine a model response."""
+    payload = json.dumps(
+        {"kind": kind, "model": model, "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CacheBackend(ABC):
+    """Persistent tier behind the in-process LRU."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        """Return a cached value, or None if missing or expired."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        """Store a value for ttl_seconds."""
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove every entry."""
+        pass
+
+
+class FileCacheBackend(CacheBackend):
+    """Stores one JSON file per entry under a local directory."""
+
+    def __init__(self, directory: str, max_entries: int = 1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read(self, key: str) -> Any | None:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("expires_at", 0) < time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return entry.get("value")
+
+    def _write(self, key: str, value: Any, ttl_seconds: int) -> None:
+        entry = {"expires_at": time.time() + ttl_seconds, "value": value}
+        tmp_path = f"{self._path(key)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(key))
+        self._prune()
+
+    def _prune(self) -> None:
+        """Drop the least recently written files beyond max_entries."""
+        files = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(".json")
+        ]
+        if len(files) <= self.max_entries:
+            return
+        files.sort(key=lambda path: os.path.getmtime(path))
+        for path in files[: len(files) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.directory, name))
+
+    async def get(self, key: str) -> Any | None:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        await asyncio.to_thread(self._write, key, value, ttl_seconds)
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._clear)
+
+
+class ResponseCache:
+    """Two-tier cache: in-process LRU with TTL, plus an optional backend.
+
+    The LRU is bounded by both entry count and approximate payload size.
+    Entries are kept as serialized JSON and decoded on every hit, so
+    callers get their own copy and can mutate it freely.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = 3600,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        backend: CacheBackend | None = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.backend = backend
+        # key -> (expires_at, size, serialized value)
+        self._entries: OrderedDict[str, tuple[float, int, str]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.backend_hits = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> Any | None:
+        """Look up a key in memory, then in the backend."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, _, serialized = entry
+            if expires_at >= time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(serialized)
+            self._remove(key)
+
+        if self.backend is not None:
+            try:
+                value = await self.backend.get(key)
+            except Exception as e:
+                logger.warning(f"[ResponseCache] Backend read failed: {e}")
+                value = None
+            if value is not None:
+                self._store(key, value)
+                self.hits += 1
+                self.backend_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        """Store a value in memory and in the backend."""
+        self._store(key, value)
+        if self.backend is not None:
+            try:
+                await self.backend.set(key, value, self.ttl_seconds)
+            except Exception as e:
+                logger.warning(f"[ResponseCache] Backend write failed: {e}")
+
+    async def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        self._entries.clear()
+        self._bytes = 0
+        if self.backend is not None:
+            await self.backend.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and current memory usage."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "backend_hits": self.backend_hits,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def _store(self, key: str, value: Any) -> None:
+        serialized = json.dumps(value, ensure_ascii=False, default=str)
+        size = len(serialized.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, size, serialized)
+        self._bytes += size
+
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+
+_response_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Get the shared response cache, or None when caching is disabled."""
+    global _response_cache
+    settings = get_settings()
+    if not settings.gemini_cache_enabled:
+        return None
+
+    if _response_cache is None:
+        backend = None
+        if settings.gemini_cache_dir:
+            backend = FileCacheBackend(
+                settings.gemini_cache_dir,
+                max_entries=settings.gemini_cache_max_files,
+            )
+        _response_cache = ResponseCache(
+            ttl_seconds=settings.gemini_cache_ttl_seconds,
+            max_entries=settings.gemini_cache_max_entries,
+            max_bytes=settings.gemini_cache_max_bytes,
+            backend=backend,
+        )
+    return _response_cache
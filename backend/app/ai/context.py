@@ -0,0 +1,142 @@
+"""Project context loader shared by the AI agents."""
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.stage import Stage
+
+# Key under AsyncSession.info holding memoized contexts for the session
+_SESSION_CACHE_KEY = "project_context"
+
+
+def filter_selected_modules(modules: list, selected_ids: list) -> list:
+    """Filter feature modules (and their sub-features) by selected IDs."""
+    result = []
+    for module in modules:
+        if module.get("id") in selected_ids:
+            result.append(module)
+        elif "sub_features" in module:
+            sub = filter_selected_modules(module["sub_features"], selected_ids)
+            if sub:
+                module_copy = module.copy()
+                module_copy["sub_features"] = sub
+                result.append(module_copy)
+    return result
+
+
+class ProjectContext:
+    """Latest version of every stage of a project, loaded in one query.
+
+    Instances are memoized on the database session, so every agent and
+    endpoint sharing a request session reuses the same snapshot.
+    """
+
+    def __init__(self, project_id: UUID, stages: dict[str, dict[str, Any]]):
+        self.project_id = project_id
+        self._stages = stages
+
+    @classmethod
+    async def load(
+        cls,
+        project_id: UUID,
+        db: AsyncSession,
+        refresh: bool = False,
+    ) -> "ProjectContext":
+        """Load (or reuse) the context for a project."""
+        cache: dict[UUID, ProjectContext] = db.info.setdefault(_SESSION_CACHE_KEY, {})
+        if not refresh and project_id in cache:
+            return cache[project_id]
+
+        # Only the highest version of each stage type
+        result = await db.execute(
+            select(
+                Stage.type,
+                Stage.status,
+                Stage.version,
+                Stage.input_data,
+                Stage.output_data,
+                Stage.selected_option,
+            )
+            .where(Stage.project_id == project_id)
+            .where(Stage.is_latest)
+        )
+        stages = {
+            row.type: {
+                "status": row.status,
+                "version": row.version,
+                "input_data": row.input_data,
+                "output_data": row.output_data,
+                "selected_option": row.selected_option,
+            }
+            for row in result.all()
+        }
+
+        context = cls(project_id, stages)
+        cache[project_id] = context
+        return context
+
+    @staticmethod
+    def invalidate(db: AsyncSession, project_id: UUID | None = None) -> None:
+        """Forget memoized contexts after stage data changes in this session."""
+        cache = db.info.get(_SESSION_CACHE_KEY)
+        if not cache:
+            return
+        if project_id is None:
+            cache.clear()
+        else:
+            cache.pop(project_id, None)
+
+    def stage(self, stage_type: str) -> dict[str, Any] | None:
+        """Get the latest data of a stage type."""
+        return self._stages.get(stage_type)
+
+    def _field(self, stage_type: str, field: str) -> dict[str, Any]:
+        stage = self._stages.get(stage_type)
+        if not stage:
+            return {}
+        return stage.get(field) or {}
+
+    @property
+    def idea(self) -> str:
+        """The initial product idea."""
+        return self._field("idea", "input_data").get("content", "")
+
+    @property
+    def selected_direction(self) -> dict[str, Any]:
+        """The direction option chosen by the user."""
+        return self._field("direction", "selected_option")
+
+    @property
+    def platform_selection(self) -> dict[str, Any]:
+        """The saved platform selection (platforms, pc_type, mobile_type)."""
+        return self._field("platform", "selected_option")
+
+    @property
+    def platforms(self) -> list[str]:
+        """Target platforms, e.g. ["pc", "mobile"]."""
+        return self._field("platform", "output_data").get("platforms") or []
+
+    @property
+    def modules(self) -> list[dict[str, Any]]:
+        """All generated feature modules."""
+        return self._field("features", "output_data").get("modules") or []
+
+    @property
+    def selected_feature_ids(self) -> list[int]:
+        """IDs of the features chosen by the user."""
+        return self._field("features", "selected_option").get("selected_ids") or []
+
+    @property
+    def selected_modules(self) -> list[dict[str, Any]]:
+        """Feature modules filtered to the user's selection (all if none)."""
+        selected_ids = self.selected_feature_ids
+        if selected_ids:
+            return filter_selected_modules(self.modules, selected_ids)
+        return self.modules
+
+    @property
+    def prototype_screens(self) -> list[dict[str, Any]]:
+        """Screens from the prototype stage."""
+        return self._field("prototype", "output_data").get("screens") or []
@@ -1,40 +1,139 @@
-"""Gemini API client wrapper."""
+"""Gemini API client wrapper.
+
+The Google AI SDKs are slow to import, so they are loaded on first use
+(or by warm_up_sdks in the background after startup) rather than when
+this module is imported. Processes that never call the models never pay
+for them.
+"""
+import asyncio
 import json
 import base64
 import logging
 import os
-from typing import Any, AsyncGenerator
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncGenerator, Awaitable, Callable
 
 logger = logging.getLogger(__name__)
 
-import google.generativeai as genai
-from google import genai as genai_new
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_exponential
 
+from app.ai.cache import get_response_cache, make_cache_key
+from app.ai.rate_limit import estimate_tokens, get_rate_limiter
 from app.config import get_settings
 
 settings = get_settings()
 
 # Get API key from settings or directly from environment
 api_key = settings.gemini_api_key or os.getenv("GEMINI_API_KEY", "")
-print(f"Gemini API key configured: {'Yes' if api_key else 'No'} (length: {len(api_key)})")
 
-if not api_key:
-    print("WARNING: GEMINI_API_KEY is not set!")
+_sdk_lock = threading.Lock()
+_legacy_sdk: Any = None  # google.generativeai, configured
+_genai_client = None  # google.genai client for image generation
 
-# Configure Gemini (legacy API)
-genai.configure(api_key=api_key)
 
-# Configure new Gemini client for image generation (lazy initialization)
-_genai_client = None
+def get_legacy_sdk() -> Any:
+    """Import and configure google.generativeai on first use."""
+    global _legacy_sdk
+    if _legacy_sdk is None:
+        with _sdk_lock:
+            if _legacy_sdk is None:
+                start = time.perf_counter()
+                import google.generativeai as genai
+
+                print(f"Gemini API key configured: {'Yes' if api_key else 'No'} (length: {len(api_key)})")
+                if not api_key:
+                    print("WARNING: GEMINI_API_KEY is not set!")
+                genai.configure(api_key=api_key)
+                _legacy_sdk = genai
+                logger.info(f"[GeminiClient] google.generativeai loaded in {time.perf_counter() - start:.2f}s")
+    return _legacy_sdk
+
 
 def get_genai_client():
+    """Get the google.genai client (imported on first use), or None without an API key."""
     global _genai_client
     if _genai_client is None and api_key:
-        _genai_client = genai_new.Client(api_key=api_key)
+        with _sdk_lock:
+            if _genai_client is None:
+                start = time.perf_counter()
+                from google import genai as genai_new
+
+                _genai_client = genai_new.Client(api_key=api_key)
+                logger.info(f"[GeminiClient] google.genai loaded in {time.perf_counter() - start:.2f}s")
     return _genai_client
 
 
+async def warm_up_sdks() -> None:
+    """Load both SDKs in a worker thread so the first request doesn't have to."""
+    try:
+        await asyncio.to_thread(get_legacy_sdk)
+        await asyncio.to_thread(get_genai_client)
+    except Exception as e:
+        logger.warning(f"[GeminiClient] SDK warm-up failed: {e}")
+
+
+# Dedicated threads for the synchronous image client, so slow image calls
+# never starve the event loop's default executor
+_image_executor: ThreadPoolExecutor | None = None
+
+
+def get_image_executor() -> ThreadPoolExecutor:
+    global _image_executor
+    if _image_executor is None:
+        _image_executor = ThreadPoolExecutor(
+            max_workers=max(settings.gemini_image_executor_workers, 1),
+            thread_name_prefix="gemini-image",
+        )
+    return _image_executor
+
+
+def shutdown_image_executor() -> None:
+    """Stop the image threads without waiting for calls still running."""
+    global _image_executor
+    if _image_executor is not None:
+        _image_executor.shutdown(wait=False, cancel_futures=True)
+        _image_executor = None
+
+
+class ImageGenerationTimeout(asyncio.TimeoutError):
+    """An image call exceeded its timeout.
+
+    The executor thread cannot be interrupted and may still be running;
+    `pending` completes when it ends.
+    """
+
+    def __init__(self, timeout: float, pending: asyncio.Future):
+        super().__init__(f"Timed out after {timeout:.0f}s")
+        self.pending = pending
+
+
+class GenerationCancelled(Exception):
+    """A streaming generation was cancelled by its caller."""
+
+
+async def _next_chunk(iterator: Any, cancel_event: asyncio.Event | None) -> Any:
+    """Await the next stream chunk, giving up as soon as cancel_event is set."""
+    if cancel_event is None:
+        return await iterator.__anext__()
+
+    next_chunk = asyncio.ensure_future(iterator.__anext__())
+    cancel_wait = asyncio.ensure_future(cancel_event.wait())
+    try:
+        await asyncio.wait({next_chunk, cancel_wait}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        cancel_wait.cancel()
+        if not next_chunk.done():
+            # Abort the pending read, which cancels the upstream request
+            next_chunk.cancel()
+            await asyncio.gather(next_chunk, return_exceptions=True)
+
+    if next_chunk.cancelled():
+        raise GenerationCancelled("Generation cancelled")
+    return next_chunk.result()
+
+
 class GeminiClient:
     """Wrapper for Gemini API calls."""
 
@@ -44,41 +143,105 @@ class GeminiClient:
         "flash": "gemini-2.5-flash",  # For fast responses
         "flash-lite": "gemini-2.5-flash-lite",  # For cost-sensitive tasks
     }
+    IMAGE_MODEL = "gemini-3-pro-image-preview"
 
     def __init__(self, model_type: str = "pro"):
         """Initialize client with specified model type."""
-        model_name = self.MODELS.get(model_type, self.MODELS["pro"])
-        self.model = genai.GenerativeModel(model_name)
+        self.tier = model_type if model_type in self.MODELS else "pro"
+        self.model_name = self.MODELS[self.tier]
+        self._model = None
+        self.limiter = get_rate_limiter(self.tier)
+
+    @property
+    def model(self) -> Any:
+        """The default GenerativeModel of this tier, created on first use."""
+        if self._model is None:
+            self._model = get_legacy_sdk().GenerativeModel(self.model_name)
+        return self._model
+
+    def _model_for(self, system_instruction: str | None) -> Any:
+        if system_instruction:
+            return get_legacy_sdk().GenerativeModel(
+                self.model_name,
+                system_instruction=system_instruction,
+            )
+        return self.model
+
+    async def _cached_call(
+        self,
+        use_cache: bool,
+        kind: str,
+        model: str,
+        params: dict[str, Any],
+        call: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Serve a call from the response cache, or run it and store the result."""
+        cache = get_response_cache() if use_cache else None
+        if cache is None:
+            return await call()
+
+        key = make_cache_key(kind, model, params)
+        cached = await cache.get(key)
+        if cached is not None:
+            logger.info(f"[GeminiClient] Cache hit for {kind} ({model})")
+            return cached
+
+        value = await call()
+        if value is not None:
+            await cache.set(key, value)
+        return value
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-    )
     async def generate_text(
         self,
         prompt: str,
         system_instruction: str | None = None,
         temperature: float = 0.7,
         max_output_tokens: int = 8192,
+        use_cache: bool = True,
+    ) -> str:
+        """Generate text response.
+
+        Set use_cache=False to bypass the response cache for this call.
+        """
+        return await self._cached_call(
+            use_cache,
+            "text",
+            self.model_name,
+            {
+                "prompt": prompt,
+                "system_instruction": system_instruction,
+                "temperature": temperature,
+                "max_output_tokens": max_output_tokens,
+            },
+            lambda: self._generate_text(
+                prompt, system_instruction, temperature, max_output_tokens
+            ),
+        )
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+    )
+    async def _generate_text(
+        self,
+        prompt: str,
+        system_instruction: str | None,
+        temperature: float,
+        max_output_tokens: int,
     ) -> str:
-        """Generate text response."""
-        generation_config = genai.GenerationConfig(
+        """Call the model for a text response (uncached, with retries)."""
+        generation_config = get_legacy_sdk().GenerationConfig(
             temperature=temperature,
             max_output_tokens=max_output_tokens,
         )
 
-        if system_instruction:
-            model = genai.GenerativeModel(
-                self.model.model_name,
-                system_instruction=system_instruction,
-            )
-        else:
-            model = self.model
+        model = self._model_for(system_instruction)
 
-        response = await model.generate_content_async(
-            prompt,
-            generation_config=generation_config,
-        )
+        async with self.limiter.acquire(estimate_tokens(prompt, system_instruction)):
+            response = await model.generate_content_async(
+                prompt,
+                generation_config=generation_config,
+            )
 
         return response.text
 
@@ -88,39 +251,50 @@ class GeminiClient:
         system_instruction: str | None = None,
         temperature: float = 0.7,
         max_output_tokens: int = 8192,
+        cancel_event: asyncio.Event | None = None,
     ) -> AsyncGenerator[str, None]:
         """Generate text response with streaming.
 
-        Yields chunks of text as they are generated.
+        Yields chunks of text as they are generated. Setting `cancel_event`
+        aborts the upstream stream right away and raises GenerationCancelled.
+        The stream holds one of the tier's concurrency slots until it ends.
         Note: No retry decorator as streaming doesn't support retry well.
         """
-        generation_config = genai.GenerationConfig(
+        if cancel_event is not None and cancel_event.is_set():
+            raise GenerationCancelled("Generation cancelled")
+
+        generation_config = get_legacy_sdk().GenerationConfig(
             temperature=temperature,
             max_output_tokens=max_output_tokens,
         )
 
-        if system_instruction:
-            model = genai.GenerativeModel(
-                self.model.model_name,
-                system_instruction=system_instruction,
-            )
-        else:
-            model = self.model
+        model = self._model_for(system_instruction)
 
-        response = await model.generate_content_async(
-            prompt,
-            generation_config=generation_config,
-            stream=True,
-        )
+        async with self.limiter.acquire(estimate_tokens(prompt, system_instruction)):
+            response = await model.generate_content_async(
+                prompt,
+                generation_config=generation_config,
+                stream=True,
+            )
 
-        async for chunk in response:
-            if chunk.text:
-                yield chunk.text
+            chunks = response.__aiter__()
+            try:
+                while True:
+                    try:
+                        chunk = await _next_chunk(chunks, cancel_event)
+                    except StopAsyncIteration:
+                        break
+                    if chunk.text:
+                        yield chunk.text
+            finally:
+                # Close the upstream stream when the consumer stops early
+                aclose = getattr(chunks, "aclose", None)
+                if aclose is not None:
+                    try:
+                        await aclose()
+                    except Exception:
+                        pass
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-    )
     async def generate_json(
         self,
         prompt: str,
@@ -128,9 +302,42 @@ class GeminiClient:
         schema: dict[str, Any] | None = None,
         temperature: float = 0.7,
         max_output_tokens: int = 8192,
+        use_cache: bool = True,
+    ) -> dict[str, Any]:
+        """Generate JSON response with optional schema validation.
+
+        Set use_cache=False to bypass the response cache for this call.
+        """
+        return await self._cached_call(
+            use_cache,
+            "json",
+            self.model_name,
+            {
+                "prompt": prompt,
+                "system_instruction": system_instruction,
+                "schema": schema,
+                "temperature": temperature,
+                "max_output_tokens": max_output_tokens,
+            },
+            lambda: self._generate_json(
+                prompt, system_instruction, schema, temperature, max_output_tokens
+            ),
+        )
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+    )
+    async def _generate_json(
+        self,
+        prompt: str,
+        system_instruction: str | None,
+        schema: dict[str, Any] | None,
+        temperature: float,
+        max_output_tokens: int,
     ) -> dict[str, Any]:
-        """Generate JSON response with optional schema validation."""
-        generation_config = genai.GenerationConfig(
+        """Call the model for a JSON response (uncached, with retries)."""
+        generation_config = get_legacy_sdk().GenerationConfig(
             temperature=temperature,
             max_output_tokens=max_output_tokens,
             response_mime_type="application/json",
@@ -139,18 +346,13 @@ class GeminiClient:
         if schema:
             generation_config.response_schema = schema
 
-        if system_instruction:
-            model = genai.GenerativeModel(
-                self.model.model_name,
-                system_instruction=system_instruction,
-            )
-        else:
-            model = self.model
+        model = self._model_for(system_instruction)
 
-        response = await model.generate_content_async(
-            prompt,
-            generation_config=generation_config,
-        )
+        async with self.limiter.acquire(estimate_tokens(prompt, system_instruction)):
+            response = await model.generate_content_async(
+                prompt,
+                generation_config=generation_config,
+            )
 
         # Parse JSON response
         try:
@@ -164,44 +366,84 @@ class GeminiClient:
                 return json.loads(text[start:end])
             raise
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-    )
     async def generate_image(
         self,
         prompt: str,
         aspect_ratio: str = "9:16",
+        use_cache: bool = True,
+        timeout: float | None = None,
     ) -> str | None:
         """Generate image using Gemini native image generation.
 
         Uses gemini-3-pro-image-preview (Nano Banana Pro) model for UI mockup generation.
         This model has advanced reasoning for complex instructions and high-fidelity text rendering.
         Returns base64-encoded image data or None if generation fails.
+        Failed generations are never cached.
+
+        `timeout` bounds each model call, not the wait for a rate-limit slot;
+        when it expires ImageGenerationTimeout is raised and the call is not
+        retried.
         """
-        import asyncio
+        return await self._cached_call(
+            use_cache,
+            "image",
+            self.IMAGE_MODEL,
+            {"prompt": prompt, "aspect_ratio": aspect_ratio},
+            lambda: self._generate_image(prompt, aspect_ratio, timeout),
+        )
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_not_exception_type(ImageGenerationTimeout),
+    )
+    async def _generate_image(
+        self,
+        prompt: str,
+        aspect_ratio: str,
+        timeout: float | None = None,
+    ) -> str | None:
+        """Call the image model (uncached, with retries)."""
         try:
-            # Run synchronous API call in thread pool to avoid blocking
+            # Run synchronous API call in the dedicated image thread pool
             client = get_genai_client()
             if not client:
                 logger.error("Gemini client not initialized - API key missing")
                 return None
 
+            from google.genai import types
+
             def _generate():
                 return client.models.generate_content(
-                    model="gemini-3-pro-image-preview",
+                    model=self.IMAGE_MODEL,
                     contents=prompt,
-                    config=genai_new.types.GenerateContentConfig(
+                    config=types.GenerateContentConfig(
                         response_modalities=["TEXT", "IMAGE"],
-                        image_config=genai_new.types.ImageConfig(
+                        image_config=types.ImageConfig(
                             aspect_ratio=aspect_ratio,
                         ),
                     ),
                 )
 
             loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(None, _generate)
+            release = await get_rate_limiter("image").reserve()
+            try:
+                future = loop.run_in_executor(get_image_executor(), _generate)
+            except BaseException:
+                release()
+                raise
+
+            def _on_thread_done(done: asyncio.Future) -> None:
+                # A timed-out call keeps its slot until the thread really ends
+                release()
+                if not done.cancelled():
+                    done.exception()  # Retrieved even when nobody awaits it
+
+            future.add_done_callback(_on_thread_done)
+            try:
+                response = await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.TimeoutError:
+                raise ImageGenerationTimeout(timeout, future) from None
 
             # Extract image from response parts
             if response.parts:
@@ -218,6 +460,8 @@ class GeminiClient:
 
             logger.info(f"[GeminiClient] No image in response parts")
             return None
+        except ImageGenerationTimeout:
+            raise
         except Exception as e:
             logger.info(f"[GeminiClient] Image generation failed: {e}")
             import traceback
@@ -0,0 +1,164 @@
+"""Client-side pacing for Gemini calls.
+
+Each model tier (pro, flash, flash-lite, image) gets one shared limiter
+with a requests-per-minute and a tokens-per-minute token bucket plus a
+concurrency cap. Callers wait their turn in FIFO order instead of running
+into 429s and sleeping in retry backoff.
+"""
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable
+
+from app.config import get_settings
+
+# Rough prompt size estimate used for the tokens-per-minute budget
+CHARS_PER_TOKEN = 3
+
+
+def estimate_tokens(*texts: str | None) -> int:
+    """Estimate the input tokens of a request from its text length."""
+    return max(1, math.ceil(sum(len(text) for text in texts if text) / CHARS_PER_TOKEN))
+
+
+class TokenBucket:
+    """Holds up to `per_minute` units, refilled evenly over a minute."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if they are now)."""
+        self._refill()
+        amount = min(amount, self.capacity)  # Oversized requests wait for a full bucket
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+
+class ModelRateLimiter:
+    """Requests/tokens-per-minute budgets and a concurrency cap for one tier.
+
+    A value of 0 disables the corresponding limit.
+    """
+
+    def __init__(self, name: str, rpm: int, tpm: int, max_concurrency: int):
+        self.name = name
+        self._requests = TokenBucket(rpm) if rpm > 0 else None
+        self._tokens = TokenBucket(tpm) if tpm > 0 else None
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency > 0 else None
+        self._turn = asyncio.Lock()  # Waiters are paced one at a time, in order
+        self._in_flight = 0
+        self._waiting = 0
+        self._calls = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    async def reserve(self, tokens: int = 1) -> Callable[[], None]:
+        """Wait for a concurrency slot and budget; return a callback that frees the slot.
+
+        For work that can outlive the task awaiting it (an executor thread
+        after a timeout), so the slot is held until the work really ends.
+        Calling the callback more than once is harmless.
+        """
+        start = time.monotonic()
+        self._waiting += 1
+        try:
+            if self._semaphore is not None:
+                await self._semaphore.acquire()
+            try:
+                async with self._turn:
+                    while True:
+                        delay = max(
+                            self._requests.wait_time(1) if self._requests else 0.0,
+                            self._tokens.wait_time(tokens) if self._tokens else 0.0,
+                        )
+                        if delay <= 0:
+                            break
+                        await asyncio.sleep(delay)
+                    if self._requests:
+                        self._requests.consume(1)
+                    if self._tokens:
+                        self._tokens.consume(tokens)
+            except BaseException:
+                if self._semaphore is not None:
+                    self._semaphore.release()
+                raise
+        finally:
+            self._waiting -= 1
+
+        waited = time.monotonic() - start
+        self._calls += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+
+        self._in_flight += 1
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if released:
+                return
+            released = True
+            self._in_flight -= 1
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+        return release
+
+    @asynccontextmanager
+    async def acquire(self, tokens: int = 1) -> AsyncIterator[None]:
+        """Wait for a concurrency slot and budget, and hold the slot while inside."""
+        release = await self.reserve(tokens)
+        try:
+            yield
+        finally:
+            release()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "calls": self._calls,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "avg_wait_ms": round(self._total_wait / self._calls * 1000, 3) if self._calls else 0.0,
+            "max_wait_ms": round(self._max_wait * 1000, 3),
+        }
+
+
+_limiters: dict[str, ModelRateLimiter] = {}
+
+
+def get_rate_limiter(tier: str) -> ModelRateLimiter:
+    """Get the shared limiter for a model tier (pro, flash, flash-lite, image)."""
+    if tier not in _limiters:
+        settings = get_settings()
+        limits = {
+            "pro": (settings.gemini_pro_rpm, settings.gemini_pro_tpm, settings.gemini_pro_concurrency),
+            "flash": (settings.gemini_flash_rpm, settings.gemini_flash_tpm, settings.gemini_flash_concurrency),
+            "flash-lite": (
+                settings.gemini_flash_lite_rpm,
+                settings.gemini_flash_lite_tpm,
+                settings.gemini_flash_lite_concurrency,
+            ),
+            "image": (settings.gemini_image_rpm, 0, settings.gemini_image_concurrency),
+        }
+        rpm, tpm, concurrency = limits.get(tier, limits["pro"])
+        _limiters[tier] = ModelRateLimiter(tier, rpm, tpm, concurrency)
+    return _limiters[tier]
+
+
+def get_rate_limit_stats() -> dict[str, Any]:
+    """Get wait-time metrics of every limiter created so far."""
+    return {tier: limiter.stats() for tier, limiter in _limiters.items()}
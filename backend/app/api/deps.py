@@ -1,27 +1,64 @@
 """API dependencies for injection."""
-from typing import Annotated
+from typing import Annotated, Any
 from uuid import UUID
 
+import httpx
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_user_id_from_token
-from app.db.session import get_db
+from app.core.http import get_http_client
+from app.core.security import decode_access_token, get_user_id_from_payload
+from app.core.token_versions import get_token_version, is_token_revoked, remember_token_version
+from app.db.session import get_db, get_read_db
 from app.models.user import User
+from app.schemas.user import UserClaims
 
 # Security scheme
 security = HTTPBearer()
 
 
+def _revoked() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token has been revoked",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def get_token_payload(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+) -> dict[str, Any]:
+    """Decode the bearer token and reject revoked tokens.
+
+    The current token version and the token's revocation state come from
+    in-process caches, so this only touches the database on a cache miss.
+    """
+    payload = decode_access_token(credentials.credentials)
+    user_id = get_user_id_from_payload(payload)
+
+    current_version = await get_token_version(user_id)
+    if current_version is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+    if payload.get("ver", 0) < current_version:
+        raise _revoked()
+    if payload.get("jti") and await is_token_revoked(payload["jti"]):
+        raise _revoked()
+
+    return payload
+
+
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> User:
     """Get current authenticated user."""
-    token = credentials.credentials
-    user_id = get_user_id_from_token(token)
+    payload = decode_access_token(credentials.credentials)
+    user_id = get_user_id_from_payload(payload)
 
     result = await db.execute(
         select(User).where(User.id == user_id)
@@ -34,17 +71,43 @@ async def get_current_user(
             detail="User not found",
         )
 
+    remember_token_version(user.id, user.token_version)
+    if payload.get("ver", 0) < user.token_version:
+        raise _revoked()
+    if payload.get("jti") and await is_token_revoked(payload["jti"]):
+        raise _revoked()
+
     return user
 
 
+async def get_current_user_claims(
+    payload: Annotated[dict[str, Any], Depends(get_token_payload)],
+) -> UserClaims:
+    """Get current user identity from token claims without loading the user."""
+    return UserClaims(
+        id=get_user_id_from_payload(payload),
+        email=payload.get("email"),
+        name=payload.get("name"),
+        avatar_url=payload.get("avatar_url"),
+        token_version=payload.get("ver", 0),
+    )
+
+
 async def get_current_user_id(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    payload: Annotated[dict[str, Any], Depends(get_token_payload)],
 ) -> UUID:
     """Get current user ID from token."""
-    return get_user_id_from_token(credentials.credentials)
+    return get_user_id_from_payload(payload)
 
 
 # Type aliases for cleaner dependency injection
 CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUserClaims = Annotated[UserClaims, Depends(get_current_user_claims)]
 CurrentUserId = Annotated[UUID, Depends(get_current_user_id)]
+TokenPayload = Annotated[dict[str, Any], Depends(get_token_payload)]
 DbSession = Annotated[AsyncSession, Depends(get_db)]
+# Bound to the read replica when one is configured. Only for reads that
+# tolerate replication lag: not for anything a client reads right after
+# its own write (stages, demo pages, project details use DbSession)
+ReadDbSession = Annotated[AsyncSession, Depends(get_read_db)]
+HttpClient = Annotated[httpx.AsyncClient, Depends(get_http_client)]
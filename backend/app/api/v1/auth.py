@@ -4,16 +4,16 @@ from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
-import httpx
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel
 from sqlalchemy import select
-from google.oauth2 import id_token
-from google.auth.transport import requests
 
-from app.api.deps import DbSession, CurrentUser
+from app.api.deps import DbSession, CurrentUser, CurrentUserId, HttpClient, TokenPayload
 from app.config import get_settings
-from app.core.security import create_access_token
+from app.core.google_tokens import get_google_token_verifier
+from app.core.security import create_user_access_token, get_user_id_from_payload
+from app.core.token_versions import remember_token_version, revoke_token, revoke_tokens
+from app.core.user_profiles import UserProfile, remember_user_profile
 from app.models.user import User
 from app.schemas.user import UserRead, GoogleUserInfo
 
@@ -38,6 +38,7 @@ class TokenResponse(BaseModel):
 async def google_auth(
     request: GoogleAuthRequest,
     db: DbSession,
+    http_client: HttpClient,
 ):
     """
     Authenticate with Google OAuth.
@@ -52,12 +53,8 @@ async def google_auth(
         # This is actually a JWT ID token from Google Identity Services
         try:
             logger.info(f"[AUTH] Verifying ID token with client_id: {settings.google_client_id[:20]}...")
-            # Verify the ID token
-            idinfo = id_token.verify_oauth2_token(
-                request.access_token,
-                requests.Request(),
-                settings.google_client_id
-            )
+            # Verify the ID token offline against cached Google signing keys
+            idinfo = await get_google_token_verifier().verify(request.access_token)
             logger.info(f"[AUTH] Token verified successfully for: {idinfo.get('email')}")
 
             # Extract user info from verified token
@@ -75,42 +72,41 @@ async def google_auth(
             )
 
     elif request.code:
-        # Exchange code for tokens
-        async with httpx.AsyncClient() as client:
-            token_response = await client.post(
-                "https://oauth2.googleapis.com/token",
-                data={
-                    "code": request.code,
-                    "client_id": settings.google_client_id,
-                    "client_secret": settings.google_client_secret,
-                    "redirect_uri": f"{settings.cors_origins[0]}/auth/callback",
-                    "grant_type": "authorization_code",
-                },
-            )
-            if token_response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Failed to exchange authorization code",
-                )
-            tokens = token_response.json()
-
-            # Get user info
-            userinfo_response = await client.get(
-                "https://www.googleapis.com/oauth2/v2/userinfo",
-                headers={"Authorization": f"Bearer {tokens['access_token']}"},
+        # Exchange code for tokens (shared pooled client)
+        token_response = await http_client.post(
+            "https://oauth2.googleapis.com/token",
+            data={
+                "code": request.code,
+                "client_id": settings.google_client_id,
+                "client_secret": settings.google_client_secret,
+                "redirect_uri": f"{settings.cors_origins[0]}/auth/callback",
+                "grant_type": "authorization_code",
+            },
+        )
+        if token_response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Failed to exchange authorization code",
             )
-            if userinfo_response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Failed to get user info",
-                )
-            data = userinfo_response.json()
-            google_user_info = GoogleUserInfo(
-                id=data["id"],
-                email=data["email"],
-                name=data.get("name", data["email"]),
-                picture=data.get("picture"),
+        tokens = token_response.json()
+
+        # Get user info
+        userinfo_response = await http_client.get(
+            "https://www.googleapis.com/oauth2/v2/userinfo",
+            headers={"Authorization": f"Bearer {tokens['access_token']}"},
+        )
+        if userinfo_response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Failed to get user info",
             )
+        data = userinfo_response.json()
+        google_user_info = GoogleUserInfo(
+            id=data["id"],
+            email=data["email"],
+            name=data.get("name", data["email"]),
+            picture=data.get("picture"),
+        )
 
     else:
         raise HTTPException(
@@ -142,8 +138,16 @@ async def google_auth(
     await db.commit()
     await db.refresh(user)
 
-    # Create JWT token
-    access_token = create_access_token(subject=user.id)
+    # Create JWT token with identity claims for stateless requests
+    access_token = create_user_access_token(
+        user_id=user.id,
+        email=user.email,
+        name=user.name,
+        avatar_url=user.avatar_url,
+        token_version=user.token_version,
+    )
+    remember_token_version(user.id, user.token_version)
+    remember_user_profile(user.id, UserProfile(user.name, user.avatar_url))
 
     return TokenResponse(
         access_token=access_token,
@@ -158,11 +162,37 @@ async def get_current_user_info(current_user: CurrentUser):
 
 
 @router.post("/logout")
-async def logout():
+async def logout(
+    payload: TokenPayload,
+    db: DbSession,
+):
     """
-    Logout user.
+    Logout the current session.
 
-    Note: Since we use JWT, actual token invalidation happens client-side.
-    This endpoint can be used for any server-side cleanup if needed.
+    Revokes only the access token used for this request; the user's
+    other devices stay signed in.
     """
+    user_id = get_user_id_from_payload(payload)
+    jti = payload.get("jti")
+    if jti:
+        expires_at = datetime.fromtimestamp(payload["exp"], timezone.utc)
+        await revoke_token(user_id, jti, expires_at, db)
+    else:
+        # Tokens issued before jti was added can only be revoked all at once
+        await revoke_tokens(user_id, db)
     return {"message": "Logged out successfully"}
+
+
+@router.post("/logout/all")
+async def logout_all(
+    current_user_id: CurrentUserId,
+    db: DbSession,
+):
+    """
+    Logout every session of the user.
+
+    Bumps the user's token version, which revokes every access token
+    issued so far (on all devices).
+    """
+    await revoke_tokens(current_user_id, db)
+    return {"message": "Logged out of all sessions"}
@@ -6,7 +6,12 @@ from fastapi import APIRouter, HTTPException, status
 from sqlalchemy import select
 
 from app.api.deps import DbSession, CurrentUserId
-from app.core.permissions import require_owner, Permission, check_permission
+from app.core.permissions import (
+    require_owner,
+    Permission,
+    check_permission,
+    invalidate_role_cache,
+)
 from app.models.collaborator import Collaborator
 from app.models.project import Project
 from app.models.user import User
@@ -108,6 +113,7 @@ async def invite_collaborator(
     db.add(collaborator)
     await db.commit()
     await db.refresh(collaborator)
+    invalidate_role_cache(project_id, user.id)
 
     return CollaboratorRead.model_validate(collaborator)
 
@@ -137,3 +143,4 @@ async def remove_collaborator(
 
     await db.delete(collaborator)
     await db.commit()
+    invalidate_role_cache(project_id, user_id)
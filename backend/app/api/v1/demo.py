@@ -1,106 +1,353 @@
 """Demo API routes for interactive demo generation with SSE streaming."""
-import json
+import asyncio
 import logging
+from contextlib import aclosing
 from uuid import UUID
-from typing import Any
+from typing import Any, AsyncGenerator, AsyncIterator, Awaitable, Callable
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import DbSession, CurrentUserId
+from app.api.deps import DbSession, ReadDbSession, CurrentUserId
+from app.config import get_settings
+from app.core.sse import coalesce_chunks, sse_event
 from app.core.permissions import Permission, check_permission
+from app.db.session import async_session_maker
 from app.models.project import Project
+from app.models.demo_page import DemoPage
 from app.models.stage import Stage
 from app.ai.agents.interactive_demo_agent import InteractiveDemoAgent
+from app.ai.context import ProjectContext
+from app.ai.gemini_client import GenerationCancelled
+from app.services.demo_pages import (
+    complete_demo_draft,
+    count_page_statuses,
+    ensure_demo_pages,
+    find_legacy_page,
+    get_demo_draft,
+    get_demo_stage,
+    get_page_row,
+    load_demo_document,
+    page_to_dict,
+    save_demo_document,
+    save_page_result,
+    get_unfinished_pages,
+    update_page,
+    PageVersionConflictError,
+    uses_page_rows,
+)
+from app.services.event_streams import EventStream, get_event_streams
+from app.services.generation import next_stage_version
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
+settings = get_settings()
+
+# Seconds between client-disconnect checks during SSE generation
+DISCONNECT_POLL_INTERVAL = 0.5
+
+
+# Page write requests carry the page version the client last saw; a stale
+# version is rejected with 409. Omitting it only guards against changes
+# made while the request runs (last write wins), for clients that do not
+# track versions.
 
 
 class ModifyRequest(BaseModel):
     """Request body for page modification."""
     instruction: str
     page_id: str
+    version: int | None = None  # Expected page version (optimistic concurrency)
 
 
 class PageRegenerateRequest(BaseModel):
     """Request body for page regeneration."""
-    pass
+    version: int | None = None
 
 
 class PageSkipRequest(BaseModel):
     """Request body for skipping a page."""
     reason: str | None = None
+    version: int | None = None
 
 
 class PageUpdateRequest(BaseModel):
     """Request body for updating page code directly."""
     code: str
+    version: int | None = None
 
 
-def sse_event(event_type: str, data: Any) -> str:
-    """Format SSE event."""
-    json_data = json.dumps(data, ensure_ascii=False)
-    return f"event: {event_type}\ndata: {json_data}\n\n"
+def batched(chunks: AsyncIterator[str]) -> AsyncGenerator[str, None]:
+    """Coalesce model chunks into fewer progress events."""
+    return coalesce_chunks(
+        chunks,
+        max_bytes=settings.sse_batch_max_bytes,
+        max_delay=settings.sse_batch_interval_ms / 1000,
+    )
 
 
-@router.post("/projects/{project_id}/demo/generate/stream")
-async def generate_demo_stream(
-    project_id: UUID,
-    current_user_id: CurrentUserId,
-    db: DbSession,
-):
+def watch_disconnect(http_request: Request) -> tuple[asyncio.Event, asyncio.Task]:
+    """Start polling for an SSE client disconnect.
+
+    Returns an event that is set once the client has gone away, and the
+    polling task (cancel it when the stream ends).
     """
-    Stream-generate interactive demo using SSE.
+    cancel_event = asyncio.Event()
 
-    Phase 1: Generate structure (fast)
-    Phase 2: Generate pages one by one (streaming)
+    async def poll() -> None:
+        while not await http_request.is_disconnected():
+            await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+        logger.info("[DEMO SSE] Client disconnected, cancelling generation")
+        cancel_event.set()
 
-    SSE Events:
-    - init: {total_pages, platforms} - Initial structure
-    - page_start: {platform, page_id, page_name} - Starting page generation
-    - page_progress: {page_id, chunk} - Code chunk
-    - page_complete: {page_id, code} - Page finished
-    - complete: {demo_project} - All done
-    - error: {message} - Error occurred
+    return cancel_event, asyncio.create_task(poll())
+
+
+async def generate_page_events(
+    agent: InteractiveDemoAgent,
+    page: dict[str, Any],
+    platform_type: str,
+    context: dict[str, Any],
+    cancel_event: asyncio.Event | None = None,
+) -> AsyncGenerator[tuple[str, dict[str, Any]], None]:
+    """Generate one page, yielding (event_type, data) tuples.
+
+    Errors are reported as a page_error event so one failing page never
+    aborts the rest of the demo. Cancellation (GenerationCancelled) is
+    propagated and nothing is recorded, so the page stays resumable.
     """
-    await check_permission(current_user_id, project_id, Permission.GENERATE, db)
+    page_id = page.get("id", "")
+    page_context = {**context, "platform_type": platform_type}
 
-    # Verify project exists
-    result = await db.execute(
-        select(Project).where(Project.id == project_id)
+    yield "page_start", {
+        "platform": platform_type,
+        "page_id": page_id,
+        "page_name": page.get("name", ""),
+    }
+
+    code_chunks = []
+    try:
+        async for chunk in batched(agent.generate_page_stream(page, page_context, cancel_event)):
+            code_chunks.append(chunk)
+            yield "page_progress", {
+                "platform": platform_type,
+                "page_id": page_id,
+                "chunk": chunk,
+            }
+
+        # Combine chunks and remove markdown fences if present
+        full_code = clean_code("".join(code_chunks))
+
+        # Update page in structure
+        page["code"] = full_code
+        page["status"] = "completed"
+
+        yield "page_complete", {
+            "platform": platform_type,
+            "page_id": page_id,
+            "code": full_code,
+        }
+
+    except GenerationCancelled:
+        raise
+    except Exception as e:
+        logger.error(f"[DEMO SSE] Error generating page {page_id}: {e}")
+        page["status"] = "error"
+        page["error"] = str(e)
+        yield "page_error", {
+            "platform": platform_type,
+            "page_id": page_id,
+            "error": str(e),
+        }
+
+
+_STREAM_DONE = object()
+
+
+async def multiplex_streams(
+    streams: list[AsyncIterator[Any]],
+    concurrency: int,
+) -> AsyncGenerator[Any, None]:
+    """Interleave items from several async streams as they arrive.
+
+    At most `concurrency` streams are consumed at the same time; with a
+    concurrency of 1 the streams are drained one after another in order.
+    Pending streams are cancelled if the consumer stops early.
+    """
+    if concurrency <= 1:
+        for stream in streams:
+            async with aclosing(stream):
+                async for item in stream:
+                    yield item
+        return
+
+    queue: asyncio.Queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def pump(stream: AsyncIterator[Any]) -> None:
+        try:
+            async with semaphore:
+                async for item in stream:
+                    queue.put_nowait(item)
+        finally:
+            queue.put_nowait(_STREAM_DONE)
+
+    tasks = [asyncio.create_task(pump(stream)) for stream in streams]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item = await queue.get()
+            if item is _STREAM_DONE:
+                remaining -= 1
+                continue
+            yield item
+
+        # Surface unexpected failures from the streams themselves
+        for task in tasks:
+            task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def checkpoint_page(
+    db: AsyncSession,
+    stage_id: UUID,
+    event_type: str,
+    data: dict[str, Any],
+) -> None:
+    """Persist a page as soon as its generation finishes or fails.
+
+    The page's new version is added to the event data, so clients can send
+    it back with their next edit.
+    """
+    if event_type == "page_complete":
+        values = {"code": data["code"], "status": "completed", "error": None}
+    elif event_type == "page_error":
+        values = {"status": "error", "error": data["error"]}
+    else:
+        return
+
+    data["version"] = await save_page_result(
+        db, stage_id, data["platform"], data["page_id"], **values
     )
-    project = result.scalar_one_or_none()
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found",
-        )
+    await db.commit()
 
-    # Check if features stage is confirmed
-    result = await db.execute(
-        select(Stage)
-        .where(Stage.project_id == project_id)
-        .where(Stage.type == "features")
-        .order_by(Stage.version.desc())
+
+async def stream_pages(
+    agent: InteractiveDemoAgent,
+    db: AsyncSession,
+    stage_id: UUID,
+    pages: list[tuple[dict[str, Any], str]],
+    context: dict[str, Any],
+    cancel_event: asyncio.Event | None = None,
+) -> AsyncGenerator[tuple[str, dict[str, Any]], None]:
+    """Generate (page, platform_type) pairs as events, checkpointing each page."""
+    page_streams = [
+        generate_page_events(agent, page, platform_type, context, cancel_event)
+        for page, platform_type in pages
+    ]
+    async for event_type, data in multiplex_streams(
+        page_streams, settings.demo_page_concurrency
+    ):
+        await checkpoint_page(db, stage_id, event_type, data)
+        yield event_type, data
+
+
+def get_last_event_id(http_request: Request) -> int:
+    """Read the SSE Last-Event-ID header (or `last_event_id` query param)."""
+    value = (
+        http_request.headers.get("last-event-id")
+        or http_request.query_params.get("last_event_id")
+        or "0"
+    )
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        return 0
+
+
+def event_stream_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """Wrap formatted SSE events in a streaming response."""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
     )
-    features_stage = result.scalars().first()
-    if not features_stage or features_stage.status != "confirmed":
+
+
+def follow_stream(
+    key: str,
+    producer: Callable[[EventStream], Awaitable[None]],
+    http_request: Request,
+) -> StreamingResponse:
+    """Start a generation in the background (or join the running one) and follow it."""
+    stream, started = get_event_streams().start(key, producer)
+    if not started:
+        logger.info(f"[DEMO SSE] {key} is already running, attaching to it")
+    return event_stream_response(
+        stream.subscribe(get_last_event_id(http_request), http_request.is_disconnected)
+    )
+
+
+def follow_running(key: str, http_request: Request) -> StreamingResponse | None:
+    """Attach to the generation running under `key`, if there is one."""
+    stream = get_event_streams().get(key)
+    if stream is None or stream.done:
+        return None
+    logger.info(f"[DEMO SSE] {key} is already running, attaching to it")
+    return event_stream_response(
+        stream.subscribe(get_last_event_id(http_request), http_request.is_disconnected)
+    )
+
+
+async def reattach_stream(key: str, http_request: Request) -> StreamingResponse:
+    """Reattach to a running or recently finished generation."""
+    events = await get_event_streams().open(
+        key, get_last_event_id(http_request), http_request.is_disconnected
+    )
+    if events is None:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Features must be confirmed before demo generation",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No generation to reattach to",
         )
+    return event_stream_response(events)
+
+
+def demo_stream_key(project_id: UUID) -> str:
+    return f"demo:{project_id}"
 
-    async def event_generator():
-        agent = InteractiveDemoAgent()
 
+def page_stream_key(project_id: UUID, page_id: str) -> str:
+    return f"demo:{project_id}:page:{page_id}"
+
+
+async def run_demo_generation(
+    stream: EventStream,
+    project_id: UUID,
+    project_context: ProjectContext,
+) -> None:
+    """Generate a whole demo, publishing events to `stream`."""
+    agent = InteractiveDemoAgent()
+
+    async with async_session_maker() as db:
         try:
             # Phase 1: Generate structure
             logger.info(f"[DEMO SSE] Phase 1: Generating structure for project {project_id}")
-            structure = await agent.generate_structure(project_id, db)
+            structure = await agent.generate_structure_from_context(project_context)
+
+            # Checkpoint the structure as a new draft version so finished
+            # pages survive a disconnect; the previous demo stays latest
+            demo_stage = await save_demo_draft(project_id, structure, db)
 
             # Count total pages
             total_pages = sum(
@@ -109,7 +356,7 @@ async def generate_demo_stream(
             )
 
             # Send init event
-            yield sse_event("init", {
+            await stream.publish("init", {
                 "total_pages": total_pages,
                 "platforms": structure.get("platforms", []),
                 "project_name": structure.get("project_name", ""),
@@ -117,84 +364,212 @@ async def generate_demo_stream(
             })
 
             # Get project context for page generation
-            context = await agent._get_project_context(project_id, db)
-
-            # Phase 2: Generate each page
-            for platform in structure.get("platforms", []):
-                platform_type = platform.get("type", "pc")
-                context["platform_type"] = platform_type
-
-                for page in platform.get("pages", []):
-                    page_id = page.get("id", "")
-                    page_name = page.get("name", "")
-
-                    # Send page_start event
-                    yield sse_event("page_start", {
-                        "platform": platform_type,
-                        "page_id": page_id,
-                        "page_name": page_name,
-                    })
-
-                    # Stream generate page code
-                    code_chunks = []
-                    try:
-                        async for chunk in agent.generate_page_stream(page, context):
-                            code_chunks.append(chunk)
-                            yield sse_event("page_progress", {
-                                "page_id": page_id,
-                                "chunk": chunk,
-                            })
-
-                        # Combine chunks
-                        full_code = "".join(code_chunks)
-
-                        # Clean up code (remove markdown fences if present)
-                        full_code = clean_code(full_code)
-
-                        # Update page in structure
-                        page["code"] = full_code
-                        page["status"] = "completed"
-
-                        yield sse_event("page_complete", {
-                            "page_id": page_id,
-                            "code": full_code,
-                        })
-
-                    except Exception as e:
-                        logger.error(f"[DEMO SSE] Error generating page {page_id}: {e}")
-                        page["status"] = "error"
-                        page["error"] = str(e)
-                        yield sse_event("page_error", {
-                            "page_id": page_id,
-                            "error": str(e),
-                        })
-
-            # Save to database
-            await save_demo_to_stage(project_id, structure, db)
+            context = agent.build_generation_context(project_context)
+
+            # Phase 2: Generate pages (up to demo_page_concurrency at a time)
+            pages = [
+                (page, platform.get("type", "pc"))
+                for platform in structure.get("platforms", [])
+                for page in platform.get("pages", [])
+            ]
+            async for event_type, data in stream_pages(
+                agent, db, demo_stage.id, pages, context, stream.cancel_event
+            ):
+                await stream.publish(event_type, data)
+
+            await complete_demo_draft(db, demo_stage)
+            await db.commit()
 
             # Send complete event
-            yield sse_event("complete", {
+            await stream.publish("complete", {
                 "demo_project": structure,
             })
 
             logger.info(f"[DEMO SSE] Generation complete for project {project_id}")
 
+        except GenerationCancelled:
+            # Finished pages are already saved; the rest stay pending
+            logger.info(f"[DEMO SSE] Generation cancelled for project {project_id}")
+
         except Exception as e:
             logger.error(f"[DEMO SSE] Error: {e}")
             import traceback
             traceback.print_exc()
-            yield sse_event("error", {
+            await stream.publish("error", {
                 "message": str(e),
             })
 
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
+
+@router.post("/projects/{project_id}/demo/generate/stream")
+async def generate_demo_stream(
+    project_id: UUID,
+    http_request: Request,
+    current_user_id: CurrentUserId,
+    db: DbSession,
+):
+    """
+    Stream-generate interactive demo using SSE.
+
+    Phase 1: Generate structure (fast), saved right away with pending pages
+             as a new demo version in status "generating"
+    Phase 2: Generate pages (streaming, `demo_page_concurrency` at a time),
+             each page saved as soon as it finishes
+
+    The new version replaces the previous demo (becomes the latest and
+    "completed") only after every page has finished; until then the
+    previous demo stays readable.
+
+    SSE Events (each with an increasing `id:`):
+    - init: {total_pages, platforms} - Initial structure
+    - page_start: {platform, page_id, page_name} - Starting page generation
+    - page_progress: {platform, page_id, chunk} - Code chunk
+    - page_complete: {platform, page_id, code, version} - Page finished
+    - page_error: {platform, page_id, error, version} - Page failed (others continue)
+    - complete: {demo_project} - All done
+    - error: {message} - Error occurred
+
+    The generation runs in the background. If it is already running, this
+    attaches to it instead of starting over; a dropped client reattaches
+    with GET on this path and Last-Event-ID. If no client is attached for
+    `sse_detach_grace_seconds`, the in-flight model streams are aborted;
+    finished pages are kept and unfinished ones stay pending (see resume).
+    """
+    await check_permission(current_user_id, project_id, Permission.GENERATE, db)
+
+    # Check if features stage is confirmed (the context is reused by the agent)
+    project_context = await ProjectContext.load(project_id, db)
+    features_stage = project_context.stage("features")
+    if not features_stage or features_stage["status"] != "confirmed":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Features must be confirmed before demo generation",
+        )
+
+    return follow_stream(
+        demo_stream_key(project_id),
+        lambda stream: run_demo_generation(stream, project_id, project_context),
+        http_request,
+    )
+
+
+@router.get("/projects/{project_id}/demo/generate/stream")
+async def reattach_demo_stream(
+    project_id: UUID,
+    http_request: Request,
+    current_user_id: CurrentUserId,
+    db: ReadDbSession,
+):
+    """
+    Reattach to a running (or just finished) demo generation or resume.
+
+    Events after the Last-Event-ID header are replayed, then live events
+    follow. A `replay_gap` event means older events are no longer buffered
+    and the client should reload the demo structure.
+    """
+    await check_permission(current_user_id, project_id, Permission.VIEW, db)
+
+    return await reattach_stream(demo_stream_key(project_id), http_request)
+
+
+async def run_demo_resume(
+    stream: EventStream,
+    project_id: UUID,
+    stage: Stage,
+    page_rows: list[DemoPage],
+    project_context: ProjectContext,
+) -> None:
+    """Generate the unfinished pages of a demo, publishing events to `stream`."""
+    agent = InteractiveDemoAgent()
+
+    async with async_session_maker() as db:
+        try:
+            logger.info(f"[DEMO SSE] Resuming {len(page_rows)} pages for project {project_id}")
+
+            document = await load_demo_document(db, stage)
+            await stream.publish("init", {
+                "total_pages": len(page_rows),
+                "page_ids": [row.page_id for row in page_rows],
+                "platforms": document.get("platforms", []),
+                "project_name": stage.output_data.get("project_name", ""),
+                "shared_state": stage.output_data.get("shared_state", {}),
+            })
+
+            context = agent.build_generation_context(project_context)
+            context["shared_state"] = stage.output_data.get("shared_state", {})
+
+            pages = [
+                (page_to_dict(row, include_code=False), row.platform)
+                for row in page_rows
+            ]
+            async for event_type, data in stream_pages(
+                agent, db, stage.id, pages, context, stream.cancel_event
+            ):
+                await stream.publish(event_type, data)
+
+            # A resumed draft becomes the latest demo once its pages are done
+            await complete_demo_draft(db, stage)
+            await db.commit()
+
+            await stream.publish("complete", {
+                "demo_project": await load_demo_document(db, stage),
+            })
+
+            logger.info(f"[DEMO SSE] Resume complete for project {project_id}")
+
+        except GenerationCancelled:
+            logger.info(f"[DEMO SSE] Resume cancelled for project {project_id}")
+
+        except Exception as e:
+            logger.error(f"[DEMO SSE] Resume error: {e}")
+            await stream.publish("error", {
+                "message": str(e),
+            })
+
+
+@router.post("/projects/{project_id}/demo/resume/stream")
+async def resume_demo_stream(
+    project_id: UUID,
+    http_request: Request,
+    current_user_id: CurrentUserId,
+    db: DbSession,
+):
+    """
+    Resume an interrupted demo generation using SSE.
+
+    Resumes the unfinished draft from generate/stream if there is one,
+    otherwise the latest demo. Only pages whose status is still pending or
+    error are generated; the structure and finished pages are kept. A
+    draft becomes the latest demo when its pages are done. If a generation
+    or resume is already running, this attaches to it.
+
+    SSE Events: same as generate/stream, with init carrying
+    {total_pages, page_ids} for the pages being generated and the
+    platforms with every page's current status and code.
+    """
+    await check_permission(current_user_id, project_id, Permission.GENERATE, db)
+
+    key = demo_stream_key(project_id)
+    attached = follow_running(key, http_request)
+    if attached:
+        return attached
+
+    stage = await get_demo_draft(db, project_id) or await get_demo_stage(db, project_id)
+
+    if not stage or not stage.output_data or "platforms" not in stage.output_data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Demo not found",
+        )
+
+    await ensure_demo_pages(db, stage)
+    page_rows = await get_unfinished_pages(db, stage.id)
+    project_context = await ProjectContext.load(project_id, db)
+    await db.commit()
+
+    return follow_stream(
+        key,
+        lambda stream: run_demo_resume(stream, project_id, stage, page_rows, project_context),
+        http_request,
     )
 
 
@@ -207,13 +582,7 @@ async def get_demo_structure(
     """Get demo structure without code (for quick loading)."""
     await check_permission(current_user_id, project_id, Permission.VIEW, db)
 
-    result = await db.execute(
-        select(Stage)
-        .where(Stage.project_id == project_id)
-        .where(Stage.type == "demo")
-        .order_by(Stage.version.desc())
-    )
-    stage = result.scalars().first()
+    stage = await get_demo_stage(db, project_id)
 
     if not stage or not stage.output_data:
         raise HTTPException(
@@ -221,13 +590,8 @@ async def get_demo_structure(
             detail="Demo not found",
         )
 
-    # Return structure without code
-    structure = stage.output_data.copy()
-    for platform in structure.get("platforms", []):
-        for page in platform.get("pages", []):
-            page.pop("code", None)
-
-    return structure
+    # Return structure with page statuses but without code
+    return await load_demo_document(db, stage, include_code=False)
 
 
 @router.get("/projects/{project_id}/demo/pages/{page_id}")
@@ -240,13 +604,7 @@ async def get_demo_page(
     """Get a single page's code."""
     await check_permission(current_user_id, project_id, Permission.VIEW, db)
 
-    result = await db.execute(
-        select(Stage)
-        .where(Stage.project_id == project_id)
-        .where(Stage.type == "demo")
-        .order_by(Stage.version.desc())
-    )
-    stage = result.scalars().first()
+    stage = await get_demo_stage(db, project_id)
 
     if not stage or not stage.output_data:
         raise HTTPException(
@@ -254,11 +612,14 @@ async def get_demo_page(
             detail="Demo not found",
         )
 
-    # Find the page
-    for platform in stage.output_data.get("platforms", []):
-        for page in platform.get("pages", []):
-            if page.get("id") == page_id:
-                return page
+    if uses_page_rows(stage.output_data):
+        row = await get_page_row(db, stage.id, page_id, include_code=True)
+        if row:
+            return page_to_dict(row)
+    else:
+        page, _ = find_legacy_page(stage.output_data, page_id)
+        if page:
+            return page
 
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
@@ -266,24 +627,19 @@ async def get_demo_page(
     )
 
 
-@router.post("/projects/{project_id}/demo/pages/{page_id}/regenerate")
-async def regenerate_demo_page(
+async def get_page_for_update(
+    db: AsyncSession,
     project_id: UUID,
     page_id: str,
-    current_user_id: CurrentUserId,
-    db: DbSession,
-):
-    """Regenerate a single page with streaming."""
-    await check_permission(current_user_id, project_id, Permission.GENERATE, db)
+    include_code: bool = False,
+    expected_version: int | None = None,
+) -> tuple[Stage, DemoPage]:
+    """Get the latest demo stage and one of its page rows.
 
-    # Get current demo data
-    result = await db.execute(
-        select(Stage)
-        .where(Stage.project_id == project_id)
-        .where(Stage.type == "demo")
-        .order_by(Stage.version.desc())
-    )
-    stage = result.scalars().first()
+    Raises 404 if the page does not exist and 409 if it is no longer at
+    `expected_version`.
+    """
+    stage = await get_demo_stage(db, project_id)
 
     if not stage or not stage.output_data:
         raise HTTPException(
@@ -291,117 +647,159 @@ async def regenerate_demo_page(
             detail="Demo not found",
         )
 
-    # Find the page
-    page_to_regenerate = None
-    platform_type = None
-    for platform in stage.output_data.get("platforms", []):
-        for page in platform.get("pages", []):
-            if page.get("id") == page_id:
-                page_to_regenerate = page
-                platform_type = platform.get("type", "pc")
-                break
-        if page_to_regenerate:
-            break
-
-    if not page_to_regenerate:
+    await ensure_demo_pages(db, stage)
+    row = await get_page_row(db, stage.id, page_id, include_code=include_code)
+
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Page '{page_id}' not found",
         )
 
+    if expected_version is not None and row.version != expected_version:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Page '{page_id}' is at version {row.version}, expected {expected_version}",
+        )
+
+    return stage, row
+
+
+def page_conflict(e: PageVersionConflictError) -> HTTPException:
+    """Map a page version conflict to a 409 response."""
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+async def run_page_regeneration(
+    stream: EventStream,
+    page_row: DemoPage,
+    platform_type: str,
+    shared_state: dict[str, Any],
+    project_context: ProjectContext,
+) -> None:
+    """Regenerate one page, publishing events to `stream`."""
     agent = InteractiveDemoAgent()
+    page_id = page_row.page_id
+    page_to_regenerate = page_to_dict(page_row, include_code=False)
 
-    async def event_generator():
+    async with async_session_maker() as db:
         try:
-            context = await agent._get_project_context(project_id, db)
+            context = agent.build_generation_context(project_context)
             context["platform_type"] = platform_type
-            context["shared_state"] = stage.output_data.get("shared_state", {})
+            context["shared_state"] = shared_state
 
-            yield sse_event("page_start", {
+            await stream.publish("page_start", {
                 "page_id": page_id,
                 "page_name": page_to_regenerate.get("name", ""),
             })
 
             code_chunks = []
-            async for chunk in agent.generate_page_stream(page_to_regenerate, context):
+            async for chunk in batched(agent.generate_page_stream(
+                page_to_regenerate, context, stream.cancel_event
+            )):
                 code_chunks.append(chunk)
-                yield sse_event("page_progress", {
+                await stream.publish("page_progress", {
                     "page_id": page_id,
                     "chunk": chunk,
                 })
 
             full_code = clean_code("".join(code_chunks))
 
-            # Update in stage data
-            page_to_regenerate["code"] = full_code
-            page_to_regenerate["status"] = "completed"
-
-            # Save to database
-            stage.output_data = stage.output_data  # Mark as modified
+            # Save only this page, unless it was edited meanwhile
+            version = await update_page(
+                db, page_row, code=full_code, status="completed", error=None
+            )
             await db.commit()
 
-            yield sse_event("page_complete", {
+            await stream.publish("page_complete", {
                 "page_id": page_id,
                 "code": full_code,
+                "version": version,
             })
 
+        except PageVersionConflictError as e:
+            await db.rollback()
+            logger.info(f"[DEMO SSE] Regenerate conflict: {e}")
+            await stream.publish("error", {"message": str(e), "conflict": True})
+
+        except GenerationCancelled:
+            # The page keeps its previous code and status
+            logger.info(f"[DEMO SSE] Regenerate of page {page_id} cancelled")
+
         except Exception as e:
             logger.error(f"[DEMO SSE] Regenerate error: {e}")
-            yield sse_event("error", {"message": str(e)})
+            await stream.publish("error", {"message": str(e)})
 
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
+
+@router.post("/projects/{project_id}/demo/pages/{page_id}/regenerate")
+async def regenerate_demo_page(
+    project_id: UUID,
+    page_id: str,
+    http_request: Request,
+    current_user_id: CurrentUserId,
+    db: DbSession,
+    request: PageRegenerateRequest | None = None,
+):
+    """Regenerate a single page with streaming.
+
+    Runs in the background like generate/stream: a repeated request while
+    the page is regenerating attaches to it, and GET on this path
+    reattaches with Last-Event-ID.
+    """
+    await check_permission(current_user_id, project_id, Permission.GENERATE, db)
+
+    key = page_stream_key(project_id, page_id)
+    attached = follow_running(key, http_request)
+    if attached:
+        return attached
+
+    stage, page_row = await get_page_for_update(
+        db, project_id, page_id, expected_version=request.version if request else None
+    )
+    project_context = await ProjectContext.load(project_id, db)
+    shared_state = stage.output_data.get("shared_state", {})
+    await db.commit()
+
+    return follow_stream(
+        key,
+        lambda stream: run_page_regeneration(
+            stream, page_row, page_row.platform, shared_state, project_context
+        ),
+        http_request,
     )
 
 
+@router.get("/projects/{project_id}/demo/pages/{page_id}/regenerate")
+async def reattach_page_regeneration(
+    project_id: UUID,
+    page_id: str,
+    http_request: Request,
+    current_user_id: CurrentUserId,
+    db: ReadDbSession,
+):
+    """Reattach to a running (or just finished) page regeneration."""
+    await check_permission(current_user_id, project_id, Permission.VIEW, db)
+
+    return await reattach_stream(page_stream_key(project_id, page_id), http_request)
+
+
 @router.post("/projects/{project_id}/demo/modify")
 async def modify_demo_page(
     project_id: UUID,
     request: ModifyRequest,
+    http_request: Request,
     current_user_id: CurrentUserId,
     db: DbSession,
 ):
     """Modify a page based on natural language instruction with streaming."""
     await check_permission(current_user_id, project_id, Permission.EDIT, db)
 
-    # Get current demo data
-    result = await db.execute(
-        select(Stage)
-        .where(Stage.project_id == project_id)
-        .where(Stage.type == "demo")
-        .order_by(Stage.version.desc())
+    _, page_row = await get_page_for_update(
+        db, project_id, request.page_id, include_code=True, expected_version=request.version
     )
-    stage = result.scalars().first()
-
-    if not stage or not stage.output_data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Demo not found",
-        )
-
-    # Find the page
-    page_to_modify = None
-    for platform in stage.output_data.get("platforms", []):
-        for page in platform.get("pages", []):
-            if page.get("id") == request.page_id:
-                page_to_modify = page
-                break
-        if page_to_modify:
-            break
-
-    if not page_to_modify:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Page '{request.page_id}' not found",
-        )
+    page_to_modify = page_to_dict(page_row, include_code=False)
 
-    current_code = page_to_modify.get("code", "")
+    current_code = page_row.code or ""
     if not current_code:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -409,8 +807,11 @@ async def modify_demo_page(
         )
 
     agent = InteractiveDemoAgent()
+    await db.commit()  # Release the connection while the model streams
 
     async def event_generator():
+        cancel_event, disconnect_watcher = watch_disconnect(http_request)
+
         try:
             yield sse_event("modify_start", {
                 "page_id": request.page_id,
@@ -418,11 +819,12 @@ async def modify_demo_page(
             })
 
             code_chunks = []
-            async for chunk in agent.modify_page_stream(
+            async for chunk in batched(agent.modify_page_stream(
                 instruction=request.instruction,
                 current_code=current_code,
                 page_info=page_to_modify,
-            ):
+                cancel_event=cancel_event,
+            )):
                 code_chunks.append(chunk)
                 yield sse_event("modify_progress", {
                     "page_id": request.page_id,
@@ -431,31 +833,32 @@ async def modify_demo_page(
 
             full_code = clean_code("".join(code_chunks))
 
-            # Update in stage data
-            page_to_modify["code"] = full_code
-
-            # Save to database
-            stage.output_data = stage.output_data  # Mark as modified
+            # Save only this page, unless it was edited meanwhile
+            version = await update_page(db, page_row, code=full_code)
             await db.commit()
 
             yield sse_event("modify_complete", {
                 "page_id": request.page_id,
                 "code": full_code,
+                "version": version,
             })
 
+        except PageVersionConflictError as e:
+            await db.rollback()
+            logger.info(f"[DEMO SSE] Modify conflict: {e}")
+            yield sse_event("error", {"message": str(e), "conflict": True})
+
+        except GenerationCancelled:
+            logger.info(f"[DEMO SSE] Modify of page {request.page_id} cancelled")
+
         except Exception as e:
             logger.error(f"[DEMO SSE] Modify error: {e}")
             yield sse_event("error", {"message": str(e)})
 
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
-    )
+        finally:
+            disconnect_watcher.cancel()
+
+    return event_stream_response(event_generator())
 
 
 @router.post("/projects/{project_id}/demo/pages/{page_id}/skip")
@@ -469,45 +872,19 @@ async def skip_demo_page(
     """Mark a page as skipped."""
     await check_permission(current_user_id, project_id, Permission.EDIT, db)
 
-    # Get current demo data
-    result = await db.execute(
-        select(Stage)
-        .where(Stage.project_id == project_id)
-        .where(Stage.type == "demo")
-        .order_by(Stage.version.desc())
-    )
-    stage = result.scalars().first()
-
-    if not stage or not stage.output_data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Demo not found",
-        )
+    _, page_row = await get_page_for_update(db, project_id, page_id)
 
-    # Find and update the page
-    page_found = False
-    for platform in stage.output_data.get("platforms", []):
-        for page in platform.get("pages", []):
-            if page.get("id") == page_id:
-                page["status"] = "skipped"
-                if request.reason:
-                    page["skip_reason"] = request.reason
-                page_found = True
-                break
-        if page_found:
-            break
-
-    if not page_found:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Page '{page_id}' not found",
-        )
+    values = {"status": "skipped"}
+    if request.reason:
+        values["skip_reason"] = request.reason
 
-    # Save to database
-    stage.output_data = stage.output_data  # Mark as modified
+    try:
+        version = await update_page(db, page_row, request.version, **values)
+    except PageVersionConflictError as e:
+        raise page_conflict(e) from e
     await db.commit()
 
-    return {"status": "success", "page_id": page_id}
+    return {"status": "success", "page_id": page_id, "version": version}
 
 
 @router.put("/projects/{project_id}/demo/pages/{page_id}")
@@ -521,45 +898,22 @@ async def update_demo_page(
     """Update page code directly (manual edit)."""
     await check_permission(current_user_id, project_id, Permission.EDIT, db)
 
-    # Get current demo data
-    result = await db.execute(
-        select(Stage)
-        .where(Stage.project_id == project_id)
-        .where(Stage.type == "demo")
-        .order_by(Stage.version.desc())
-    )
-    stage = result.scalars().first()
-
-    if not stage or not stage.output_data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Demo not found",
-        )
+    _, page_row = await get_page_for_update(db, project_id, page_id)
 
-    # Find and update the page
-    page_found = False
-    for platform in stage.output_data.get("platforms", []):
-        for page in platform.get("pages", []):
-            if page.get("id") == page_id:
-                page["code"] = request.code
-                page["status"] = "completed"
-                page.pop("error", None)  # Clear any previous error
-                page_found = True
-                break
-        if page_found:
-            break
-
-    if not page_found:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Page '{page_id}' not found",
+    try:
+        version = await update_page(
+            db,
+            page_row,
+            request.version,
+            code=request.code,
+            status="completed",
+            error=None,  # Clear any previous error
         )
-
-    # Save to database
-    stage.output_data = stage.output_data  # Mark as modified
+    except PageVersionConflictError as e:
+        raise page_conflict(e) from e
     await db.commit()
 
-    return {"status": "success", "page_id": page_id, "code": request.code}
+    return {"status": "success", "page_id": page_id, "code": request.code, "version": version}
 
 
 @router.get("/projects/{project_id}/demo/status")
@@ -568,16 +922,15 @@ async def get_demo_status(
     current_user_id: CurrentUserId,
     db: DbSession,
 ):
-    """Get demo generation status statistics."""
+    """Get demo generation status statistics.
+
+    When an interrupted generation left a draft (see resume/stream), the
+    counts are the draft's and `draft` is true.
+    """
     await check_permission(current_user_id, project_id, Permission.VIEW, db)
 
-    result = await db.execute(
-        select(Stage)
-        .where(Stage.project_id == project_id)
-        .where(Stage.type == "demo")
-        .order_by(Stage.version.desc())
-    )
-    stage = result.scalars().first()
+    draft = await get_demo_draft(db, project_id)
+    stage = draft or await get_demo_stage(db, project_id)
 
     if not stage or not stage.output_data:
         return {
@@ -587,28 +940,11 @@ async def get_demo_status(
             "skipped": 0,
             "pending": 0,
             "generating": 0,
+            "draft": False,
         }
 
     # Count pages by status
-    stats = {
-        "total": 0,
-        "completed": 0,
-        "error": 0,
-        "skipped": 0,
-        "pending": 0,
-        "generating": 0,
-    }
-
-    for platform in stage.output_data.get("platforms", []):
-        for page in platform.get("pages", []):
-            stats["total"] += 1
-            page_status = page.get("status", "pending")
-            if page_status in stats:
-                stats[page_status] += 1
-            else:
-                stats["pending"] += 1
-
-    return stats
+    return {**await count_page_statuses(db, stage), "draft": draft is not None}
 
 
 def clean_code(code: str) -> str:
@@ -628,33 +964,35 @@ def clean_code(code: str) -> str:
     return code
 
 
-async def save_demo_to_stage(
+async def save_demo_draft(
     project_id: UUID,
     demo_data: dict,
     db: DbSession,
-):
-    """Save demo data to stage table."""
-    # Check if demo stage exists
-    result = await db.execute(
-        select(Stage)
+) -> Stage:
+    """Save a new demo as a draft version (structure on the stage, pages as rows).
+
+    The draft stays "generating", so the previous demo remains the latest
+    version until complete_demo_draft. Older unfinished drafts are
+    superseded and marked failed.
+    """
+    await db.execute(
+        update(Stage)
         .where(Stage.project_id == project_id)
         .where(Stage.type == "demo")
-        .order_by(Stage.version.desc())
+        .where(Stage.status == "generating")
+        .values(status="failed")
+        .execution_options(synchronize_session=False)
     )
-    existing_stage = result.scalars().first()
 
-    if existing_stage:
-        existing_stage.output_data = demo_data
-        existing_stage.status = "completed"
-    else:
-        stage = Stage(
-            project_id=project_id,
-            type="demo",
-            status="completed",
-            output_data=demo_data,
-            version=1,
-        )
-        db.add(stage)
+    stage = Stage(
+        project_id=project_id,
+        type="demo",
+        status="generating",
+        version=await next_stage_version(db, project_id, "demo"),
+    )
+    db.add(stage)
+
+    await save_demo_document(db, stage, demo_data)
 
     # Update project current stage
     result = await db.execute(
@@ -664,3 +1002,4 @@ async def save_demo_to_stage(
     project.current_stage = "demo"
 
     await db.commit()
+    return stage
@@ -0,0 +1,57 @@
+"""Diagnostics API routes for runtime metrics.
+
+Internal only: requests must send the DIAGNOSTICS_TOKEN setting in the
+X-Diagnostics-Token header. The routes return 404 while it is unset.
+"""
+import secrets
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from app.ai.cache import get_response_cache
+from app.ai.rate_limit import get_rate_limit_stats
+from app.config import get_settings
+from app.db.session import get_pool_stats
+from app.services.event_streams import get_event_streams
+from app.services.jobs import get_job_runner
+
+
+async def require_diagnostics_token(
+    x_diagnostics_token: Annotated[str | None, Header()] = None,
+) -> None:
+    """Allow only callers that present the internal diagnostics token."""
+    expected = get_settings().diagnostics_token
+    if not expected:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found",
+        )
+    if not x_diagnostics_token or not secrets.compare_digest(
+        x_diagnostics_token.encode(), expected.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid diagnostics token",
+        )
+
+
+router = APIRouter(dependencies=[Depends(require_diagnostics_token)])
+
+
+@router.get("/pool")
+async def get_pool_diagnostics():
+    """Get database connection pool metrics (checked out, overflow, wait time)."""
+    return get_pool_stats()
+
+
+@router.get("")
+async def get_diagnostics():
+    """Get pool, job worker, SSE stream, AI rate limit and response cache metrics."""
+    cache = get_response_cache()
+    return {
+        "db_pool": get_pool_stats(),
+        "jobs": get_job_runner().stats(),
+        "sse_streams": get_event_streams().stats(),
+        "ai_rate_limits": get_rate_limit_stats(),
+        "ai_cache": cache.stats() if cache else None,
+    }
@@ -0,0 +1,146 @@
+"""Generated file download routes."""
+from urllib.parse import quote
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import CurrentUserId, ReadDbSession
+from app.core.permissions import Permission, check_permission
+from app.core.storage import get_blob_storage
+from app.db.session import async_session_maker, replica_engine
+from app.models.generated_file import GeneratedFile
+from app.models.stage import Stage
+
+router = APIRouter()
+
+
+def parse_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single-range `bytes=` header into inclusive (start, end).
+
+    Returns None when the header should be ignored (malformed or multiple
+    ranges) and raises 416 when the range cannot be satisfied.
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_text, _, end_text = spec.strip().partition("-")
+    try:
+        if not start_text:
+            # Suffix range: the last N bytes
+            length = int(end_text)
+            if length <= 0:
+                raise ValueError
+            start, end = max(size - length, 0), size - 1
+        else:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+            end = min(end, size - 1)
+    except ValueError:
+        return None
+
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+async def find_generated_file(
+    db: AsyncSession,
+    file_id: UUID,
+    user_id: UUID,
+) -> GeneratedFile | None:
+    """Look up a file row and check that the user may view its project."""
+    result = await db.execute(
+        select(GeneratedFile, Stage.project_id)
+        .join(Stage, Stage.id == GeneratedFile.stage_id)
+        .where(GeneratedFile.id == file_id)
+    )
+    row = result.first()
+    if not row:
+        return None
+
+    generated, project_id = row
+    await check_permission(user_id, project_id, Permission.VIEW, db)
+    return generated
+
+
+@router.get("/files/{file_id}")
+async def download_file(
+    file_id: UUID,
+    http_request: Request,
+    current_user_id: CurrentUserId,
+    db: ReadDbSession,
+):
+    """Stream a generated file, with ETag revalidation and byte ranges.
+
+    File rows are read from the replica. A file is usually requested right
+    after the stage output that references it was written, so a row the
+    replica does not have yet is looked up on the primary.
+    """
+    generated = await find_generated_file(db, file_id, current_user_id)
+    if generated is None and replica_engine is not None:
+        async with async_session_maker() as primary:
+            generated = await find_generated_file(primary, file_id, current_user_id)
+
+    if not generated:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found",
+        )
+
+    # Files are written once, so the ID is a strong validator
+    etag = f'"{generated.id}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=31536000, immutable",
+    }
+
+    if_none_match = http_request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in [tag.strip() for tag in if_none_match.split(",")]
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    storage = get_blob_storage()
+    size = generated.file_size
+    if size is None:
+        size = await storage.size(generated.file_url)
+    if size is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File content not found",
+        )
+
+    byte_range = None
+    range_header = http_request.headers.get("range")
+    if_range = http_request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        byte_range = parse_range(range_header, size)
+
+    if generated.file_name:
+        headers["Content-Disposition"] = f"inline; filename*=UTF-8''{quote(generated.file_name)}"
+
+    if byte_range is None:
+        start, end = 0, size - 1
+        status_code = status.HTTP_200_OK
+    else:
+        start, end = byte_range
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1 if size else 0)
+
+    return StreamingResponse(
+        storage.open(generated.file_url, start, end if size else None),
+        status_code=status_code,
+        media_type=generated.mime_type or "application/octet-stream",
+        headers=headers,
+    )
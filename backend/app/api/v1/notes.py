@@ -1,52 +1,70 @@
 """Note API routes."""
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, HTTPException, Query, status
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import DbSession, CurrentUser, CurrentUserId
+from app.api.deps import DbSession, CurrentUserClaims, CurrentUserId
+from app.core.pagination import decode_cursor, encode_cursor
 from app.core.permissions import Permission, check_permission
+from app.core.user_profiles import UserProfile, get_user_profiles
 from app.models.note import Note
 from app.models.stage import Stage
-from app.models.user import User
-from app.schemas.note import NoteCreate, NoteRead, NoteUpdate, NoteWithUser
+from app.schemas.note import NoteCreate, NotePage, NoteRead, NoteUpdate, NoteWithUser
 
 router = APIRouter()
 
+# Shown for authors that could not be found
+UNKNOWN_AUTHOR = UserProfile("Unknown", None)
 
-@router.get("/stages/{stage_id}/notes", response_model=list[NoteWithUser])
-async def list_notes(
-    stage_id: UUID,
-    current_user_id: CurrentUserId,
-    db: DbSession,
-):
-    """List all notes for a stage."""
-    # Get stage to check project permission
+
+async def get_stage_project_id(db: AsyncSession, stage_id: UUID) -> UUID:
+    """Get the project of a stage (without loading its payload), or 404."""
     result = await db.execute(
-        select(Stage).where(Stage.id == stage_id)
+        select(Stage.project_id).where(Stage.id == stage_id)
     )
-    stage = result.scalar_one_or_none()
+    project_id = result.scalar_one_or_none()
 
-    if not stage:
+    if project_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Stage not found",
         )
+    return project_id
 
-    await check_permission(current_user_id, stage.project_id, Permission.VIEW, db)
 
-    # Get notes with user info
+@router.get("/stages/{stage_id}/notes", response_model=NotePage)
+async def list_notes(
+    stage_id: UUID,
+    current_user_id: CurrentUserId,
+    db: DbSession,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+):
+    """List a stage's notes, newest first, keyset-paginated on (created_at, id)."""
+    project_id = await get_stage_project_id(db, stage_id)
+    await check_permission(current_user_id, project_id, Permission.VIEW, db)
+
+    query = select(Note).where(Note.stage_id == stage_id)
+    if cursor:
+        query = query.where(tuple_(Note.created_at, Note.id) < tuple_(*decode_cursor(cursor)))
+
     result = await db.execute(
-        select(Note, User)
-        .join(User, Note.user_id == User.id)
-        .where(Note.stage_id == stage_id)
-        .order_by(Note.created_at.desc())
+        query.order_by(Note.created_at.desc(), Note.id.desc()).limit(limit + 1)
     )
-    rows = result.all()
+    notes = list(result.scalars().all())
 
-    notes = []
-    for note, user in rows:
-        notes.append(
+    has_more = len(notes) > limit
+    notes = notes[:limit]
+
+    # One batched lookup for the page's authors, mostly served from cache
+    authors = await get_user_profiles(db, (note.user_id for note in notes))
+
+    items = []
+    for note in notes:
+        author = authors.get(note.user_id, UNKNOWN_AUTHOR)
+        items.append(
             NoteWithUser(
                 id=note.id,
                 stage_id=note.stage_id,
@@ -54,35 +72,49 @@ async def list_notes(
                 content=note.content,
                 created_at=note.created_at,
                 updated_at=note.updated_at,
-                user_name=user.name,
-                user_avatar=user.avatar_url,
+                user_name=author.name,
+                user_avatar=author.avatar_url,
             )
         )
 
-    return notes
+    return NotePage(
+        items=items,
+        next_cursor=encode_cursor(notes[-1].created_at, notes[-1].id) if has_more else None,
+        has_more=has_more,
+    )
+
+
+@router.get("/projects/{project_id}/notes/counts", response_model=dict[UUID, int])
+async def count_project_notes(
+    project_id: UUID,
+    current_user_id: CurrentUserId,
+    db: DbSession,
+):
+    """Get the note count of every stage in a project, keyed by stage ID.
+
+    Stages without notes are omitted.
+    """
+    await check_permission(current_user_id, project_id, Permission.VIEW, db)
+
+    result = await db.execute(
+        select(Note.stage_id, func.count())
+        .join(Stage, Stage.id == Note.stage_id)
+        .where(Stage.project_id == project_id)
+        .group_by(Note.stage_id)
+    )
+    return {stage_id: count for stage_id, count in result.all()}
 
 
 @router.post("/stages/{stage_id}/notes", response_model=NoteRead, status_code=status.HTTP_201_CREATED)
 async def create_note(
     stage_id: UUID,
     note_data: NoteCreate,
-    current_user: CurrentUser,
+    current_user: CurrentUserClaims,
     db: DbSession,
 ):
     """Create a note for a stage."""
-    # Get stage to check project permission
-    result = await db.execute(
-        select(Stage).where(Stage.id == stage_id)
-    )
-    stage = result.scalar_one_or_none()
-
-    if not stage:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Stage not found",
-        )
-
-    await check_permission(current_user.id, stage.project_id, Permission.ADD_NOTE, db)
+    project_id = await get_stage_project_id(db, stage_id)
+    await check_permission(current_user.id, project_id, Permission.ADD_NOTE, db)
 
     # Create note
     note = Note(
@@ -101,7 +133,7 @@ async def create_note(
 async def update_note(
     note_id: UUID,
     note_data: NoteUpdate,
-    current_user: CurrentUser,
+    current_user: CurrentUserClaims,
     db: DbSession,
 ):
     """Update a note (only by the note author)."""
@@ -133,7 +165,7 @@ async def update_note(
 @router.delete("/notes/{note_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_note(
     note_id: UUID,
-    current_user: CurrentUser,
+    current_user: CurrentUserClaims,
     db: DbSession,
 ):
     """Delete a note (only by the note author)."""
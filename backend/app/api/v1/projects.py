@@ -1,16 +1,19 @@
 """Project API routes."""
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, HTTPException, Query, status
+from sqlalchemy import select, tuple_, union
 from sqlalchemy.orm import selectinload
 
-from app.api.deps import DbSession, CurrentUser, CurrentUserId
-from app.core.permissions import Permission, check_permission
+from app.api.deps import DbSession, CurrentUserClaims, CurrentUserId
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.permissions import Permission, check_permission, invalidate_role_cache
+from app.models.collaborator import Collaborator
 from app.models.project import Project
 from app.models.stage import Stage
 from app.schemas.project import (
     ProjectCreate,
+    ProjectPage,
     ProjectRead,
     ProjectUpdate,
     ProjectWithStages,
@@ -18,51 +21,74 @@ from app.schemas.project import (
 
 router = APIRouter()
 
+# Columns behind StageInfo; the JSONB payloads are never loaded here
+STAGE_INFO_COLUMNS = (Stage.id, Stage.type, Stage.status, Stage.version)
 
-@router.get("", response_model=list[ProjectRead])
+
+@router.get("", response_model=ProjectPage)
 async def list_projects(
-    current_user: CurrentUser,
+    current_user: CurrentUserClaims,
     db: DbSession,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
 ):
-    """List all projects for current user (owned and collaborated)."""
-    # Get owned projects
-    result = await db.execute(
-        select(Project)
+    """List the current user's projects (owned and collaborated), newest first.
+
+    Keyset-paginated on (updated_at, id). Each branch of the UNION reads at
+    most limit + 1 rows from its own index, and the extra row only decides
+    has_more, so no count query is needed.
+    """
+    fetch = limit + 1
+    order = (Project.updated_at.desc(), Project.id.desc())
+
+    owned = (
+        select(Project.id, Project.updated_at)
         .where(Project.owner_id == current_user.id)
         .where(Project.status != "deleted")
-        .order_by(Project.updated_at.desc())
     )
-    owned_projects = list(result.scalars().all())
+    shared = (
+        select(Project.id, Project.updated_at)
+        .join(Collaborator, Collaborator.project_id == Project.id)
+        .where(Collaborator.user_id == current_user.id)
+        .where(Collaborator.accepted_at.isnot(None))
+        .where(Project.status != "deleted")
+    )
+    if cursor:
+        after = tuple_(Project.updated_at, Project.id) < tuple_(*decode_cursor(cursor))
+        owned = owned.where(after)
+        shared = shared.where(after)
 
-    # Get collaborated projects
-    from app.models.collaborator import Collaborator
+    visible = union(
+        owned.order_by(*order).limit(fetch),
+        shared.order_by(*order).limit(fetch),
+    ).subquery()
 
     result = await db.execute(
         select(Project)
-        .join(Collaborator, Project.id == Collaborator.project_id)
-        .where(Collaborator.user_id == current_user.id)
-        .where(Collaborator.accepted_at.isnot(None))
-        .where(Project.status != "deleted")
-        .order_by(Project.updated_at.desc())
+        .join(visible, visible.c.id == Project.id)
+        .order_by(*order)
+        .limit(fetch)
     )
-    collaborated_projects = list(result.scalars().all())
+    projects = list(result.scalars().all())
 
-    # Combine and deduplicate
-    all_projects = owned_projects + collaborated_projects
-    seen_ids = set()
-    unique_projects = []
-    for project in all_projects:
-        if project.id not in seen_ids:
-            seen_ids.add(project.id)
-            unique_projects.append(project)
+    has_more = len(projects) > limit
+    projects = projects[:limit]
+    next_cursor = (
+        encode_cursor(projects[-1].updated_at, projects[-1].id)
+        if has_more else None
+    )
 
-    return [ProjectRead.model_validate(p) for p in unique_projects]
+    return ProjectPage(
+        items=[ProjectRead.model_validate(p) for p in projects],
+        next_cursor=next_cursor,
+        has_more=has_more,
+    )
 
 
 @router.post("", response_model=ProjectWithStages, status_code=status.HTTP_201_CREATED)
 async def create_project(
     project_data: ProjectCreate,
-    current_user: CurrentUser,
+    current_user: CurrentUserClaims,
     db: DbSession,
 ):
     """Create a new project with initial idea."""
@@ -92,7 +118,7 @@ async def create_project(
     # Load stages
     result = await db.execute(
         select(Project)
-        .options(selectinload(Project.stages))
+        .options(selectinload(Project.stages).load_only(*STAGE_INFO_COLUMNS))
         .where(Project.id == project.id)
     )
     project = result.scalar_one()
@@ -111,7 +137,7 @@ async def get_project(
 
     result = await db.execute(
         select(Project)
-        .options(selectinload(Project.stages))
+        .options(selectinload(Project.stages).load_only(*STAGE_INFO_COLUMNS))
         .where(Project.id == project_id)
     )
     project = result.scalar_one_or_none()
@@ -179,3 +205,4 @@ async def delete_project(
 
     project.status = "deleted"
     await db.commit()
+    invalidate_role_cache(project_id)
@@ -2,18 +2,37 @@
 import logging
 from uuid import UUID
 
-from fastapi import APIRouter, Body, HTTPException, status
+from fastapi import APIRouter, Body, HTTPException, Query, Response, status
 
 logger = logging.getLogger(__name__)
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Select, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
 
+from app.ai.context import ProjectContext
 from app.api.deps import DbSession, CurrentUserId
 from app.core.permissions import Permission, check_permission
+from app.models.demo_page import DemoPage
 from app.models.project import Project
 from app.models.stage import Stage
 from typing import Any
-from app.schemas.stage import StageRead, SelectionInput, FeatureSelect, PlatformSelection
+from app.schemas.stage import (
+    StageRead,
+    SelectionInput,
+    FeatureSelect,
+    PlatformSelection,
+    GenerationJobRead,
+)
+from app.services.generation import (
+    StageConflictError,
+    discard_generating_stage,
+    generate_stage_output,
+    next_stage_version,
+    run_stage_generation,
+)
+from app.services.demo_pages import load_demo_document, load_demo_documents, uses_page_rows
+from app.services.jobs import get_job_runner
 
 router = APIRouter()
 
@@ -32,23 +51,183 @@ def get_next_stage(current_stage: str) -> str | None:
     return None
 
 
-@router.get("/projects/{project_id}/stages", response_model=list[StageRead])
+# Stage columns that are always returned
+SUMMARY_FIELDS = ("id", "project_id", "type", "status", "version", "created_at", "updated_at")
+
+# Large JSONB columns, only loaded when asked for
+PAYLOAD_FIELDS = ("input_data", "output_data", "selected_option")
+
+
+def parse_payload_fields(fields: str | None) -> tuple[str, ...]:
+    """Parse a `fields` query value; None means every payload field.
+
+    An empty value (`?fields=`) selects the summary only.
+    """
+    if fields is None:
+        return PAYLOAD_FIELDS
+
+    requested = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in PAYLOAD_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(PAYLOAD_FIELDS)})",
+        )
+    return requested
+
+
+def stage_payload_size():
+    """Stored size of a stage's payload columns, including demo page code.
+
+    pg_column_size reads the stored (possibly compressed) size without
+    detoasting the values.
+    """
+    page_code_size = (
+        select(func.coalesce(func.sum(func.pg_column_size(DemoPage.code)), 0))
+        .where(DemoPage.stage_id == Stage.id)
+        .correlate(Stage)
+        .scalar_subquery()
+    )
+    return (
+        func.coalesce(func.pg_column_size(Stage.input_data), 0)
+        + func.coalesce(func.pg_column_size(Stage.output_data), 0)
+        + func.coalesce(func.pg_column_size(Stage.selected_option), 0)
+        + page_code_size
+    ).label("payload_size")
+
+
+def select_stages(fields: tuple[str, ...]) -> Select:
+    """Select stages with their payload size, loading only the given payload columns."""
+    columns = [getattr(Stage, name) for name in SUMMARY_FIELDS + fields]
+    return select(Stage, stage_payload_size()).options(load_only(*columns))
+
+
+async def read_stage(
+    stage: Stage,
+    db: AsyncSession,
+    fields: tuple[str, ...] = PAYLOAD_FIELDS,
+    payload_size: int | None = None,
+) -> StageRead:
+    """Build a StageRead, assembling demo pages back into output_data.
+
+    Only `fields` are read from the stage, so columns that were not
+    loaded are never lazy-loaded.
+    """
+    values = {name: getattr(stage, name) for name in SUMMARY_FIELDS + fields}
+    if payload_size is not None:
+        values["payload_size"] = payload_size
+    stage_read = StageRead(**values)
+
+    if "output_data" in fields and stage.type == "demo" and uses_page_rows(stage.output_data):
+        stage_read.output_data = await load_demo_document(db, stage)
+    return stage_read
+
+
+async def read_stages(
+    rows: list[tuple[Stage, int | None]],
+    db: AsyncSession,
+    fields: tuple[str, ...],
+) -> list[StageRead]:
+    """Build StageReads for (stage, payload_size) rows.
+
+    Demo pages of every listed demo stage are loaded in one query.
+    """
+    documents = {}
+    if "output_data" in fields:
+        demo_stages = [
+            stage for stage, _ in rows
+            if stage.type == "demo" and uses_page_rows(stage.output_data)
+        ]
+        if demo_stages:
+            documents = await load_demo_documents(db, demo_stages)
+
+    stage_reads = []
+    for stage, payload_size in rows:
+        values = {name: getattr(stage, name) for name in SUMMARY_FIELDS + fields}
+        values["payload_size"] = payload_size
+        if stage.id in documents:
+            values["output_data"] = documents[stage.id]
+        stage_reads.append(StageRead(**values))
+    return stage_reads
+
+
+@router.get(
+    "/projects/{project_id}/stages",
+    response_model=list[StageRead],
+    response_model_exclude_unset=True,
+)
 async def list_stages(
     project_id: UUID,
     current_user_id: CurrentUserId,
     db: DbSession,
+    fields: str | None = Query(
+        None,
+        description="Comma-separated payload fields to include (input_data, output_data, "
+        "selected_option). Empty for a summary only; omitted for all.",
+    ),
+    latest_only: bool = Query(
+        False,
+        description="Only the latest version of each stage type (generating and failed "
+        "versions excluded)",
+    ),
 ):
-    """Get all stages for a project."""
+    """Get the stages of a project.
+
+    Payload columns not named in `fields` are never loaded; fetch them per
+    stage with GET /stages/{stage_id}.
+    """
     await check_permission(current_user_id, project_id, Permission.VIEW, db)
+    payload_fields = parse_payload_fields(fields)
 
-    result = await db.execute(
-        select(Stage)
-        .where(Stage.project_id == project_id)
-        .order_by(Stage.created_at)
+    query = select_stages(payload_fields).where(Stage.project_id == project_id)
+    if latest_only:
+        query = query.where(Stage.is_latest)
+
+    rows = (await db.execute(query.order_by(Stage.created_at))).all()
+
+    return await read_stages(rows, db, payload_fields)
+
+
+@router.get(
+    "/stages/{stage_id}",
+    response_model=StageRead,
+    response_model_exclude_unset=True,
+)
+async def get_stage_payload(
+    stage_id: UUID,
+    current_user_id: CurrentUserId,
+    db: DbSession,
+    fields: str | None = Query(
+        None,
+        description="Comma-separated payload fields to include; omitted for all",
+    ),
+):
+    """Get one stage version by ID, with its payload.
+
+    Stages the user cannot view are reported as not found, so stage IDs
+    cannot be probed, and their payload is never loaded.
+    """
+    payload_fields = parse_payload_fields(fields)
+    not_found = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Stage not found",
     )
-    stages = result.scalars().all()
 
-    return [StageRead.model_validate(s) for s in stages]
+    project_id = await db.scalar(select(Stage.project_id).where(Stage.id == stage_id))
+    if project_id is None:
+        raise not_found
+    try:
+        await check_permission(current_user_id, project_id, Permission.VIEW, db)
+    except HTTPException as e:
+        raise not_found from e
+
+    result = await db.execute(select_stages(payload_fields).where(Stage.id == stage_id))
+    row = result.first()
+    if not row:
+        raise not_found
+
+    stage, payload_size = row
+    return await read_stage(stage, db, payload_fields, payload_size)
 
 
 @router.get("/projects/{project_id}/stages/{stage_type}", response_model=StageRead)
@@ -65,7 +244,7 @@ async def get_stage(
         select(Stage)
         .where(Stage.project_id == project_id)
         .where(Stage.type == stage_type)
-        .order_by(Stage.version.desc())
+        .where(Stage.is_latest)
     )
     stage = result.scalars().first()
 
@@ -75,7 +254,7 @@ async def get_stage(
             detail=f"Stage '{stage_type}' not found",
         )
 
-    return StageRead.model_validate(stage)
+    return await read_stage(stage, db)
 
 
 # NOTE: Platform selection route - save user's platform choices
@@ -94,7 +273,7 @@ async def select_platform(
         select(Stage)
         .where(Stage.project_id == project_id)
         .where(Stage.type == "direction")
-        .order_by(Stage.version.desc())
+        .where(Stage.is_latest)
     )
     direction_stage = result.scalars().first()
 
@@ -109,7 +288,7 @@ async def select_platform(
         select(Stage)
         .where(Stage.project_id == project_id)
         .where(Stage.type == "platform")
-        .order_by(Stage.version.desc())
+        .where(Stage.is_latest)
     )
     existing_stage = result.scalars().first()
 
@@ -121,6 +300,7 @@ async def select_platform(
         existing_stage.selected_option = selection_data
         existing_stage.status = "confirmed"
         await db.commit()
+        ProjectContext.invalidate(db, project_id)
         await db.refresh(existing_stage)
         return StageRead.model_validate(existing_stage)
     else:
@@ -135,6 +315,7 @@ async def select_platform(
         )
         db.add(stage)
         await db.commit()
+        ProjectContext.invalidate(db, project_id)
         await db.refresh(stage)
 
         # Update project current stage
@@ -154,8 +335,17 @@ async def generate_stage(
     stage_type: str,
     current_user_id: CurrentUserId,
     db: DbSession,
+    response: Response,
+    background: bool = True,
 ):
-    """Trigger AI generation for a stage."""
+    """Trigger AI generation for a stage.
+
+    The stage row is committed in status "generating" and the request
+    returns 202 immediately; the generation runs on the job worker pool and
+    is polled via GET /projects/{project_id}/jobs/{job_id}, where the job ID
+    is the returned stage ID. With ?background=false the request waits for
+    the generated stage instead.
+    """
     await check_permission(current_user_id, project_id, Permission.GENERATE, db)
 
     if stage_type not in STAGE_ORDER:
@@ -164,17 +354,6 @@ async def generate_stage(
             detail=f"Invalid stage type: {stage_type}",
         )
 
-    # Get project
-    result = await db.execute(
-        select(Project).where(Project.id == project_id)
-    )
-    project = result.scalar_one_or_none()
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found",
-        )
-
     # Check if previous stage is confirmed (except for direction which follows idea)
     stage_idx = STAGE_ORDER.index(stage_type)
     if stage_idx > 0:
@@ -183,7 +362,7 @@ async def generate_stage(
             select(Stage)
             .where(Stage.project_id == project_id)
             .where(Stage.type == prev_stage_type)
-            .order_by(Stage.version.desc())
+            .where(Stage.is_latest)
         )
         prev_stage = result.scalars().first()
 
@@ -193,17 +372,8 @@ async def generate_stage(
                 detail=f"Previous stage '{prev_stage_type}' must be completed first",
             )
 
-    # Check if stage already exists
-    result = await db.execute(
-        select(Stage)
-        .where(Stage.project_id == project_id)
-        .where(Stage.type == stage_type)
-        .order_by(Stage.version.desc())
-    )
-    existing_stage = result.scalars().first()
-
-    # Create new stage version
-    new_version = (existing_stage.version + 1) if existing_stage else 1
+    # Create new stage version (after any generating or failed ones)
+    new_version = await next_stage_version(db, project_id, stage_type)
 
     stage = Stage(
         project_id=project_id,
@@ -212,37 +382,93 @@ async def generate_stage(
         version=new_version,
     )
     db.add(stage)
-    await db.flush()
-
-    # Call AI agent based on stage type
-    from app.ai.agents import get_agent
-
     try:
-        agent = get_agent(stage_type)
-        output_data = await agent.generate(project_id, db)
-
-        stage.output_data = output_data
-        stage.status = "completed"
-
-        # Update project current stage
-        project.current_stage = stage_type
+        await db.flush()
+    except IntegrityError:
+        # A concurrent request already created this version
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Stage '{stage_type}' v{new_version} is already being generated",
+        )
+    stage_id = stage.id
 
+    if background:
+        # Commit the durable job record before handing it to a worker
         await db.commit()
+        get_job_runner().submit(stage_id, lambda: run_stage_generation(stage_id))
+        response.status_code = status.HTTP_202_ACCEPTED
+        return StageRead.model_validate(stage)
+
+    # Call AI agent without holding a DB connection during the model call
+    try:
+        await generate_stage_output(db, stage)
         await db.refresh(stage)
 
         return StageRead.model_validate(stage)
+    except StageConflictError as e:
+        await discard_generating_stage(db, stage_id)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
     except Exception as e:
         import traceback
         logger.error(f"[GENERATE ERROR] Stage: {stage_type}, Error: {str(e)}")
         logger.error(f"[GENERATE ERROR] Traceback:\n{traceback.format_exc()}")
-        # Rollback to remove the failed stage record
-        await db.rollback()
+        # Remove the failed stage record
+        await discard_generating_stage(db, stage_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"AI generation failed: {str(e)}",
         )
 
 
+@router.get("/projects/{project_id}/jobs/{job_id}", response_model=GenerationJobRead)
+async def get_generation_job(
+    project_id: UUID,
+    job_id: UUID,
+    current_user_id: CurrentUserId,
+    db: DbSession,
+):
+    """Poll the status of a background stage generation."""
+    await check_permission(current_user_id, project_id, Permission.VIEW, db)
+
+    result = await db.execute(
+        select(
+            Stage.id,
+            Stage.project_id,
+            Stage.type,
+            Stage.status,
+            Stage.version,
+            Stage.created_at,
+            Stage.updated_at,
+            Stage.output_data["error"].astext.label("error"),
+        )
+        .where(Stage.id == job_id)
+        .where(Stage.project_id == project_id)
+    )
+    row = result.one_or_none()
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+
+    return GenerationJobRead(
+        job_id=row.id,
+        project_id=row.project_id,
+        stage_type=row.type,
+        status=row.status,
+        version=row.version,
+        error=row.error if row.status == "failed" else None,
+        queued=get_job_runner().is_active(row.id),
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+    )
+
+
 # NOTE: Specific routes must come BEFORE generic routes with path parameters
 @router.put("/projects/{project_id}/stages/features/select-features", response_model=StageRead)
 async def select_features(
@@ -264,7 +490,7 @@ async def select_features(
         select(Stage)
         .where(Stage.project_id == project_id)
         .where(Stage.type == "features")
-        .order_by(Stage.version.desc())
+        .where(Stage.is_latest)
     )
     stage = result.scalars().first()
 
@@ -284,6 +510,7 @@ async def select_features(
     stage.status = "confirmed"
 
     await db.commit()
+    ProjectContext.invalidate(db, project_id)
     await db.refresh(stage)
 
     return StageRead.model_validate(stage)
@@ -305,7 +532,7 @@ async def select_stage_option(
         select(Stage)
         .where(Stage.project_id == project_id)
         .where(Stage.type == stage_type)
-        .order_by(Stage.version.desc())
+        .where(Stage.is_latest)
     )
     stage = result.scalars().first()
 
@@ -352,6 +579,7 @@ async def select_stage_option(
         )
 
     await db.commit()
+    ProjectContext.invalidate(db, project_id)
     await db.refresh(stage)
 
     return StageRead.model_validate(stage)
@@ -371,7 +599,7 @@ async def confirm_stage(
         select(Stage)
         .where(Stage.project_id == project_id)
         .where(Stage.type == stage_type)
-        .order_by(Stage.version.desc())
+        .where(Stage.is_latest)
     )
     stage = result.scalars().first()
 
@@ -399,6 +627,7 @@ async def confirm_stage(
         project.current_stage = next_stage
 
     await db.commit()
+    ProjectContext.invalidate(db, project_id)
     await db.refresh(stage)
 
-    return StageRead.model_validate(stage)
+    return await read_stage(stage, db)
@@ -0,0 +1,152 @@
+"""Google ID token verification with a cached JWKS key store."""
+import asyncio
+import json
+import logging
+import re
+import time
+from typing import Any
+
+from jose import jwt
+
+from app.config import get_settings
+from app.core.http import get_http_client
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ["accounts.google.com", "https://accounts.google.com"]
+
+# Used when the certs response has no usable Cache-Control max-age
+DEFAULT_KEYS_MAX_AGE = 60 * 60
+
+# An unknown kid forces a refetch at most this often, so tokens with made-up
+# kids cannot make every request hit the certs endpoint
+MIN_KEYS_REFRESH_INTERVAL = 60
+
+
+class GoogleTokenError(ValueError):
+    """The ID token could not be verified."""
+
+
+def _parse_max_age(cache_control: str | None) -> int:
+    match = re.search(r"max-age=(\d+)", cache_control or "")
+    return int(match.group(1)) if match else DEFAULT_KEYS_MAX_AGE
+
+
+class GoogleIdTokenVerifier:
+    """Verifies Google ID tokens offline against cached signing keys.
+
+    Keys are fetched from Google's JWKS endpoint, indexed by `kid` and kept
+    until the response's Cache-Control max-age runs out. An unknown `kid`
+    triggers a refresh, to pick up rotated keys, unless the keys were fetched
+    less than `min_refresh_interval` seconds ago. If a refresh fails, the
+    cached keys keep being used and the next attempt waits another
+    `min_refresh_interval` seconds. With `jwks_path` the keys
+    are read from a local JWKS file instead, so no network is needed.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        jwks_url: str = GOOGLE_JWKS_URL,
+        jwks_path: str | None = None,
+        min_refresh_interval: float = MIN_KEYS_REFRESH_INTERVAL,
+    ):
+        self.client_id = client_id
+        self.jwks_url = jwks_url
+        self.jwks_path = jwks_path
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: dict[str, dict[str, Any]] = {}
+        self._expires_at = 0.0
+        self._fetched_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def verify(self, token: str) -> dict[str, Any]:
+        """Verify signature, audience, issuer and expiry; return the claims."""
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except Exception as e:
+            raise GoogleTokenError(f"Malformed token: {e}") from e
+
+        key = await self._get_key(kid)
+        if key is None:
+            raise GoogleTokenError(f"Unknown signing key: {kid}")
+
+        try:
+            # RSA verification is CPU-bound; keep it off the event loop
+            return await asyncio.to_thread(
+                jwt.decode,
+                token,
+                key,
+                algorithms=[key.get("alg", "RS256")],
+                audience=self.client_id,
+                issuer=GOOGLE_ISSUERS,
+                options={"verify_at_hash": False},
+            )
+        except Exception as e:
+            raise GoogleTokenError(str(e)) from e
+
+    async def _get_key(self, kid: str | None) -> dict[str, Any] | None:
+        if time.monotonic() >= self._expires_at:
+            await self._refresh(force=False)
+        elif kid not in self._keys and self._can_force_refresh():
+            await self._refresh(force=True)
+        return self._keys.get(kid)
+
+    def _can_force_refresh(self) -> bool:
+        return (
+            self._fetched_at is None
+            or time.monotonic() - self._fetched_at >= self.min_refresh_interval
+        )
+
+    async def _refresh(self, force: bool) -> None:
+        async with self._lock:
+            # Another caller may have refreshed while we waited
+            if force and not self._can_force_refresh():
+                return
+            if not force and time.monotonic() < self._expires_at:
+                return
+
+            # Counted from the attempt, so failing fetches are not retried per request
+            self._fetched_at = time.monotonic()
+            try:
+                if self.jwks_path:
+                    jwks = await asyncio.to_thread(self._read_jwks_file)
+                    max_age = DEFAULT_KEYS_MAX_AGE
+                else:
+                    jwks, max_age = await self._fetch_jwks()
+            except Exception as e:
+                if not self._keys:
+                    raise
+                # Keep serving the stale keys and back off before the next attempt
+                self._expires_at = max(self._expires_at, self._fetched_at + self.min_refresh_interval)
+                logger.warning(f"[AUTH] Google signing key refresh failed, using cached keys: {e}")
+                return
+
+            self._keys = {key["kid"]: key for key in jwks.get("keys", []) if "kid" in key}
+            self._expires_at = time.monotonic() + max_age
+            logger.info(f"[AUTH] Loaded {len(self._keys)} Google signing keys (max-age {max_age}s)")
+
+    def _read_jwks_file(self) -> dict[str, Any]:
+        with open(self.jwks_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    async def _fetch_jwks(self) -> tuple[dict[str, Any], int]:
+        response = await get_http_client().get(self.jwks_url)
+        response.raise_for_status()
+        return response.json(), _parse_max_age(response.headers.get("cache-control"))
+
+
+_verifier: GoogleIdTokenVerifier | None = None
+
+
+def get_google_token_verifier() -> GoogleIdTokenVerifier:
+    """Get the process-wide Google ID token verifier."""
+    global _verifier
+    if _verifier is None:
+        settings = get_settings()
+        _verifier = GoogleIdTokenVerifier(
+            client_id=settings.google_client_id,
+            jwks_path=settings.google_jwks_path or None,
+        )
+    return _verifier
@@ -0,0 +1,56 @@
+"""Shared outbound HTTP client."""
+import httpx
+
+from app.config import get_settings
+
+_client: httpx.AsyncClient | None = None
+
+
+def create_http_client(
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    """Create a pooled client configured from Settings.
+
+    Pass a transport (e.g. httpx.MockTransport) to serve requests in process.
+    """
+    settings = get_settings()
+    return httpx.AsyncClient(
+        http2=settings.http_client_http2,
+        limits=httpx.Limits(
+            max_connections=settings.http_client_max_connections,
+            max_keepalive_connections=settings.http_client_max_keepalive,
+            keepalive_expiry=settings.http_client_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            settings.http_client_timeout,
+            connect=settings.http_client_connect_timeout,
+        ),
+        transport=transport,
+    )
+
+
+async def start_http_client(
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    """Create the application-wide client (called from the lifespan handler)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+    _client = create_http_client(transport)
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the application-wide client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the application-wide client, creating it if the app has not started."""
+    global _client
+    if _client is None:
+        _client = create_http_client()
+    return _client
@@ -0,0 +1,31 @@
+"""Keyset (cursor) pagination helpers.
+
+A cursor encodes the sort key of the last row on a page, a timestamp
+plus the row ID as tie-breaker, so the next page starts right after it
+with an index range scan instead of an OFFSET.
+"""
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(timestamp: datetime, row_id: UUID) -> str:
+    """Encode a (timestamp, id) sort key as an opaque URL-safe cursor."""
+    payload = json.dumps({"t": timestamp.isoformat(), "id": str(row_id)})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a cursor from encode_cursor; raises 400 if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(payload["t"]), UUID(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
@@ -1,14 +1,18 @@
 """Permission control for project access."""
+import time
 from enum import Enum
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
 from app.models.project import Project
 from app.models.collaborator import Collaborator
 
+settings = get_settings()
+
 
 class Permission(Enum):
     """Available permissions."""
@@ -37,35 +41,73 @@ ROLE_PERMISSIONS: dict[str, list[Permission]] = {
 }
 
 
-async def get_user_role(
+# Key under AsyncSession.info holding roles resolved during the request
+_SESSION_CACHE_KEY = "project_roles"
+
+# Short-lived cross-request cache: (user_id, project_id) -> (expires_at, role)
+_role_cache: dict[tuple[UUID, UUID], tuple[float, str | None]] = {}
+
+
+def invalidate_role_cache(project_id: UUID, user_id: UUID | None = None) -> None:
+    """Drop cached roles for a project (optionally for one user only)."""
+    for key in list(_role_cache):
+        if key[1] == project_id and (user_id is None or key[0] == user_id):
+            _role_cache.pop(key, None)
+
+
+async def _resolve_role(
     user_id: UUID,
     project_id: UUID,
     db: AsyncSession,
-) -> str | None:
-    """Get user's role in a project."""
-    # Check if user is owner
-    result = await db.execute(
-        select(Project).where(
-            Project.id == project_id,
-            Project.owner_id == user_id,
-        )
-    )
-    if result.scalar_one_or_none():
-        return "owner"
+) -> tuple[bool, str | None]:
+    """Return (project exists, user's role) using a single query."""
+    session_cache: dict = db.info.setdefault(_SESSION_CACHE_KEY, {})
+    key = (user_id, project_id)
+    if key in session_cache:
+        return session_cache[key]
+
+    ttl = settings.permission_cache_ttl_seconds
+    if ttl > 0:
+        cached = _role_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            session_cache[key] = (True, cached[1])
+            return session_cache[key]
 
-    # Check if user is collaborator
     result = await db.execute(
-        select(Collaborator).where(
-            Collaborator.project_id == project_id,
-            Collaborator.user_id == user_id,
-            Collaborator.accepted_at.isnot(None),
+        select(Project.owner_id, Collaborator.role)
+        .outerjoin(
+            Collaborator,
+            and_(
+                Collaborator.project_id == Project.id,
+                Collaborator.user_id == user_id,
+                Collaborator.accepted_at.isnot(None),
+            ),
         )
+        .where(Project.id == project_id)
     )
-    collaborator = result.scalar_one_or_none()
-    if collaborator:
-        return collaborator.role
+    row = result.first()
 
-    return None
+    if row is None:
+        resolved = (False, None)
+    elif row.owner_id == user_id:
+        resolved = (True, "owner")
+    else:
+        resolved = (True, row.role)
+
+    session_cache[key] = resolved
+    if ttl > 0 and resolved[0]:
+        _role_cache[key] = (time.monotonic() + ttl, resolved[1])
+    return resolved
+
+
+async def get_user_role(
+    user_id: UUID,
+    project_id: UUID,
+    db: AsyncSession,
+) -> str | None:
+    """Get user's role in a project."""
+    _, role = await _resolve_role(user_id, project_id, db)
+    return role
 
 
 async def check_permission(
@@ -75,21 +117,14 @@ async def check_permission(
     db: AsyncSession,
 ) -> bool:
     """Check if user has required permission for a project."""
-    # Check if project exists
-    result = await db.execute(
-        select(Project).where(Project.id == project_id)
-    )
-    project = result.scalar_one_or_none()
+    project_exists, role = await _resolve_role(user_id, project_id, db)
 
-    if not project:
+    if not project_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found",
         )
 
-    # Get user role
-    role = await get_user_role(user_id, project_id, db)
-
     if not role:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -113,15 +148,9 @@ async def require_owner(
     db: AsyncSession,
 ) -> bool:
     """Require user to be project owner."""
-    result = await db.execute(
-        select(Project).where(
-            Project.id == project_id,
-            Project.owner_id == user_id,
-        )
-    )
-    project = result.scalar_one_or_none()
+    role = await get_user_role(user_id, project_id, db)
 
-    if not project:
+    if role != "owner":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only project owner can perform this action",
@@ -1,4 +1,5 @@
 """Security utilities for JWT and authentication."""
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any
 from uuid import UUID
@@ -28,6 +29,7 @@ def create_access_token(
         "exp": expire,
         "sub": str(subject),
         "iat": datetime.now(timezone.utc),
+        "jti": uuid.uuid4().hex,  # Lets logout revoke this token alone
     }
 
     if extra_data:
@@ -58,9 +60,32 @@ def decode_access_token(token: str) -> dict[str, Any]:
         ) from e
 
 
+def create_user_access_token(
+    user_id: UUID,
+    email: str,
+    name: str,
+    avatar_url: str | None,
+    token_version: int,
+) -> str:
+    """Create an access token carrying the user's identity claims."""
+    return create_access_token(
+        subject=user_id,
+        extra_data={
+            "email": email,
+            "name": name,
+            "avatar_url": avatar_url,
+            "ver": token_version,
+        },
+    )
+
+
 def get_user_id_from_token(token: str) -> UUID:
     """Extract user ID from JWT token."""
-    payload = decode_access_token(token)
+    return get_user_id_from_payload(decode_access_token(token))
+
+
+def get_user_id_from_payload(payload: dict[str, Any]) -> UUID:
+    """Extract user ID from a decoded JWT payload."""
     user_id = payload.get("sub")
     if not user_id:
         raise HTTPException(
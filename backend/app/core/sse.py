@@ -0,0 +1,85 @@
+"""Server-sent event helpers."""
+import asyncio
+from typing import Any, AsyncGenerator, AsyncIterator
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+    import json
+
+
+def encode_json(data: Any) -> str:
+    """Encode an event payload as compact UTF-8 JSON (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(data).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def sse_event(event_type: str, data: Any, event_id: int | None = None) -> str:
+    """Format SSE event (with an `id:` field when event_id is given)."""
+    event = f"event: {event_type}\ndata: {encode_json(data)}\n\n"
+    if event_id is not None:
+        return f"id: {event_id}\n{event}"
+    return event
+
+
+async def coalesce_chunks(
+    chunks: AsyncIterator[str],
+    max_bytes: int,
+    max_delay: float,
+) -> AsyncGenerator[str, None]:
+    """Merge small text chunks into larger ones.
+
+    Buffered text is flushed once it reaches `max_bytes` (UTF-8) or once
+    `max_delay` seconds have passed since its first chunk arrived, whichever
+    comes first, so a slow stream still shows progress. With max_delay <= 0
+    chunks are passed through unchanged.
+    """
+    if max_delay <= 0:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    iterator = chunks.__aiter__()
+    buffer: list[str] = []
+    size = 0
+    deadline = 0.0
+    pending: asyncio.Future | None = None
+
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+
+            timeout = max(deadline - loop.time(), 0.0) if buffer else None
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+
+            if not done:
+                # Time window elapsed while waiting for the next chunk
+                yield "".join(buffer)
+                buffer, size = [], 0
+                continue
+
+            next_chunk, pending = pending, None
+            try:
+                chunk = next_chunk.result()
+            except StopAsyncIteration:
+                break
+
+            if not buffer:
+                deadline = loop.time() + max_delay
+            buffer.append(chunk)
+            size += len(chunk.encode("utf-8"))
+
+            if size >= max_bytes or loop.time() >= deadline:
+                yield "".join(buffer)
+                buffer, size = [], 0
+
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
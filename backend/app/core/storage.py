@@ -0,0 +1,170 @@
+"""Blob storage for generated files (local filesystem or S3-compatible)."""
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import AsyncIterator
+
+from app.config import get_settings
+
+CHUNK_SIZE = 64 * 1024
+
+
+class BlobStorage(ABC):
+    """Stores immutable blobs under string keys."""
+
+    @abstractmethod
+    async def put(self, key: str, data: bytes, content_type: str) -> None:
+        """Write a blob (replacing any existing one)."""
+
+    @abstractmethod
+    async def size(self, key: str) -> int | None:
+        """Get a blob's size in bytes, or None if it does not exist."""
+
+    @abstractmethod
+    def open(self, key: str, start: int = 0, end: int | None = None) -> AsyncIterator[bytes]:
+        """Stream bytes start..end (inclusive; end=None reads to the end)."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete a blob if it exists."""
+
+
+class LocalBlobStorage(BlobStorage):
+    """Blobs as files below a root directory."""
+
+    def __init__(self, root: str):
+        self.root = Path(root).resolve()
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    async def put(self, key: str, data: bytes, content_type: str) -> None:
+        path = self._path(key)
+
+        def _write() -> None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+
+        await asyncio.to_thread(_write)
+
+    async def size(self, key: str) -> int | None:
+        try:
+            return await asyncio.to_thread(os.path.getsize, self._path(key))
+        except FileNotFoundError:
+            return None
+
+    async def open(self, key: str, start: int = 0, end: int | None = None) -> AsyncIterator[bytes]:
+        f = await asyncio.to_thread(open, self._path(key), "rb")
+        try:
+            await asyncio.to_thread(f.seek, start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                size = CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining)
+                chunk = await asyncio.to_thread(f.read, size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(f.close)
+
+    async def delete(self, key: str) -> None:
+        try:
+            await asyncio.to_thread(os.remove, self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class S3BlobStorage(BlobStorage):
+    """Blobs in an S3-compatible bucket (AWS, R2, MinIO, ...); requires boto3."""
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: str | None = None,
+        region: str | None = None,
+        access_key_id: str | None = None,
+        secret_access_key: str | None = None,
+    ):
+        import boto3
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self._client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            aws_access_key_id=access_key_id or None,
+            aws_secret_access_key=secret_access_key or None,
+        )
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    async def put(self, key: str, data: bytes, content_type: str) -> None:
+        await asyncio.to_thread(
+            self._client.put_object,
+            Bucket=self.bucket,
+            Key=self._key(key),
+            Body=data,
+            ContentType=content_type,
+        )
+
+    async def size(self, key: str) -> int | None:
+        try:
+            response = await asyncio.to_thread(
+                self._client.head_object, Bucket=self.bucket, Key=self._key(key)
+            )
+        except self._client.exceptions.ClientError:
+            return None
+        return response["ContentLength"]
+
+    async def open(self, key: str, start: int = 0, end: int | None = None) -> AsyncIterator[bytes]:
+        byte_range = f"bytes={start}-{'' if end is None else end}"
+        response = await asyncio.to_thread(
+            self._client.get_object, Bucket=self.bucket, Key=self._key(key), Range=byte_range
+        )
+        body = response["Body"]
+        try:
+            while True:
+                chunk = await asyncio.to_thread(body.read, CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(
+            self._client.delete_object, Bucket=self.bucket, Key=self._key(key)
+        )
+
+
+_storage: BlobStorage | None = None
+
+
+def get_blob_storage() -> BlobStorage:
+    """Get the configured blob storage backend."""
+    global _storage
+    if _storage is None:
+        settings = get_settings()
+        if settings.storage_backend == "s3":
+            _storage = S3BlobStorage(
+                bucket=settings.s3_bucket,
+                prefix=settings.s3_prefix,
+                endpoint_url=settings.s3_endpoint_url,
+                region=settings.s3_region,
+                access_key_id=settings.s3_access_key_id,
+                secret_access_key=settings.s3_secret_access_key,
+            )
+        else:
+            _storage = LocalBlobStorage(settings.storage_local_dir)
+    return _storage
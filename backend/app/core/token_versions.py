@@ -0,0 +1,117 @@
+"""Revocation of stateless access tokens.
+
+Every access token carries the user's token_version at issue time ("ver")
+and a unique ID ("jti"). Bumping users.token_version revokes all earlier
+tokens of a user (every session); adding a jti to revoked_tokens revokes
+one token (one session). Both are cached in process for
+token_version_cache_ttl_seconds, so other processes pick up a revocation
+within that window.
+"""
+import time
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.db.session import async_session_maker
+from app.models.revoked_token import RevokedToken
+from app.models.user import User
+
+settings = get_settings()
+
+# user_id -> (expires_at, token_version)
+_versions: dict[UUID, tuple[float, int]] = {}
+
+# jti -> (expires_at, revoked)
+_revoked: dict[str, tuple[float, bool]] = {}
+MAX_CACHED_JTIS = 10_000
+
+
+def remember_token_version(user_id: UUID, version: int) -> None:
+    """Cache a user's current token version."""
+    _versions[user_id] = (time.monotonic() + settings.token_version_cache_ttl_seconds, version)
+
+
+async def get_token_version(user_id: UUID) -> int | None:
+    """Get a user's current token version, or None if the user is gone."""
+    cached = _versions.get(user_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(User.token_version).where(User.id == user_id)
+        )
+        version = result.scalar_one_or_none()
+
+    if version is None:
+        _versions.pop(user_id, None)
+        return None
+
+    remember_token_version(user_id, version)
+    return version
+
+
+async def revoke_tokens(user_id: UUID, db: AsyncSession) -> int:
+    """Invalidate every token issued to a user so far."""
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(token_version=User.token_version + 1)
+        .returning(User.token_version)
+    )
+    version = result.scalar_one()
+    await db.commit()
+
+    remember_token_version(user_id, version)
+    return version
+
+
+def _remember_revoked(jti: str, revoked: bool) -> None:
+    now = time.monotonic()
+    if len(_revoked) >= MAX_CACHED_JTIS:
+        for key in [key for key, (expires_at, _) in _revoked.items() if expires_at <= now]:
+            del _revoked[key]
+        if len(_revoked) >= MAX_CACHED_JTIS:
+            _revoked.clear()
+    _revoked[jti] = (now + settings.token_version_cache_ttl_seconds, revoked)
+
+
+async def is_token_revoked(jti: str) -> bool:
+    """Whether a single token was revoked by logout."""
+    cached = _revoked.get(jti)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(RevokedToken.jti).where(RevokedToken.jti == jti)
+        )
+        revoked = result.scalar_one_or_none() is not None
+
+    _remember_revoked(jti, revoked)
+    return revoked
+
+
+async def revoke_token(
+    user_id: UUID,
+    jti: str,
+    expires_at: datetime,
+    db: AsyncSession,
+) -> None:
+    """Invalidate one token; the user's other sessions stay signed in."""
+    await db.execute(
+        insert(RevokedToken)
+        .values(jti=jti, user_id=user_id, expires_at=expires_at)
+        .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+    )
+    # Expired tokens are rejected anyway, so their rows can go
+    await db.execute(
+        delete(RevokedToken).where(RevokedToken.expires_at < datetime.now(timezone.utc))
+    )
+    await db.commit()
+
+    _remember_revoked(jti, True)
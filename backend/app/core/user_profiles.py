@@ -0,0 +1,68 @@
+"""In-process LRU cache of user display info (name, avatar).
+
+Lists that show authors (notes, ...) look up all authors of a page in
+one batched query and serve repeat authors from memory. Entries expire
+after user_profile_cache_ttl_seconds, and login refreshes the entry of
+the user who signed in, so profile changes show up quickly.
+"""
+import time
+from collections import OrderedDict
+from typing import Iterable, NamedTuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.user import User
+
+settings = get_settings()
+
+
+class UserProfile(NamedTuple):
+    """Display info shown next to content a user authored."""
+    name: str
+    avatar_url: str | None
+
+
+# user_id -> (expires_at, profile), least recently used first
+_profiles: OrderedDict[UUID, tuple[float, UserProfile]] = OrderedDict()
+
+
+def remember_user_profile(user_id: UUID, profile: UserProfile) -> None:
+    """Cache a user's display info, evicting the least recently used entries."""
+    if settings.user_profile_cache_size <= 0:
+        return
+    _profiles[user_id] = (time.monotonic() + settings.user_profile_cache_ttl_seconds, profile)
+    _profiles.move_to_end(user_id)
+    while len(_profiles) > settings.user_profile_cache_size:
+        _profiles.popitem(last=False)
+
+
+async def get_user_profiles(
+    db: AsyncSession,
+    user_ids: Iterable[UUID],
+) -> dict[UUID, UserProfile]:
+    """Get display info for users, querying only the ones not cached."""
+    now = time.monotonic()
+    profiles: dict[UUID, UserProfile] = {}
+    missing: set[UUID] = set()
+
+    for user_id in set(user_ids):
+        cached = _profiles.get(user_id)
+        if cached and cached[0] > now:
+            _profiles.move_to_end(user_id)
+            profiles[user_id] = cached[1]
+        else:
+            missing.add(user_id)
+
+    if missing:
+        result = await db.execute(
+            select(User.id, User.name, User.avatar_url).where(User.id.in_(missing))
+        )
+        for row in result.all():
+            profile = UserProfile(row.name, row.avatar_url)
+            profiles[row.id] = profile
+            remember_user_profile(row.id, profile)
+
+    return profiles
@@ -0,0 +1,108 @@
+"""Database schema migrations.
+
+Run once per deploy, before new instances start (pre-deploy / release):
+
+    python -m app.db.migrate
+
+Databases created by the old create_all startup have tables but no
+alembic_version; they are stamped at the baseline revision first and
+then upgraded like any other database. App instances only compare the
+stored revision with the head revision (check_schema_version).
+
+Revisions live in app/db/migrations/versions. Schema changes get a new
+revision; a revision that has been deployed is never edited.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import get_settings
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+MIGRATIONS_DIR = BACKEND_DIR / "app" / "db" / "migrations"
+
+# Schema that create_all produced before migrations existed
+BASELINE_REVISION = "0001_baseline"
+
+
+class SchemaVersionError(Exception):
+    """The database schema is not at the revision this code expects."""
+
+
+def get_alembic_config():
+    """Alembic config with the migrations directory resolved absolutely."""
+    from alembic.config import Config
+
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    return config
+
+
+def get_head_revision() -> str | None:
+    """Get the newest revision in the migrations directory."""
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(get_alembic_config()).get_current_head()
+
+
+def _read_revision(connection: Connection) -> tuple[str | None, bool]:
+    from alembic.runtime.migration import MigrationContext
+
+    revision = MigrationContext.configure(connection).get_current_revision()
+    return revision, inspect(connection).has_table("users")
+
+
+async def get_database_revision(engine: AsyncEngine) -> tuple[str | None, bool]:
+    """Get the stored revision and whether the app tables exist."""
+    async with engine.connect() as conn:
+        return await conn.run_sync(_read_revision)
+
+
+async def check_schema_version(engine: AsyncEngine) -> tuple[str | None, str | None]:
+    """Compare the database revision with the code's head revision.
+
+    Returns (current, head); raises SchemaVersionError when they differ.
+    """
+    current, _ = await get_database_revision(engine)
+    head = get_head_revision()
+    if current != head:
+        raise SchemaVersionError(
+            f"Database schema is at {current or 'no revision'}, expected {head}; "
+            "run `python -m app.db.migrate`"
+        )
+    return current, head
+
+
+def migrate() -> None:
+    """Bring the database to the head revision."""
+    from alembic import command
+
+    async def _inspect() -> tuple[str | None, bool]:
+        engine = create_async_engine(get_settings().database_url, poolclass=NullPool)
+        try:
+            return await get_database_revision(engine)
+        finally:
+            await engine.dispose()
+
+    config = get_alembic_config()
+    current, has_tables = asyncio.run(_inspect())
+
+    if current is None and has_tables:
+        print(f"Existing schema without migration history, stamping {BASELINE_REVISION}")
+        command.stamp(config, BASELINE_REVISION)
+
+    command.upgrade(config, "head")
+    print(f"Database schema is at {get_head_revision()}")
+
+
+if __name__ == "__main__":
+    try:
+        migrate()
+    except Exception as e:
+        print(f"Migration failed: {e}", file=sys.stderr)
+        sys.exit(1)
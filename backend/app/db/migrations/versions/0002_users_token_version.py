@@ -0,0 +1,29 @@
+"""Add users.token_version
+
+Access tokens carry the user's token version; tokens issued before a
+bump are rejected. Written with IF NOT EXISTS because create_all adds
+the column on databases first created after the model change.
+
+Revision ID: 0002_users_token_version
+Revises: 0001_baseline
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0002_users_token_version"
+down_revision: Union[str, None] = "0001_baseline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE users ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "token_version")
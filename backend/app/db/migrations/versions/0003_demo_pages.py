@@ -0,0 +1,53 @@
+"""Add demo_pages
+
+Written defensively: create_all may already have created demo_pages on
+databases that ran the app before migrations existed.
+
+Revision ID: 0003_demo_pages
+Revises: 0002_users_token_version
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0003_demo_pages"
+down_revision: Union[str, None] = "0002_users_token_version"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("demo_pages"):
+        op.execute(
+            "ALTER TABLE demo_pages ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1"
+        )
+        return
+
+    op.create_table(
+        "demo_pages",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("stage_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("page_id", sa.String(length=255), nullable=False),
+        sa.Column("platform", sa.String(length=50), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("meta", postgresql.JSONB(), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("code", sa.Text(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("skip_reason", sa.Text(), nullable=True),
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["stage_id"], ["stages.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("stage_id", "platform", "page_id", name="uq_demo_page_stage_platform_page"),
+    )
+    op.create_index("ix_demo_pages_stage_page", "demo_pages", ["stage_id", "page_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("demo_pages")
@@ -0,0 +1,124 @@
+"""Composite stage version index and latest-version pointer
+
+Replaces the project_id index on stages with a unique
+(project_id, type, version DESC) index, and adds stages.is_latest, kept
+up to date by a trigger, with a partial unique index on
+(project_id, type) WHERE is_latest. Reading the current version of a
+stage is then a single index probe.
+
+Revision ID: 0004_stage_latest_version
+Revises: 0003_demo_pages
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0004_stage_latest_version"
+down_revision: Union[str, None] = "0003_demo_pages"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+REFRESH_LATEST_FUNCTION = """
+CREATE OR REPLACE FUNCTION stages_refresh_latest() RETURNS trigger AS $$
+DECLARE
+    target stages%ROWTYPE;
+    head_id uuid;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        target := OLD;
+    ELSE
+        target := NEW;
+    END IF;
+
+    SELECT id INTO head_id
+    FROM stages
+    WHERE project_id = target.project_id AND type = target.type
+    ORDER BY version DESC
+    LIMIT 1;
+
+    -- Clear the old head first so the partial unique index never sees two
+    UPDATE stages SET is_latest = false
+    WHERE project_id = target.project_id AND type = target.type
+      AND is_latest AND id IS DISTINCT FROM head_id;
+    UPDATE stages SET is_latest = true
+    WHERE id = head_id AND NOT is_latest;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+REFRESH_LATEST_TRIGGER = """
+CREATE TRIGGER stages_refresh_latest
+AFTER INSERT OR DELETE OR UPDATE OF version ON stages
+FOR EACH ROW EXECUTE FUNCTION stages_refresh_latest()
+"""
+
+
+def upgrade() -> None:
+    # Versions must be set and unique per (project, type) before indexing;
+    # renumber only the groups that collide, keeping their order
+    op.execute("UPDATE stages SET version = 1 WHERE version IS NULL")
+    op.execute("""
+        UPDATE stages s
+        SET version = ranked.rn
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY project_id, type ORDER BY version, created_at, id
+            ) AS rn
+            FROM stages
+            WHERE (project_id, type) IN (
+                SELECT project_id, type FROM stages
+                GROUP BY project_id, type, version
+                HAVING count(*) > 1
+            )
+        ) ranked
+        WHERE s.id = ranked.id AND s.version <> ranked.rn
+    """)
+    op.alter_column("stages", "version", existing_type=sa.Integer(), nullable=False)
+
+    op.create_index(
+        "uq_stages_project_type_version",
+        "stages",
+        ["project_id", "type", sa.text("version DESC")],
+        unique=True,
+    )
+    # Covered by the leading column of the composite index
+    op.drop_index("ix_stages_project_id", table_name="stages")
+
+    op.add_column(
+        "stages",
+        sa.Column("is_latest", sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+    op.execute("""
+        UPDATE stages SET is_latest = true
+        WHERE id IN (
+            SELECT DISTINCT ON (project_id, type) id
+            FROM stages
+            ORDER BY project_id, type, version DESC
+        )
+    """)
+    op.create_index(
+        "uq_stages_latest",
+        "stages",
+        ["project_id", "type"],
+        unique=True,
+        postgresql_where=sa.text("is_latest"),
+    )
+
+    op.execute(REFRESH_LATEST_FUNCTION)
+    op.execute(REFRESH_LATEST_TRIGGER)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS stages_refresh_latest ON stages")
+    op.execute("DROP FUNCTION IF EXISTS stages_refresh_latest()")
+    op.drop_index("uq_stages_latest", table_name="stages")
+    op.drop_column("stages", "is_latest")
+    op.create_index("ix_stages_project_id", "stages", ["project_id"])
+    op.drop_index("uq_stages_project_type_version", table_name="stages")
+    op.alter_column("stages", "version", existing_type=sa.Integer(), nullable=True)
@@ -0,0 +1,61 @@
+"""Indexes for the keyset-paginated project list
+
+Adds partial indexes that match the list query: projects that are not
+deleted in (updated_at, id) order, and accepted collaborations. The
+single-column owner_id / user_id indexes stay, because the ON DELETE
+CASCADE from users must find deleted projects and pending invitations
+too. projects.updated_at becomes NOT NULL, since the cursor compares it
+and NULLs would drop out of the keyset.
+
+Revision ID: 0005_project_list_indexes
+Revises: 0004_stage_latest_version
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "0005_project_list_indexes"
+down_revision: Union[str, None] = "0004_stage_latest_version"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "UPDATE projects SET updated_at = coalesce(created_at, now()) "
+        "WHERE updated_at IS NULL"
+    )
+    op.alter_column(
+        "projects",
+        "updated_at",
+        existing_type=sa.DateTime(timezone=True),
+        nullable=False,
+    )
+
+    op.create_index(
+        "ix_projects_owner_updated",
+        "projects",
+        ["owner_id", sa.text("updated_at DESC"), sa.text("id DESC")],
+        postgresql_where=sa.text("status <> 'deleted'"),
+    )
+
+    op.create_index(
+        "ix_collaborators_user_accepted",
+        "collaborators",
+        ["user_id", "project_id"],
+        postgresql_where=sa.text("accepted_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_collaborators_user_accepted", table_name="collaborators")
+    op.drop_index("ix_projects_owner_updated", table_name="projects")
+    op.alter_column(
+        "projects",
+        "updated_at",
+        existing_type=sa.DateTime(timezone=True),
+        nullable=True,
+    )
@@ -0,0 +1,27 @@
+"""Index notes by (stage_id, created_at) for the paginated note list
+
+Replaces the single-column stage_id index, which it covers.
+
+Revision ID: 0006_notes_stage_created_index
+Revises: 0005_project_list_indexes
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0006_notes_stage_created_index"
+down_revision: Union[str, None] = "0005_project_list_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_notes_stage_created", "notes", ["stage_id", "created_at"])
+    op.drop_index("ix_notes_stage_id", table_name="notes")
+
+
+def downgrade() -> None:
+    op.create_index("ix_notes_stage_id", "notes", ["stage_id"])
+    op.drop_index("ix_notes_stage_created", table_name="notes")
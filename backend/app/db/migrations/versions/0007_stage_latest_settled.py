@@ -0,0 +1,116 @@
+"""Point stages.is_latest at the newest settled version
+
+A "generating" row, or the "failed" row it becomes, no longer takes the
+latest pointer: the previous version stays current until the new one
+completes. The trigger now also fires on status changes, and locks the
+project row so concurrent stage writes of one project refresh the
+pointer one at a time instead of violating uq_stages_latest.
+
+Revision ID: 0007_stage_latest_settled
+Revises: 0006_notes_stage_created_index
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0007_stage_latest_settled"
+down_revision: Union[str, None] = "0006_notes_stage_created_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+REFRESH_LATEST_FUNCTION = """
+CREATE OR REPLACE FUNCTION stages_refresh_latest() RETURNS trigger AS $$
+DECLARE
+    target stages%ROWTYPE;
+    head_id uuid;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        target := OLD;
+    ELSE
+        target := NEW;
+    END IF;
+
+    -- One refresh per project at a time; concurrent writers would each
+    -- keep their own head and both set is_latest
+    PERFORM 1 FROM projects WHERE id = target.project_id FOR NO KEY UPDATE;
+
+    SELECT id INTO head_id
+    FROM stages
+    WHERE project_id = target.project_id AND type = target.type
+      AND status NOT IN ('generating', 'failed')
+    ORDER BY version DESC
+    LIMIT 1;
+
+    -- Clear the old head first so the partial unique index never sees two
+    UPDATE stages SET is_latest = false
+    WHERE project_id = target.project_id AND type = target.type
+      AND is_latest AND id IS DISTINCT FROM head_id;
+    UPDATE stages SET is_latest = true
+    WHERE id = head_id AND NOT is_latest;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+REFRESH_LATEST_TRIGGER = """
+CREATE TRIGGER stages_refresh_latest
+AFTER INSERT OR DELETE OR UPDATE OF version, status ON stages
+FOR EACH ROW EXECUTE FUNCTION stages_refresh_latest()
+"""
+
+# 0004's definitions, restored on downgrade
+PREVIOUS_REFRESH_LATEST_FUNCTION = REFRESH_LATEST_FUNCTION.replace(
+    "\n      AND status NOT IN ('generating', 'failed')", ""
+).replace(
+    """    -- One refresh per project at a time; concurrent writers would each
+    -- keep their own head and both set is_latest
+    PERFORM 1 FROM projects WHERE id = target.project_id FOR NO KEY UPDATE;
+
+""",
+    "",
+)
+PREVIOUS_REFRESH_LATEST_TRIGGER = REFRESH_LATEST_TRIGGER.replace(
+    "UPDATE OF version, status", "UPDATE OF version"
+)
+
+
+def upgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS stages_refresh_latest ON stages")
+    op.execute(REFRESH_LATEST_FUNCTION)
+    op.execute(REFRESH_LATEST_TRIGGER)
+
+    # Unsettled heads give up the pointer, then every group without one
+    # takes its newest settled version
+    op.execute("""
+        UPDATE stages SET is_latest = false
+        WHERE is_latest AND status IN ('generating', 'failed')
+    """)
+    op.execute("""
+        UPDATE stages SET is_latest = true
+        WHERE NOT is_latest AND id IN (
+            SELECT DISTINCT ON (project_id, type) id
+            FROM stages
+            WHERE status NOT IN ('generating', 'failed')
+            ORDER BY project_id, type, version DESC
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS stages_refresh_latest ON stages")
+    op.execute(PREVIOUS_REFRESH_LATEST_FUNCTION)
+    op.execute(PREVIOUS_REFRESH_LATEST_TRIGGER)
+
+    op.execute("UPDATE stages SET is_latest = false WHERE is_latest")
+    op.execute("""
+        UPDATE stages SET is_latest = true
+        WHERE id IN (
+            SELECT DISTINCT ON (project_id, type) id
+            FROM stages
+            ORDER BY project_id, type, version DESC
+        )
+    """)
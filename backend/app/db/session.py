@@ -1,16 +1,81 @@
 """Database session configuration."""
-from typing import AsyncGenerator
+import time
+from typing import Any, AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import get_settings
 
 settings = get_settings()
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    future=True,
+
+class PoolWaitStats:
+    """Accumulates how long checkouts waited for a pooled connection."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "checkouts": self.checkouts,
+            "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records the time spent waiting for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_stats.record(time.perf_counter() - start)
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    """Create an async engine with the pool settings from Settings."""
+    connect_args: dict[str, Any] = {}
+    if url.startswith("postgresql+asyncpg"):
+        # asyncpg statement cache and SQLAlchemy's prepared statement cache
+        # (set both to 0 when running behind pgbouncer in transaction mode)
+        connect_args["statement_cache_size"] = settings.db_statement_cache_size
+        connect_args["prepared_statement_cache_size"] = settings.db_statement_cache_size
+
+    return create_async_engine(
+        url,
+        echo=settings.db_echo,
+        future=True,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args=connect_args,
+    )
+
+
+engine = _create_engine(settings.database_url)
+
+# Optional read replica for read-only endpoints
+replica_engine: AsyncEngine | None = (
+    _create_engine(settings.database_replica_url)
+    if settings.database_replica_url
+    else None
 )
 
 async_session_maker = async_sessionmaker(
@@ -22,6 +87,46 @@ async_session_maker = async_sessionmaker(
 )
 
 
+# Sessions for read-only endpoints, bound to the replica when one is
+# configured. Endpoints that write must use get_db; the replica rejects writes.
+# Replica reads can lag behind the primary, so reads that follow a write
+# (read-your-writes) must also use get_db.
+read_session_maker = async_sessionmaker(
+    replica_engine or engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
+
+def _pool_stats(pool: Any) -> dict[str, Any]:
+    stats: dict[str, Any] = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(pool.wait_stats.as_dict())
+    return stats
+
+
+def get_pool_stats() -> dict[str, Any]:
+    """Get connection pool metrics for the primary and replica engines."""
+    stats = {"primary": _pool_stats(engine.pool)}
+    if replica_engine is not None:
+        stats["replica"] = _pool_stats(replica_engine.pool)
+    return stats
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection."""
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Get database session dependency."""
     async with async_session_maker() as session:
@@ -33,3 +138,16 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
         finally:
             await session.close()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get a session for read-only endpoints (bound to the replica if configured)."""
+    async with read_session_maker() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
@@ -1,13 +1,20 @@
 """FastAPI application entry point."""
+import asyncio
 from contextlib import asynccontextmanager
+from datetime import timedelta
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
-from app.api.v1 import auth, projects, stages, collaborators, notes, demo
-from app.db.session import engine
-from app.models import Base
+from app.api.v1 import auth, projects, stages, collaborators, notes, demo, diagnostics, files
+from app.ai.gemini_client import shutdown_image_executor, warm_up_sdks
+from app.core.http import close_http_client, start_http_client
+from app.db.migrate import SchemaVersionError, check_schema_version
+from app.db.session import engine, dispose_engines
+from app.services.event_streams import get_event_streams
+from app.services.generation import maintain_generations
+from app.services.jobs import get_job_runner
 
 
 settings = get_settings()
@@ -16,31 +23,43 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
-    # Startup - try to connect to database with retries
-    import asyncio
-    max_retries = 5
-    retry_delay = 2
-
-    for attempt in range(max_retries):
+    # Startup - migrations run before deploy (python -m app.db.migrate);
+    # here we only check that the schema is at the expected revision
+    if settings.db_schema_check != "off":
         try:
-            async with engine.begin() as conn:
-                # Create tables if not exist (for development)
-                # In production, use Alembic migrations
-                await conn.run_sync(Base.metadata.create_all)
-            print(f"Database connected successfully on attempt {attempt + 1}")
-            break
+            current, _ = await check_schema_version(engine)
+            print(f"Database schema at {current}")
+        except SchemaVersionError as e:
+            if settings.db_schema_check == "strict":
+                raise
+            print(f"Warning: {e}")
         except Exception as e:
-            print(f"Database connection attempt {attempt + 1} failed: {e}")
-            if attempt < max_retries - 1:
-                print(f"Retrying in {retry_delay} seconds...")
-                await asyncio.sleep(retry_delay)
-                retry_delay *= 2  # Exponential backoff
-            else:
-                print("Warning: Could not connect to database, starting without it")
+            print(f"Warning: Could not check database schema: {e}")
+
+    # Outbound HTTP connection pool shared by auth and other integrations
+    await start_http_client()
+
+    # Load the Google AI SDKs off the startup path
+    warmup = asyncio.create_task(warm_up_sdks()) if settings.gemini_sdk_warmup else None
+
+    # Heartbeat this process's generation jobs and fail abandoned ones
+    generation_heartbeat = asyncio.create_task(
+        maintain_generations(
+            settings.generation_heartbeat_seconds,
+            timedelta(seconds=settings.generation_heartbeat_timeout_seconds),
+        )
+    )
 
     yield
     # Shutdown
-    await engine.dispose()
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
+    generation_heartbeat.cancel()
+    await get_job_runner().shutdown()
+    await get_event_streams().shutdown()
+    shutdown_image_executor()
+    await close_http_client()
+    await dispose_engines()
 
 
 app = FastAPI(
@@ -69,6 +88,8 @@ app.include_router(stages.router, prefix="/api/v1", tags=["stages"])
 app.include_router(collaborators.router, prefix="/api/v1", tags=["collaborators"])
 app.include_router(notes.router, prefix="/api/v1", tags=["notes"])
 app.include_router(demo.router, prefix="/api/v1", tags=["demo"])
+app.include_router(files.router, prefix="/api/v1", tags=["files"])
+app.include_router(diagnostics.router, prefix="/api/v1/diagnostics", tags=["diagnostics"])
 
 
 @app.get("/")
@@ -13,6 +13,8 @@ from app.models.stage import Stage
 from app.models.collaborator import Collaborator
 from app.models.note import Note
 from app.models.generated_file import GeneratedFile
+from app.models.demo_page import DemoPage
+from app.models.revoked_token import RevokedToken
 
 __all__ = [
     "Base",
@@ -22,4 +24,6 @@ __all__ = [
     "Collaborator",
     "Note",
     "GeneratedFile",
+    "DemoPage",
+    "RevokedToken",
 ]
@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import String, DateTime, ForeignKey, Index, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -34,7 +34,7 @@ class Collaborator(Base):
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
+        index=True,  # Full index for the user delete cascade; the list index is partial
     )
     role: Mapped[str] = mapped_column(
         String(50),
@@ -53,6 +53,13 @@ class Collaborator(Base):
     # Constraints
     __table_args__ = (
         UniqueConstraint("project_id", "user_id", name="uq_collaborator_project_user"),
+        # Project list: the projects a user has accepted an invitation to
+        Index(
+            "ix_collaborators_user_accepted",
+            "user_id",
+            "project_id",
+            postgresql_where=text("accepted_at IS NOT NULL"),
+        ),
     )
 
     # Relationships
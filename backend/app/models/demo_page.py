@@ -0,0 +1,77 @@
+"""DemoPage model."""
+import uuid
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import String, Text, Integer, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship, deferred
+
+from app.models import Base
+
+if TYPE_CHECKING:
+    from app.models.stage import Stage
+
+
+class DemoPage(Base):
+    """DemoPage model storing one generated page of an interactive demo.
+
+    The demo stage's output_data keeps only the lightweight structure
+    (platforms and page metadata); each page's code and status live here.
+    """
+
+    __tablename__ = "demo_pages"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    stage_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("stages.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    page_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    platform: Mapped[str] = mapped_column(
+        String(50),
+        default="pc",
+        nullable=False,
+    )  # pc, mobile
+    position: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    meta: Mapped[dict[str, Any] | None] = mapped_column(
+        JSONB,
+        nullable=True,
+    )  # name, path, description, transitions, ...
+    status: Mapped[str] = mapped_column(
+        String(50),
+        default="pending",
+        nullable=False,
+    )  # pending, generating, completed, error, skipped
+    code: Mapped[str | None] = deferred(mapped_column(Text, nullable=True))
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    skip_reason: Mapped[str | None] = mapped_column(Text, nullable=True)
+    version: Mapped[int] = mapped_column(
+        Integer,
+        default=1,
+        server_default="1",
+        nullable=False,
+    )  # Bumped on every write, for optimistic concurrency
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint("stage_id", "platform", "page_id", name="uq_demo_page_stage_platform_page"),
+        Index("ix_demo_pages_stage_page", "stage_id", "page_id"),
+    )
+
+    # Relationships
+    stage: Mapped["Stage"] = relationship("Stage", back_populates="demo_pages")
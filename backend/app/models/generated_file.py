@@ -33,7 +33,7 @@ class GeneratedFile(Base):
         String(50),
         nullable=False,
     )  # image, code, document
-    file_url: Mapped[str] = mapped_column(Text, nullable=False)
+    file_url: Mapped[str] = mapped_column(Text, nullable=False)  # Blob storage key
     file_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     mime_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
     file_size: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Text, DateTime, ForeignKey
+from sqlalchemy import Text, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -28,7 +28,6 @@ class Note(Base):
         UUID(as_uuid=True),
         ForeignKey("stages.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -47,6 +46,12 @@ class Note(Base):
         onupdate=lambda: datetime.now(timezone.utc),
     )
 
+    # Indexes
+    __table_args__ = (
+        # Note list: a stage's notes, newest first
+        Index("ix_notes_stage_created", "stage_id", "created_at"),
+    )
+
     # Relationships
     stage: Mapped["Stage"] = relationship("Stage", back_populates="notes")
     user: Mapped["User"] = relationship("User", back_populates="notes")
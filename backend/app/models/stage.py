@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import String, Integer, DateTime, ForeignKey
+from sqlalchemy import DDL, Boolean, String, Integer, DateTime, ForeignKey, Index, event, false, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,6 +13,7 @@ if TYPE_CHECKING:
     from app.models.project import Project
     from app.models.note import Note
     from app.models.generated_file import GeneratedFile
+    from app.models.demo_page import DemoPage
 
 
 class Stage(Base):
@@ -29,7 +30,6 @@ class Stage(Base):
         UUID(as_uuid=True),
         ForeignKey("projects.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     type: Mapped[str] = mapped_column(
         String(50),
@@ -39,7 +39,7 @@ class Stage(Base):
         String(50),
         default="pending",
         nullable=False,
-    )  # pending, generating, completed, confirmed
+    )  # pending, generating, completed, confirmed, failed
     input_data: Mapped[dict[str, Any] | None] = mapped_column(
         JSONB,
         nullable=True,
@@ -52,7 +52,12 @@ class Stage(Base):
         JSONB,
         nullable=True,
     )
-    version: Mapped[int] = mapped_column(Integer, default=1)
+    version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    is_latest: Mapped[bool] = mapped_column(
+        Boolean,
+        server_default=false(),
+        nullable=False,
+    )  # Highest settled version of its (project, type); maintained by a trigger
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
@@ -63,6 +68,24 @@ class Stage(Base):
         onupdate=lambda: datetime.now(timezone.utc),
     )
 
+    # Indexes
+    __table_args__ = (
+        Index(
+            "uq_stages_project_type_version",
+            "project_id",
+            "type",
+            text("version DESC"),
+            unique=True,
+        ),
+        Index(
+            "uq_stages_latest",
+            "project_id",
+            "type",
+            unique=True,
+            postgresql_where=text("is_latest"),
+        ),
+    )
+
     # Relationships
     project: Mapped["Project"] = relationship("Project", back_populates="stages")
     notes: Mapped[list["Note"]] = relationship(
@@ -75,3 +98,61 @@ class Stage(Base):
         back_populates="stage",
         cascade="all, delete-orphan",
     )
+    demo_pages: Mapped[list["DemoPage"]] = relationship(
+        "DemoPage",
+        back_populates="stage",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+
+# Keeps stages.is_latest pointing at the highest version of each
+# (project, type) that is not generating or failed, refreshing one project
+# at a time. Mirrors migrations
+# 0004 and 0007 for databases built by create_all.
+event.listen(
+    Stage.__table__,
+    "after_create",
+    DDL("""
+CREATE OR REPLACE FUNCTION stages_refresh_latest() RETURNS trigger AS $$
+DECLARE
+    target stages%%ROWTYPE;
+    head_id uuid;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        target := OLD;
+    ELSE
+        target := NEW;
+    END IF;
+
+    -- One refresh per project at a time; concurrent writers would each
+    -- keep their own head and both set is_latest
+    PERFORM 1 FROM projects WHERE id = target.project_id FOR NO KEY UPDATE;
+
+    SELECT id INTO head_id
+    FROM stages
+    WHERE project_id = target.project_id AND type = target.type
+      AND status NOT IN ('generating', 'failed')
+    ORDER BY version DESC
+    LIMIT 1;
+
+    UPDATE stages SET is_latest = false
+    WHERE project_id = target.project_id AND type = target.type
+      AND is_latest AND id IS DISTINCT FROM head_id;
+    UPDATE stages SET is_latest = true
+    WHERE id = head_id AND NOT is_latest;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""").execute_if(dialect="postgresql"),
+)
+event.listen(
+    Stage.__table__,
+    "after_create",
+    DDL("""
+CREATE TRIGGER stages_refresh_latest
+AFTER INSERT OR DELETE OR UPDATE OF version, status ON stages
+FOR EACH ROW EXECUTE FUNCTION stages_refresh_latest()
+""").execute_if(dialect="postgresql"),
+)
@@ -36,3 +36,10 @@ class NoteWithUser(NoteRead):
     """Schema for reading a note with user info."""
     user_name: str
     user_avatar: str | None = None
+
+
+class NotePage(BaseModel):
+    """One page of a stage's notes, newest first."""
+    items: list[NoteWithUser]
+    next_cursor: str | None = None  # Pass as ?cursor= to get the next page
+    has_more: bool = False
@@ -37,6 +37,13 @@ class ProjectRead(ProjectBase):
         from_attributes = True
 
 
+class ProjectPage(BaseModel):
+    """One page of the project list, most recently updated first."""
+    items: list[ProjectRead]
+    next_cursor: str | None = None  # Pass as ?cursor= to get the next page
+    has_more: bool = False
+
+
 class StageInfo(BaseModel):
     """Brief stage info for project response."""
     id: UUID
@@ -20,6 +20,7 @@ class StageRead(StageBase):
     output_data: dict[str, Any] | None = None
     selected_option: dict[str, Any] | None = None
     version: int
+    payload_size: int | None = None  # Stored bytes of the payload columns (listings only)
     created_at: datetime
     updated_at: datetime
 
@@ -27,6 +28,22 @@ class StageRead(StageBase):
         from_attributes = True
 
 
+class GenerationJobRead(BaseModel):
+    """Schema for polling a background stage generation.
+
+    The job ID is the ID of the stage row being generated.
+    """
+    job_id: UUID
+    project_id: UUID
+    stage_type: str
+    status: str  # generating, completed, failed
+    version: int
+    error: str | None = None
+    queued: bool = False  # Still tracked by this process's worker pool
+    created_at: datetime
+    updated_at: datetime
+
+
 class StageGenerate(BaseModel):
     """Schema for triggering AI generation."""
     # No input needed - uses previous stage data
@@ -34,6 +34,15 @@ class UserRead(UserBase):
         from_attributes = True
 
 
+class UserClaims(BaseModel):
+    """User identity served from signed token claims (no DB lookup)."""
+    id: UUID
+    email: str | None = None
+    name: str | None = None
+    avatar_url: str | None = None
+    token_version: int = 0
+
+
 class GoogleUserInfo(BaseModel):
     """Schema for Google user info from OAuth."""
     id: str
@@ -0,0 +1,356 @@
+"""Storage for interactive demo pages.
+
+A demo stage keeps only its lightweight structure (project name, shared
+state, platforms and page metadata) in Stage.output_data. Each page's code
+and status live in their own DemoPage row, so reading the structure or one
+page never loads every page's code.
+
+Demos saved before this layout embed everything in output_data. They are
+still readable as-is, and are moved into rows the first time they are
+written to (see ensure_demo_pages).
+
+Page writes go through update_page, which changes only the one row and
+checks its version, so concurrent edits of the same page are detected
+instead of silently overwriting each other.
+"""
+import copy
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+
+from app.ai.context import ProjectContext
+from app.models.demo_page import DemoPage
+from app.models.stage import Stage
+
+# Marks output_data whose pages are stored in demo_pages
+PAGE_STORE_KEY = "page_store"
+PAGE_STORE_ROWS = "demo_pages"
+
+# Per-page fields kept on the row instead of in the structure
+PAGE_STATE_FIELDS = ("code", "status", "error", "skip_reason", "version")
+
+PAGE_STATUSES = ("completed", "error", "skipped", "pending", "generating")
+
+
+class PageVersionConflictError(Exception):
+    """The page was changed by another request since it was read."""
+
+
+def _page_meta(page: dict[str, Any]) -> dict[str, Any]:
+    return {k: v for k, v in page.items() if k not in PAGE_STATE_FIELDS}
+
+
+def build_structure(demo_data: dict[str, Any]) -> dict[str, Any]:
+    """Copy a demo document with all per-page state (code, status) removed."""
+    structure = {k: v for k, v in demo_data.items() if k != "platforms"}
+    structure["platforms"] = [
+        {
+            **{k: v for k, v in platform.items() if k != "pages"},
+            "pages": [_page_meta(page) for page in platform.get("pages", [])],
+        }
+        for platform in demo_data.get("platforms", [])
+    ]
+    structure[PAGE_STORE_KEY] = PAGE_STORE_ROWS
+    return structure
+
+
+def uses_page_rows(output_data: dict[str, Any] | None) -> bool:
+    """Whether a demo stage's pages are stored in demo_pages."""
+    return bool(output_data) and output_data.get(PAGE_STORE_KEY) == PAGE_STORE_ROWS
+
+
+def page_to_dict(row: DemoPage, include_code: bool = True) -> dict[str, Any]:
+    """Render a page row in the shape pages have inside a demo document."""
+    page = dict(row.meta or {})
+    page["id"] = row.page_id
+    if include_code:
+        page["code"] = row.code or ""
+    page["status"] = row.status
+    if row.error:
+        page["error"] = row.error
+    if row.skip_reason:
+        page["skip_reason"] = row.skip_reason
+    page["version"] = row.version
+    return page
+
+
+async def get_demo_stage(db: AsyncSession, project_id: UUID) -> Stage | None:
+    """Get the latest demo stage of a project."""
+    result = await db.execute(
+        select(Stage)
+        .where(Stage.project_id == project_id)
+        .where(Stage.type == "demo")
+        .where(Stage.is_latest)
+    )
+    return result.scalars().first()
+
+
+async def get_demo_draft(db: AsyncSession, project_id: UUID) -> Stage | None:
+    """Get the demo version still being generated, if it is the newest one.
+
+    A regenerated demo is written to a new "generating" row, so the
+    previous demo stays the latest version until the draft completes.
+    """
+    result = await db.execute(
+        select(Stage)
+        .where(Stage.project_id == project_id)
+        .where(Stage.type == "demo")
+        .order_by(Stage.version.desc())
+        .limit(1)
+    )
+    stage = result.scalars().first()
+    if stage and stage.status == "generating" and uses_page_rows(stage.output_data):
+        return stage
+    return None
+
+
+async def complete_demo_draft(db: AsyncSession, stage: Stage) -> None:
+    """Make a finished demo draft the latest demo version."""
+    await db.execute(
+        update(Stage)
+        .where(Stage.id == stage.id)
+        .where(Stage.status == "generating")
+        .values(status="completed")
+        .execution_options(synchronize_session=False)
+    )
+    ProjectContext.invalidate(db, stage.project_id)
+
+
+async def save_demo_document(
+    db: AsyncSession,
+    stage: Stage,
+    demo_data: dict[str, Any],
+) -> None:
+    """Store a full demo document as structure plus one row per page.
+
+    Existing page rows of the stage are replaced.
+    """
+    if stage.id is None:
+        await db.flush()
+
+    stage.output_data = build_structure(demo_data)
+    ProjectContext.invalidate(db, stage.project_id)
+    await db.execute(delete(DemoPage).where(DemoPage.stage_id == stage.id))
+
+    position = 0
+    for platform in demo_data.get("platforms", []):
+        platform_type = platform.get("type", "pc")
+        seen: set[str] = set()
+        for page in platform.get("pages", []):
+            page_id = page.get("id", "")
+            # Page ids are unique per platform; keep the first duplicate only
+            if page_id in seen:
+                continue
+            seen.add(page_id)
+            db.add(DemoPage(
+                stage_id=stage.id,
+                page_id=page_id,
+                platform=platform_type,
+                position=position,
+                meta=_page_meta(page),
+                status=page.get("status", "pending"),
+                code=page.get("code") or None,
+                error=page.get("error"),
+                skip_reason=page.get("skip_reason"),
+            ))
+            position += 1
+
+    await db.flush()
+
+
+async def ensure_demo_pages(db: AsyncSession, stage: Stage) -> None:
+    """Move a legacy demo (pages embedded in output_data) into page rows."""
+    if stage.output_data and "platforms" in stage.output_data and not uses_page_rows(stage.output_data):
+        await save_demo_document(db, stage, stage.output_data)
+
+
+async def get_page_row(
+    db: AsyncSession,
+    stage_id: UUID,
+    page_id: str,
+    include_code: bool = False,
+) -> DemoPage | None:
+    """Look up one page of a demo stage by id."""
+    query = (
+        select(DemoPage)
+        .where(DemoPage.stage_id == stage_id)
+        .where(DemoPage.page_id == page_id)
+        .order_by(DemoPage.position)
+        .limit(1)
+    )
+    if include_code:
+        query = query.options(undefer(DemoPage.code))
+    result = await db.execute(query)
+    return result.scalars().first()
+
+
+async def update_page(
+    db: AsyncSession,
+    row: DemoPage,
+    expected_version: int | None = None,
+    **values: Any,
+) -> int:
+    """Write the given fields of one page and bump its version.
+
+    The write only applies if the page is still at `expected_version`
+    (defaults to the version the row was read at); otherwise
+    PageVersionConflictError is raised. Returns the new version.
+    """
+    if expected_version is None:
+        expected_version = row.version
+
+    result = await db.execute(
+        update(DemoPage)
+        .where(DemoPage.id == row.id)
+        .where(DemoPage.version == expected_version)
+        .values(version=DemoPage.version + 1, **values)
+        .returning(DemoPage.version)
+        .execution_options(synchronize_session=False)
+    )
+    new_version = result.scalar_one_or_none()
+    if new_version is None:
+        raise PageVersionConflictError(
+            f"Page '{row.page_id}' was modified by another request (expected version {expected_version})"
+        )
+    return new_version
+
+
+async def save_page_result(
+    db: AsyncSession,
+    stage_id: UUID,
+    platform: str,
+    page_id: str,
+    **values: Any,
+) -> int | None:
+    """Record the outcome of a page generation (checkpoint), bumping its version.
+
+    Returns the new version, or None if the page row does not exist.
+    """
+    result = await db.execute(
+        update(DemoPage)
+        .where(DemoPage.stage_id == stage_id)
+        .where(DemoPage.platform == platform)
+        .where(DemoPage.page_id == page_id)
+        .values(version=DemoPage.version + 1, **values)
+        .returning(DemoPage.version)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalars().first()
+
+
+async def get_unfinished_pages(db: AsyncSession, stage_id: UUID) -> list[DemoPage]:
+    """Get pages still waiting for code (pending or failed), in demo order."""
+    result = await db.execute(
+        select(DemoPage)
+        .where(DemoPage.stage_id == stage_id)
+        .where(DemoPage.status.in_(("pending", "error")))
+        .order_by(DemoPage.position)
+    )
+    return list(result.scalars())
+
+
+def find_legacy_page(
+    output_data: dict[str, Any],
+    page_id: str,
+) -> tuple[dict[str, Any] | None, str | None]:
+    """Find a page inside a legacy demo document; returns (page, platform)."""
+    for platform in output_data.get("platforms", []):
+        for page in platform.get("pages", []):
+            if page.get("id") == page_id:
+                return page, platform.get("type", "pc")
+    return None, None
+
+
+async def load_demo_document(
+    db: AsyncSession,
+    stage: Stage,
+    include_code: bool = True,
+) -> dict[str, Any]:
+    """Assemble a demo document from its structure and page rows.
+
+    The stored output_data is never mutated; with include_code=False the
+    page code column is not loaded at all.
+    """
+    documents = await load_demo_documents(db, [stage], include_code)
+    return documents[stage.id]
+
+
+async def load_demo_documents(
+    db: AsyncSession,
+    stages: list[Stage],
+    include_code: bool = True,
+) -> dict[UUID, dict[str, Any]]:
+    """Assemble the demo documents of several stages, keyed by stage ID.
+
+    The page rows of every stage are read in one query.
+    """
+    row_stage_ids = [stage.id for stage in stages if uses_page_rows(stage.output_data)]
+    rows: dict[UUID, dict[tuple[str, str], DemoPage]] = {stage_id: {} for stage_id in row_stage_ids}
+    if row_stage_ids:
+        query = select(DemoPage).where(DemoPage.stage_id.in_(row_stage_ids))
+        if include_code:
+            query = query.options(undefer(DemoPage.code))
+        result = await db.execute(query)
+        for row in result.scalars():
+            rows[row.stage_id][(row.platform, row.page_id)] = row
+
+    return {
+        stage.id: _assemble_document(stage.output_data or {}, rows.get(stage.id), include_code)
+        for stage in stages
+    }
+
+
+def _assemble_document(
+    output_data: dict[str, Any],
+    rows: dict[tuple[str, str], DemoPage] | None,
+    include_code: bool,
+) -> dict[str, Any]:
+    if rows is None:
+        # Legacy layout: everything is embedded in output_data
+        document = copy.deepcopy(output_data)
+        if not include_code:
+            for platform in document.get("platforms", []):
+                for page in platform.get("pages", []):
+                    page.pop("code", None)
+        return document
+
+    document = {k: v for k, v in output_data.items() if k not in ("platforms", PAGE_STORE_KEY)}
+    document["platforms"] = []
+    for platform in output_data.get("platforms", []):
+        platform_type = platform.get("type", "pc")
+        pages = []
+        for page in platform.get("pages", []):
+            row = rows.get((platform_type, page.get("id", "")))
+            if row is not None:
+                pages.append(page_to_dict(row, include_code))
+            else:
+                pages.append({**page, "status": "pending"})
+        document["platforms"].append({**platform, "pages": pages})
+    return document
+
+
+async def count_page_statuses(db: AsyncSession, stage: Stage) -> dict[str, int]:
+    """Count a demo's pages by status."""
+    stats = {"total": 0, **{s: 0 for s in PAGE_STATUSES}}
+
+    if uses_page_rows(stage.output_data):
+        result = await db.execute(
+            select(DemoPage.status, func.count())
+            .where(DemoPage.stage_id == stage.id)
+            .group_by(DemoPage.status)
+        )
+        counts = result.all()
+    else:
+        counts = [
+            (page.get("status", "pending"), 1)
+            for platform in (stage.output_data or {}).get("platforms", [])
+            for page in platform.get("pages", [])
+        ]
+
+    for page_status, count in counts:
+        stats["total"] += count
+        stats[page_status if page_status in stats else "pending"] += count
+    return stats
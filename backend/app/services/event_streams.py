@@ -0,0 +1,328 @@
+"""Replayable event streams for long-running SSE generations.
+
+A generation runs as a background task that publishes events into an
+EventStream; HTTP responses are only subscribers. Every event gets a
+monotonically increasing SSE id and the last `buffer_size` events are
+kept, so a client that reconnects with Last-Event-ID receives what it
+missed and then follows the live events. Starting a generation that is
+already running attaches to it instead of starting a second one.
+
+When the last subscriber leaves, the generation is cancelled after a
+grace period unless a client reattaches in the meantime.
+
+With SSE_REPLAY_REDIS_URL set, events are also appended to a Redis stream
+so that another process can replay them (requires the `redis` package).
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncGenerator, AsyncIterator, Awaitable, Callable
+
+from app.config import get_settings
+from app.core.sse import sse_event
+
+logger = logging.getLogger(__name__)
+
+# Seconds between client-disconnect checks while a subscriber is idle
+DISCONNECT_POLL_INTERVAL = 0.5
+
+DisconnectCheck = Callable[[], Awaitable[bool]]
+
+
+class RedisEventLog:
+    """Shared replay backend: mirrors stream events into Redis streams."""
+
+    def __init__(self, url: str, maxlen: int, ttl_seconds: int):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url, decode_responses=True)
+        self.maxlen = maxlen
+        self.ttl_seconds = ttl_seconds
+
+    def _name(self, key: str) -> str:
+        return f"pmstation:sse:{key}"
+
+    async def _add(self, key: str, fields: dict[str, Any]) -> None:
+        name = self._name(key)
+        await self._redis.xadd(name, fields, maxlen=self.maxlen, approximate=True)
+        await self._redis.expire(name, self.ttl_seconds)
+
+    async def append(self, key: str, event_id: int, payload: str) -> None:
+        await self._add(key, {"id": event_id, "payload": payload})
+
+    async def mark_done(self, key: str) -> None:
+        await self._add(key, {"id": 0, "done": 1})
+
+    async def exists(self, key: str) -> bool:
+        return bool(await self._redis.exists(self._name(key)))
+
+    async def subscribe(
+        self,
+        key: str,
+        last_event_id: int = 0,
+        is_disconnected: DisconnectCheck | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """Replay events after last_event_id, then follow until the stream is done."""
+        name = self._name(key)
+        cursor = "0"
+        while True:
+            entries = await self._redis.xread(
+                {name: cursor},
+                count=100,
+                block=int(DISCONNECT_POLL_INTERVAL * 1000),
+            )
+            if not entries:
+                if is_disconnected is not None and await is_disconnected():
+                    return
+                if not await self._redis.exists(name):
+                    return
+                continue
+
+            for _, items in entries:
+                for entry_id, fields in items:
+                    cursor = entry_id
+                    if fields.get("done"):
+                        return
+                    if int(fields["id"]) > last_event_id:
+                        yield fields["payload"]
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class EventStream:
+    """Events of one generation: a bounded replay buffer plus live fan-out."""
+
+    def __init__(
+        self,
+        key: str,
+        buffer_size: int,
+        detach_grace: float,
+        log: RedisEventLog | None = None,
+    ):
+        self.key = key
+        self.cancel_event = asyncio.Event()  # Set to abort the generation
+        self.done = False
+        self.last_id = 0
+        self.finished_at: float | None = None
+        self.task: asyncio.Task | None = None
+        self._events: deque[tuple[int, str]] = deque(maxlen=buffer_size)
+        self._changed = asyncio.Event()
+        self._subscribers = 0
+        self._detach_grace = detach_grace
+        self._detach_handle: asyncio.TimerHandle | None = None
+        self._log = log
+
+        # Also cancel if no client ever attaches
+        self._schedule_detach_check()
+
+    async def publish(self, event_type: str, data: Any) -> None:
+        """Append an event and wake up subscribers."""
+        self.last_id += 1
+        payload = sse_event(event_type, data, event_id=self.last_id)
+        self._events.append((self.last_id, payload))
+        self._notify()
+
+        if self._log is not None:
+            try:
+                await self._log.append(self.key, self.last_id, payload)
+            except Exception as e:
+                logger.warning(f"[SSE] Failed to mirror event for {self.key}: {e}")
+
+    async def close(self) -> None:
+        """Mark the stream finished; subscribers drain the buffer and stop."""
+        self.done = True
+        self.finished_at = time.monotonic()
+        if self._detach_handle is not None:
+            self._detach_handle.cancel()
+        self._notify()
+
+        if self._log is not None:
+            try:
+                await self._log.mark_done(self.key)
+            except Exception as e:
+                logger.warning(f"[SSE] Failed to mirror end of {self.key}: {e}")
+
+    async def subscribe(
+        self,
+        last_event_id: int = 0,
+        is_disconnected: DisconnectCheck | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """Yield formatted events after last_event_id, then live ones."""
+        self._attach()
+        try:
+            cursor = last_event_id
+            while True:
+                changed = self._changed
+                for event_id, payload in self._events_after(cursor):
+                    cursor = max(cursor, event_id)
+                    yield payload
+
+                if self.done:
+                    return
+
+                try:
+                    await asyncio.wait_for(changed.wait(), DISCONNECT_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    if is_disconnected is not None and await is_disconnected():
+                        return
+        finally:
+            self._detach()
+
+    def _events_after(self, cursor: int) -> list[tuple[int, str]]:
+        events = [(event_id, payload) for event_id, payload in self._events if event_id > cursor]
+        if events and events[0][0] > cursor + 1:
+            # Older events fell out of the buffer; tell the client to resync
+            gap = sse_event("replay_gap", {
+                "last_event_id": cursor,
+                "first_available_id": events[0][0],
+            })
+            events.insert(0, (0, gap))
+        return events
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _attach(self) -> None:
+        self._subscribers += 1
+        if self._detach_handle is not None:
+            self._detach_handle.cancel()
+            self._detach_handle = None
+
+    def _detach(self) -> None:
+        self._subscribers -= 1
+        if self._subscribers == 0 and not self.done:
+            self._schedule_detach_check()
+
+    def _schedule_detach_check(self) -> None:
+        self._detach_handle = asyncio.get_running_loop().call_later(
+            self._detach_grace, self._cancel_if_detached
+        )
+
+    def _cancel_if_detached(self) -> None:
+        self._detach_handle = None
+        if self._subscribers == 0 and not self.done:
+            logger.info(f"[SSE] No clients attached to {self.key}, cancelling generation")
+            self.cancel_event.set()
+
+
+class EventStreamRegistry:
+    """Running and recently finished event streams of this process, by key."""
+
+    def __init__(
+        self,
+        buffer_size: int,
+        detach_grace: float,
+        retention: float,
+        log: RedisEventLog | None = None,
+    ):
+        self.buffer_size = buffer_size
+        self.detach_grace = detach_grace
+        self.retention = retention
+        self._log = log
+        self._streams: dict[str, EventStream] = {}
+
+    def start(
+        self,
+        key: str,
+        producer: Callable[[EventStream], Awaitable[None]],
+    ) -> tuple[EventStream, bool]:
+        """Run producer in the background, unless `key` is already running.
+
+        Returns the stream and whether a new generation was started.
+        """
+        self._prune()
+        existing = self._streams.get(key)
+        if existing is not None and not existing.done:
+            return existing, False
+
+        stream = EventStream(key, self.buffer_size, self.detach_grace, self._log)
+        self._streams[key] = stream
+        stream.task = asyncio.create_task(self._run(stream, producer))
+        return stream, True
+
+    async def _run(
+        self,
+        stream: EventStream,
+        producer: Callable[[EventStream], Awaitable[None]],
+    ) -> None:
+        try:
+            await producer(stream)
+        except Exception as e:
+            logger.error(f"[SSE] Generation {stream.key} failed: {e}")
+        finally:
+            await stream.close()
+
+    def get(self, key: str) -> EventStream | None:
+        """Get a running or recently finished stream."""
+        self._prune()
+        return self._streams.get(key)
+
+    async def open(
+        self,
+        key: str,
+        last_event_id: int = 0,
+        is_disconnected: DisconnectCheck | None = None,
+    ) -> AsyncIterator[str] | None:
+        """Reattach to a stream, locally or through the shared backend."""
+        stream = self.get(key)
+        if stream is not None:
+            return stream.subscribe(last_event_id, is_disconnected)
+        if self._log is not None and await self._log.exists(key):
+            return self._log.subscribe(key, last_event_id, is_disconnected)
+        return None
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.retention
+        for key in [
+            key for key, stream in self._streams.items()
+            if stream.done and stream.finished_at is not None and stream.finished_at < cutoff
+        ]:
+            del self._streams[key]
+
+    def stats(self) -> dict[str, Any]:
+        self._prune()
+        active = sum(1 for stream in self._streams.values() if not stream.done)
+        return {
+            "active": active,
+            "finished": len(self._streams) - active,
+            "shared_backend": self._log is not None,
+        }
+
+    async def shutdown(self) -> None:
+        """Cancel running generations and close the shared backend."""
+        tasks = []
+        for stream in self._streams.values():
+            stream.cancel_event.set()
+            if stream.task is not None and not stream.task.done():
+                stream.task.cancel()
+                tasks.append(stream.task)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._log is not None:
+            await self._log.close()
+
+
+_registry: EventStreamRegistry | None = None
+
+
+def get_event_streams() -> EventStreamRegistry:
+    """Get the process-wide event stream registry."""
+    global _registry
+    if _registry is None:
+        settings = get_settings()
+        log = None
+        if settings.sse_replay_redis_url:
+            log = RedisEventLog(
+                settings.sse_replay_redis_url,
+                maxlen=settings.sse_replay_buffer_size,
+                ttl_seconds=settings.sse_stream_retention_seconds,
+            )
+        _registry = EventStreamRegistry(
+            buffer_size=settings.sse_replay_buffer_size,
+            detach_grace=settings.sse_detach_grace_seconds,
+            retention=settings.sse_stream_retention_seconds,
+            log=log,
+        )
+    return _registry
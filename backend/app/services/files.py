@@ -0,0 +1,115 @@
+"""Generated files: bytes in blob storage, metadata in generated_files.
+
+Stage output_data references files by id (and download URL) instead of
+embedding them, so stage payloads stay small.
+"""
+import base64
+import logging
+import uuid
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.storage import get_blob_storage
+from app.models.generated_file import GeneratedFile
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/webp": "webp",
+    "image/gif": "gif",
+}
+
+
+def file_download_url(file_id: UUID) -> str:
+    return f"/api/v1/files/{file_id}"
+
+
+def sniff_image_type(data: bytes) -> str:
+    """Detect an image MIME type from its magic bytes."""
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if data.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    return "application/octet-stream"
+
+
+async def store_generated_file(
+    db: AsyncSession,
+    stage_id: UUID,
+    data: bytes,
+    file_type: str,
+    mime_type: str,
+    file_name: str | None = None,
+) -> GeneratedFile:
+    """Write bytes to blob storage and add their GeneratedFile row to the session."""
+    file_id = uuid.uuid4()
+    extension = IMAGE_EXTENSIONS.get(mime_type, "bin")
+    key = f"stages/{stage_id}/{file_id}.{extension}"
+
+    await get_blob_storage().put(key, data, mime_type)
+
+    generated = GeneratedFile(
+        id=file_id,
+        stage_id=stage_id,
+        file_type=file_type,
+        file_url=key,  # Storage key
+        file_name=file_name or f"{file_id}.{extension}",
+        mime_type=mime_type,
+        file_size=len(data),
+    )
+    db.add(generated)
+    return generated
+
+
+async def externalize_images(
+    db: AsyncSession,
+    stage_id: UUID,
+    output_data: dict[str, Any],
+) -> list[str]:
+    """Move base64 screen images out of output_data into stored files.
+
+    Each screen's "image_data" is replaced by "image_file_id" and
+    "image_url". Returns the storage keys written, so the caller can
+    remove them if the stage write fails.
+    """
+    keys: list[str] = []
+    for screen in output_data.get("screens", []) or []:
+        if not isinstance(screen, dict):
+            continue
+        image_data = screen.pop("image_data", None)
+        if not image_data:
+            continue
+
+        data = base64.b64decode(image_data)
+        mime_type = sniff_image_type(data)
+        generated = await store_generated_file(
+            db,
+            stage_id,
+            data,
+            file_type="image",
+            mime_type=mime_type,
+            file_name=f"{screen.get('name') or 'screen'}.{IMAGE_EXTENSIONS.get(mime_type, 'bin')}",
+        )
+        screen["image_file_id"] = str(generated.id)
+        screen["image_url"] = file_download_url(generated.id)
+        keys.append(generated.file_url)
+
+    return keys
+
+
+async def delete_blobs(keys: list[str]) -> None:
+    """Best-effort removal of blobs whose rows were never committed."""
+    storage = get_blob_storage()
+    for key in keys:
+        try:
+            await storage.delete(key)
+        except Exception as e:
+            logger.warning(f"[FILES] Failed to delete orphaned blob {key}: {e}")
@@ -0,0 +1,249 @@
+"""Stage generation executed in phases, without holding a DB connection.
+
+Generation runs in three steps:
+1. Read the project context and commit (the connection returns to the pool).
+2. Call the model with no session or transaction open.
+3. Write the output with an optimistic check that the stage is still the
+   newest "generating" version of its type, so a concurrent regeneration
+   is never overwritten by an older result.
+
+Generating and failed rows never become the latest version (is_latest):
+the previous version stays current until the new one completes.
+
+While a process works on a "generating" row it refreshes the row's
+updated_at as a heartbeat; rows whose heartbeat stopped (the process
+crashed or was replaced) are failed by maintain_generations.
+"""
+import asyncio
+import logging
+import traceback
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.ai.context import ProjectContext
+from app.db.session import async_session_maker
+from app.models.project import Project
+from app.models.stage import Stage
+from app.services.demo_pages import PAGE_STORE_KEY
+from app.services.files import delete_blobs, externalize_images
+
+logger = logging.getLogger(__name__)
+
+# Stage rows being generated by this process, including synchronous requests
+_active_generations: set[UUID] = set()
+
+
+class StageConflictError(Exception):
+    """A newer generation of the same stage superseded this one."""
+
+
+async def next_stage_version(db: AsyncSession, project_id: UUID, stage_type: str) -> int:
+    """Get the version number for a new row of a stage type.
+
+    Counts every existing row, including generating and failed ones that
+    are not the latest version.
+    """
+    result = await db.execute(
+        select(func.max(Stage.version))
+        .where(Stage.project_id == project_id)
+        .where(Stage.type == stage_type)
+    )
+    return (result.scalar() or 0) + 1
+
+
+async def save_stage_output(
+    db: AsyncSession,
+    stage_id: UUID,
+    project_id: UUID,
+    stage_type: str,
+    version: int,
+    output_data: dict[str, Any],
+) -> None:
+    """Store generated output if the stage is still the latest version.
+
+    Raises StageConflictError when a newer version of the stage exists or
+    the row is no longer generating. Newer versions that failed do not
+    count.
+    """
+    newer = aliased(Stage)
+    newer_version_exists = (
+        select(newer.id)
+        .where(newer.project_id == project_id)
+        .where(newer.type == stage_type)
+        .where(newer.version > version)
+        .where(newer.status != "failed")
+        .exists()
+    )
+
+    result = await db.execute(
+        update(Stage)
+        .where(Stage.id == stage_id)
+        .where(Stage.version == version)
+        .where(Stage.status == "generating")
+        .where(~newer_version_exists)
+        .values(output_data=output_data, status="completed")
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        raise StageConflictError(
+            f"Stage '{stage_type}' v{version} was superseded by a newer generation"
+        )
+    ProjectContext.invalidate(db, project_id)
+
+    await db.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(current_stage=stage_type)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def generate_stage_output(
+    db: AsyncSession,
+    stage: Stage,
+) -> None:
+    """Run the phased generation for a "generating" stage row.
+
+    Pending changes (including the stage row itself) are committed before
+    the model call, so no connection is held while waiting; the session
+    checks out a new one for the final write.
+    """
+    from app.ai.agents import get_agent
+
+    stage_id = stage.id
+    project_id = stage.project_id
+    stage_type = stage.type
+    version = stage.version
+
+    _active_generations.add(stage_id)
+    try:
+        # Phase 1: read context, then end the transaction
+        agent = get_agent(stage_type)
+        context = await ProjectContext.load(project_id, db, refresh=True)
+        await db.commit()
+
+        # Phase 2: call the model with no connection checked out
+        output_data = await agent.generate_from_context(context)
+
+        # Phase 3: store generated files, then the optimistic write
+        file_keys = await externalize_images(db, stage_id, output_data)
+        try:
+            await save_stage_output(db, stage_id, project_id, stage_type, version, output_data)
+            await db.commit()
+        except BaseException:
+            await delete_blobs(file_keys)
+            raise
+    finally:
+        _active_generations.discard(stage_id)
+
+
+async def discard_generating_stage(db: AsyncSession, stage_id: UUID) -> None:
+    """Delete a stage row whose synchronous generation failed."""
+    await db.rollback()
+    await db.execute(
+        delete(Stage)
+        .where(Stage.id == stage_id)
+        .where(Stage.status == "generating")
+    )
+    await db.commit()
+
+
+async def run_stage_generation(stage_id: UUID) -> None:
+    """Generate output for a stage row in status "generating".
+
+    The stage row is the durable job record: on success it becomes
+    "completed" with the agent output, on failure "failed" with the error
+    message stored under output_data["error"].
+    """
+    async with async_session_maker() as db:
+        stage = await db.get(Stage, stage_id)
+        if not stage or stage.status != "generating":
+            return
+
+        project_id = stage.project_id
+        stage_type = stage.type
+
+        try:
+            await generate_stage_output(db, stage)
+            logger.info(f"[JOBS] Stage {stage_type} generated for project {project_id}")
+        except StageConflictError as e:
+            logger.info(f"[JOBS] {e}")
+            await db.rollback()
+            await mark_stage_failed(stage_id, str(e))
+        except Exception as e:
+            logger.error(f"[GENERATE ERROR] Stage: {stage_type}, Error: {str(e)}")
+            logger.error(f"[GENERATE ERROR] Traceback:\n{traceback.format_exc()}")
+            await db.rollback()
+            await mark_stage_failed(stage_id, f"AI generation failed: {str(e)}")
+
+
+async def mark_stage_failed(stage_id: UUID, error: str) -> None:
+    """Record a failed generation on its stage row."""
+    async with async_session_maker() as db:
+        await db.execute(
+            update(Stage)
+            .where(Stage.id == stage_id)
+            .where(Stage.status == "generating")
+            .values(status="failed", output_data={"error": error})
+        )
+        await db.commit()
+
+
+async def heartbeat_generations(stage_ids: set[UUID]) -> None:
+    """Refresh updated_at on the "generating" rows this process owns."""
+    if not stage_ids:
+        return
+    async with async_session_maker() as db:
+        await db.execute(
+            update(Stage)
+            .where(Stage.id.in_(stage_ids))
+            .where(Stage.status == "generating")
+            .values(updated_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+
+async def fail_stale_generations(max_age: timedelta) -> int:
+    """Fail "generating" rows whose heartbeat is older than max_age.
+
+    Live generations in any process keep their heartbeat fresh, so only
+    rows abandoned by a crashed or replaced process are affected. Demo
+    drafts (pages stored as rows) are skipped: their finished pages are
+    checkpointed and an interrupted draft is resumed rather than failed.
+    """
+    cutoff = datetime.now(timezone.utc) - max_age
+    async with async_session_maker() as db:
+        result = await db.execute(
+            update(Stage)
+            .where(Stage.status == "generating")
+            .where(or_(
+                Stage.output_data.is_(None),
+                ~Stage.output_data.has_key(PAGE_STORE_KEY),
+            ))
+            .where(Stage.updated_at < cutoff)
+            .values(status="failed", output_data={"error": "Generation interrupted"})
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount or 0
+
+
+async def maintain_generations(interval: float, timeout: timedelta) -> None:
+    """Heartbeat this process's generations and reap abandoned ones, forever."""
+    from app.services.jobs import get_job_runner
+
+    while True:
+        try:
+            await heartbeat_generations(_active_generations | set(get_job_runner().active_ids()))
+            stale = await fail_stale_generations(timeout)
+            if stale:
+                logger.warning(f"[JOBS] Marked {stale} interrupted generation job(s) as failed")
+        except Exception as e:
+            logger.warning(f"[JOBS] Generation heartbeat failed: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,92 @@
+"""In-process worker pool for background generation jobs."""
+import asyncio
+import logging
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class JobRunner:
+    """Runs submitted jobs as asyncio tasks with a concurrency limit.
+
+    Jobs are keyed by the ID of their durable record (the Stage row), so a
+    job can be looked up or cancelled while it is queued or running. No
+    external broker is needed; jobs past the limit wait on a semaphore.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: dict[UUID, asyncio.Task] = {}
+        self._running: set[UUID] = set()
+
+    def submit(self, job_id: UUID, job: Callable[[], Awaitable[None]]) -> None:
+        """Queue a job; it starts as soon as a worker slot is free."""
+        if job_id in self._tasks:
+            return
+        task = asyncio.create_task(self._run(job_id, job))
+        self._tasks[job_id] = task
+
+    async def _run(self, job_id: UUID, job: Callable[[], Awaitable[None]]) -> None:
+        try:
+            async with self._semaphore:
+                self._running.add(job_id)
+                await job()
+        except asyncio.CancelledError:
+            logger.info(f"[JOBS] Job {job_id} cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"[JOBS] Job {job_id} failed: {e}")
+        finally:
+            self._running.discard(job_id)
+            self._tasks.pop(job_id, None)
+
+    def active_ids(self) -> list[UUID]:
+        """IDs of the jobs queued or running in this process."""
+        return list(self._tasks)
+
+    def is_active(self, job_id: UUID) -> bool:
+        """Whether the job is queued or running in this process."""
+        return job_id in self._tasks
+
+    def cancel(self, job_id: UUID) -> bool:
+        """Cancel a queued or running job."""
+        task = self._tasks.get(job_id)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    def stats(self) -> dict[str, int]:
+        """Return worker pool occupancy."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "running": len(self._running),
+            "queued": len(self._tasks) - len(self._running),
+        }
+
+    async def wait(self) -> None:
+        """Wait for every submitted job to finish (useful in tests)."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks.values()), return_exceptions=True)
+
+    async def shutdown(self) -> None:
+        """Cancel outstanding jobs and wait for them to stop."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+_job_runner: JobRunner | None = None
+
+
+def get_job_runner() -> JobRunner:
+    """Get the process-wide job runner."""
+    global _job_runner
+    if _job_runner is None:
+        _job_runner = JobRunner(get_settings().generation_worker_concurrency)
+    return _job_runner
@@ -0,0 +1,122 @@
+"""Import-time budgets for the backend.
+
+Imports the app in a fresh interpreter with `python -X importtime`.
+Modules listed under "forbidden" in import_budgets.json must not be
+imported at all (the Google AI SDKs load lazily, on first use). Modules
+under "budgets_ms" are checked against their cumulative import time;
+there are none until they are recorded on the deploy machine.
+
+    python scripts/import_time.py                     # check forbidden modules and budgets
+    python scripts/import_time.py --record app.main   # save measured times (+ headroom) as budgets
+    python scripts/import_time.py --top 20            # also list the slowest imports
+
+Exits with status 1 when a budget is exceeded or a forbidden module is
+imported.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+BUDGETS_FILE = Path(__file__).resolve().with_name("import_budgets.json")
+
+
+def measure(target: str) -> dict[str, tuple[float, float]]:
+    """Import `target` and return {module: (self_ms, cumulative_ms)}."""
+    env = {**os.environ, "PYTHONPATH": str(BACKEND_DIR)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{result.stderr[-2000:]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        timings[module.strip()] = (int(self_us) / 1000, int(cumulative_us) / 1000)
+    return timings
+
+
+def measure_best(target: str, runs: int) -> dict[str, tuple[float, float]]:
+    """Best (lowest) timing per module over several runs, to reduce noise."""
+    best: dict[str, tuple[float, float]] = {}
+    for _ in range(runs):
+        for module, timing in measure(target).items():
+            if module not in best or timing[1] < best[module][1]:
+                best[module] = timing
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=3, help="Imports to run (best is kept)")
+    parser.add_argument(
+        "--record",
+        nargs="*",
+        metavar="MODULE",
+        help="Write measured times as budgets for MODULE (default: modules already budgeted)",
+    )
+    parser.add_argument("--top", type=int, default=0, help="List the N slowest imports")
+    args = parser.parse_args()
+
+    config = json.loads(BUDGETS_FILE.read_text())
+    target = config["target"]
+    budgets = config.get("budgets_ms", {})
+    if args.record is not None and not (args.record or budgets):
+        print("No modules to record; pass them to --record, e.g. --record app.main")
+        return 1
+
+    timings = measure_best(target, args.runs)
+
+    if args.top:
+        print(f"Slowest imports (self time) for `import {target}`:")
+        for module, (self_ms, cumulative_ms) in sorted(
+            timings.items(), key=lambda item: item[1][0], reverse=True
+        )[:args.top]:
+            print(f"  {self_ms:8.1f} ms self {cumulative_ms:8.1f} ms total  {module}")
+        print()
+
+    if args.record is not None:
+        headroom = config.get("headroom", 1.5)
+        modules = args.record or list(budgets)
+        for module in modules:
+            if module not in timings:
+                print(f"  skip  {module}: not imported")
+        config["budgets_ms"] = {
+            module: round(timings[module][1] * headroom)
+            for module in modules
+            if module in timings
+        }
+        BUDGETS_FILE.write_text(json.dumps(config, indent=2) + "\n")
+        print(f"Recorded budgets ({headroom}x measured) in {BUDGETS_FILE.name}")
+        return 0
+
+    failed = False
+    for module, budget in budgets.items():
+        if module not in timings:
+            print(f"  skip  {module}: not imported")
+            continue
+        cumulative_ms = timings[module][1]
+        ok = cumulative_ms <= budget
+        failed |= not ok
+        print(f"  {'ok  ' if ok else 'OVER'}  {module}: {cumulative_ms:.1f} ms (budget {budget} ms)")
+
+    for module in config.get("forbidden", []):
+        if module in timings:
+            failed = True
+            print(f"  FAIL  {module} is imported by `import {target}`")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
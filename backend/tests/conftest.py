@@ -0,0 +1,51 @@
+"""Shared test fixtures.
+
+Database tests run against the PostgreSQL database named by
+TEST_DATABASE_URL, whose tables are dropped and recreated for each test.
+They are skipped when it is not set.
+"""
+import os
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.models import Base, Project, User
+
+
+@pytest_asyncio.fixture
+async def db_engine():
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    engine = create_async_engine(url, poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_maker(db_engine):
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture
+async def project(session_maker) -> Project:
+    """A project owned by a fresh user."""
+    async with session_maker() as db:
+        user = User(
+            google_id=f"google-{uuid.uuid4()}",
+            email=f"{uuid.uuid4()}@example.com",
+            name="Owner",
+        )
+        db.add(user)
+        await db.flush()
+        project = Project(owner_id=user.id, title="Test project")
+        db.add(project)
+        await db.commit()
+        return project
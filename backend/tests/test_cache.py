@@ -0,0 +1,54 @@
+"""Tests for the Gemini response cache."""
+import pytest
+
+from app.ai.cache import FileCacheBackend, ResponseCache, make_cache_key
+
+
+def test_cache_key_ignores_param_order():
+    assert make_cache_key("text", "m", {"a": 1, "b": 2}) == make_cache_key(
+        "text", "m", {"b": 2, "a": 1}
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_returns_a_copy():
+    cache = ResponseCache()
+    value = {"screens": [{"name": "Home"}]}
+    await cache.set("k", value)
+
+    # Mutating the stored value or a returned value must not leak into the cache
+    value["screens"].append({"name": "Leaked"})
+    first = await cache.get("k")
+    first["screens"][0]["id"] = "screen_1"
+    second = await cache.get("k")
+
+    assert second == {"screens": [{"name": "Home"}]}
+    assert first is not second
+
+
+@pytest.mark.asyncio
+async def test_evicts_by_entry_count_and_keeps_byte_total():
+    cache = ResponseCache(max_entries=2)
+    await cache.set("a", "1")
+    await cache.set("b", "22")
+    await cache.set("c", "333")
+
+    assert await cache.get("a") is None
+    assert await cache.get("c") == "333"
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    # JSON-encoded sizes of "22" and "333"
+    assert stats["bytes"] == len('"22"') + len('"333"')
+
+
+@pytest.mark.asyncio
+async def test_backend_hit_populates_memory(tmp_path):
+    backend = FileCacheBackend(str(tmp_path))
+    await ResponseCache(backend=backend).set("k", {"v": 1})
+
+    cache = ResponseCache(backend=backend)
+    assert await cache.get("k") == {"v": 1}
+    assert cache.backend_hits == 1
+    assert await cache.get("k") == {"v": 1}
+    assert cache.backend_hits == 1
@@ -0,0 +1,34 @@
+"""Tests for the per-session ProjectContext memo."""
+import pytest
+
+from app.ai.context import ProjectContext
+from app.models.stage import Stage
+from app.services.generation import save_stage_output
+
+
+@pytest.mark.asyncio
+async def test_context_is_memoized_per_session(session_maker, project):
+    async with session_maker() as db:
+        first = await ProjectContext.load(project.id, db)
+        assert await ProjectContext.load(project.id, db) is first
+
+    async with session_maker() as db:
+        assert await ProjectContext.load(project.id, db) is not first
+
+
+@pytest.mark.asyncio
+async def test_stage_writes_invalidate_the_memo(session_maker, project):
+    async with session_maker() as db:
+        stage = Stage(project_id=project.id, type="direction", status="generating", version=1)
+        db.add(stage)
+        await db.commit()
+
+        before = await ProjectContext.load(project.id, db)
+        assert before.stage("direction") is None
+
+        await save_stage_output(db, stage.id, project.id, "direction", 1, {"directions": []})
+        await db.commit()
+
+        after = await ProjectContext.load(project.id, db)
+        assert after is not before
+        assert after.stage("direction")["status"] == "completed"
@@ -0,0 +1,169 @@
+"""Tests for demo page storage and demo drafts."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+
+from app.api.v1.demo import PageUpdateRequest, checkpoint_page, save_demo_draft, update_demo_page
+from app.models.stage import Stage
+from app.services import generation
+from app.services.demo_pages import (
+    PageVersionConflictError,
+    complete_demo_draft,
+    get_demo_draft,
+    get_demo_stage,
+    get_page_row,
+    load_demo_document,
+    save_demo_document,
+    update_page,
+)
+
+
+def demo_document(name: str, status: str = "pending") -> dict:
+    return {
+        "project_name": name,
+        "platforms": [{
+            "type": "pc",
+            "pages": [
+                {"id": "home", "name": "Home", "status": status, "code": f"<{name} />"},
+                {"id": "about", "name": "About", "status": status, "code": f"<{name} />"},
+            ],
+        }],
+    }
+
+
+async def add_completed_demo(session_maker, project) -> Stage:
+    async with session_maker() as db:
+        stage = Stage(project_id=project.id, type="demo", status="completed", version=1)
+        db.add(stage)
+        await save_demo_document(db, stage, demo_document("old", status="completed"))
+        await db.commit()
+        return stage
+
+
+@pytest.mark.asyncio
+async def test_regenerated_demo_is_a_draft_until_completed(session_maker, project):
+    old = await add_completed_demo(session_maker, project)
+
+    async with session_maker() as db:
+        draft = await save_demo_draft(project.id, demo_document("new"), db)
+        assert draft.status == "generating"
+        assert draft.version == 2
+
+    # The previous demo stays the latest and keeps its pages
+    async with session_maker() as db:
+        latest = await get_demo_stage(db, project.id)
+        assert latest.id == old.id
+        document = await load_demo_document(db, latest)
+        assert document["project_name"] == "old"
+        assert {page["status"] for page in document["platforms"][0]["pages"]} == {"completed"}
+        assert (await get_demo_draft(db, project.id)).id == draft.id
+
+    async with session_maker() as db:
+        await complete_demo_draft(db, draft)
+        await db.commit()
+
+    async with session_maker() as db:
+        assert (await get_demo_stage(db, project.id)).id == draft.id
+        assert await get_demo_draft(db, project.id) is None
+
+
+@pytest.mark.asyncio
+async def test_new_draft_supersedes_unfinished_one(session_maker, project):
+    async with session_maker() as db:
+        first = await save_demo_draft(project.id, demo_document("first"), db)
+    async with session_maker() as db:
+        second = await save_demo_draft(project.id, demo_document("second"), db)
+
+    async with session_maker() as db:
+        assert (await db.get(Stage, first.id)).status == "failed"
+        assert (await get_demo_draft(db, project.id)).id == second.id
+        assert await get_demo_stage(db, project.id) is None
+
+
+@pytest.mark.asyncio
+async def test_stale_demo_draft_is_not_reaped(session_maker, project, monkeypatch):
+    async with session_maker() as db:
+        draft = await save_demo_draft(project.id, demo_document("new"), db)
+        db.add(Stage(project_id=project.id, type="prd", status="generating", version=1))
+        await db.commit()
+        await db.execute(
+            update(Stage)
+            .where(Stage.project_id == project.id)
+            .values(updated_at=datetime.now(timezone.utc) - timedelta(hours=1))
+        )
+        await db.commit()
+
+    monkeypatch.setattr(generation, "async_session_maker", session_maker)
+    assert await generation.fail_stale_generations(timedelta(minutes=3)) == 1
+
+    async with session_maker() as db:
+        assert (await get_demo_draft(db, project.id)).id == draft.id
+
+
+@pytest.mark.asyncio
+async def test_page_write_with_stale_version_conflicts(session_maker, project):
+    stage = await add_completed_demo(session_maker, project)
+
+    # Two requests read the page at the same version
+    async with session_maker() as first_db, session_maker() as second_db:
+        first = await get_page_row(first_db, stage.id, "home")
+        second = await get_page_row(second_db, stage.id, "home")
+        assert first.version == second.version
+
+        new_version = await update_page(first_db, first, code="<first />")
+        await first_db.commit()
+        assert new_version == first.version + 1
+
+        with pytest.raises(PageVersionConflictError):
+            await update_page(second_db, second, code="<second />")
+        await second_db.rollback()
+
+    async with session_maker() as db:
+        row = await get_page_row(db, stage.id, "home", include_code=True)
+        assert row.code == "<first />"
+        assert row.version == new_version
+
+
+@pytest.mark.asyncio
+async def test_update_route_rejects_stale_version(session_maker, project):
+    stage = await add_completed_demo(session_maker, project)
+    async with session_maker() as db:
+        version = (await get_page_row(db, stage.id, "home")).version
+
+    async with session_maker() as db:
+        saved = await update_demo_page(
+            project.id, "home", PageUpdateRequest(code="<a />", version=version),
+            project.owner_id, db,
+        )
+        assert saved["version"] == version + 1
+
+    async with session_maker() as db:
+        with pytest.raises(HTTPException) as conflict:
+            await update_demo_page(
+                project.id, "home", PageUpdateRequest(code="<b />", version=version),
+                project.owner_id, db,
+            )
+        assert conflict.value.status_code == 409
+
+    # Without a version the write applies to whatever is current (last write wins)
+    async with session_maker() as db:
+        saved = await update_demo_page(
+            project.id, "home", PageUpdateRequest(code="<c />"), project.owner_id, db,
+        )
+        assert saved["version"] == version + 2
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_reports_the_new_page_version(session_maker, project):
+    async with session_maker() as db:
+        draft = await save_demo_draft(project.id, demo_document("new"), db)
+    async with session_maker() as db:
+        version = (await get_page_row(db, draft.id, "home")).version
+
+    data = {"platform": "pc", "page_id": "home", "code": "<done />"}
+    async with session_maker() as db:
+        await checkpoint_page(db, draft.id, "page_complete", data)
+
+    assert data["version"] == version + 1
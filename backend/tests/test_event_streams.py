@@ -0,0 +1,192 @@
+"""Tests for replayable SSE event streams."""
+import asyncio
+import json
+
+import pytest
+
+from app.services.event_streams import EventStream, EventStreamRegistry
+
+
+def parse(payload: str) -> tuple[int | None, str, dict]:
+    """Split a formatted SSE event into (id, event type, data)."""
+    fields = dict(line.split(": ", 1) for line in payload.strip().splitlines())
+    event_id = int(fields["id"]) if "id" in fields else None
+    return event_id, fields["event"], json.loads(fields["data"])
+
+
+async def collect(events) -> list[tuple[int | None, str, dict]]:
+    return [parse(payload) async for payload in events]
+
+
+async def publish_all(stream: EventStream, count: int) -> None:
+    for n in range(1, count + 1):
+        await stream.publish("page_progress", {"n": n})
+
+
+@pytest.mark.asyncio
+async def test_replays_events_after_last_event_id():
+    stream = EventStream("demo:1", buffer_size=10, detach_grace=60)
+    await publish_all(stream, 3)
+    await stream.close()
+
+    events = await collect(stream.subscribe(last_event_id=1))
+
+    assert [(event_id, data["n"]) for event_id, _, data in events] == [(2, 2), (3, 3)]
+
+
+@pytest.mark.asyncio
+async def test_subscriber_follows_live_events_until_closed():
+    stream = EventStream("demo:1", buffer_size=10, detach_grace=60)
+    await stream.publish("init", {"n": 0})
+
+    received = asyncio.create_task(collect(stream.subscribe()))
+    await asyncio.sleep(0)
+    await publish_all(stream, 2)
+    await stream.close()
+
+    events = await asyncio.wait_for(received, 1)
+    assert [event_type for _, event_type, _ in events] == ["init", "page_progress", "page_progress"]
+    assert [event_id for event_id, _, _ in events] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_replay_gap_when_events_fell_out_of_the_buffer():
+    stream = EventStream("demo:1", buffer_size=2, detach_grace=60)
+    await publish_all(stream, 5)
+    await stream.close()
+
+    events = await collect(stream.subscribe(last_event_id=1))
+
+    gap_id, gap_type, gap = events[0]
+    assert gap_id is None
+    assert gap_type == "replay_gap"
+    assert gap == {"last_event_id": 1, "first_available_id": 4}
+    assert [event_id for event_id, _, _ in events[1:]] == [4, 5]
+
+
+@pytest.mark.asyncio
+async def test_no_replay_gap_when_client_is_up_to_date():
+    stream = EventStream("demo:1", buffer_size=2, detach_grace=60)
+    await publish_all(stream, 5)
+    await stream.close()
+
+    events = await collect(stream.subscribe(last_event_id=3))
+
+    assert [event_id for event_id, _, _ in events] == [4, 5]
+
+
+@pytest.mark.asyncio
+async def test_cancels_after_last_subscriber_leaves_for_the_grace_period():
+    stream = EventStream("demo:1", buffer_size=10, detach_grace=0.05)
+    await stream.publish("init", {})
+
+    events = stream.subscribe()
+    await events.__anext__()
+    await events.aclose()
+    assert not stream.cancel_event.is_set()
+
+    await asyncio.sleep(0.1)
+    assert stream.cancel_event.is_set()
+
+
+@pytest.mark.asyncio
+async def test_reattaching_within_the_grace_period_keeps_the_generation():
+    stream = EventStream("demo:1", buffer_size=10, detach_grace=0.1)
+    await stream.publish("init", {})
+
+    first = stream.subscribe()
+    await first.__anext__()
+    await first.aclose()
+
+    await asyncio.sleep(0.05)
+    second = stream.subscribe(last_event_id=1)
+    await stream.publish("page_progress", {"n": 1})
+    assert parse(await second.__anext__())[0] == 2
+
+    await asyncio.sleep(0.1)
+    assert not stream.cancel_event.is_set()
+    await second.aclose()
+    await stream.close()
+
+
+@pytest.mark.asyncio
+async def test_cancels_when_no_client_ever_attaches():
+    stream = EventStream("demo:1", buffer_size=10, detach_grace=0.05)
+
+    await asyncio.sleep(0.1)
+
+    assert stream.cancel_event.is_set()
+
+
+@pytest.mark.asyncio
+async def test_closed_stream_is_not_cancelled():
+    stream = EventStream("demo:1", buffer_size=10, detach_grace=0.05)
+    await stream.close()
+
+    await asyncio.sleep(0.1)
+
+    assert not stream.cancel_event.is_set()
+
+
+@pytest.mark.asyncio
+async def test_registry_attaches_to_a_running_generation():
+    registry = EventStreamRegistry(buffer_size=10, detach_grace=60, retention=60)
+    release = asyncio.Event()
+    runs = 0
+
+    async def producer(stream: EventStream) -> None:
+        nonlocal runs
+        runs += 1
+        await stream.publish("init", {})
+        await release.wait()
+        await stream.publish("complete", {})
+
+    first, started = registry.start("demo:1", producer)
+    second, started_again = registry.start("demo:1", producer)
+    assert started and not started_again
+    assert second is first
+
+    release.set()
+    await first.task
+    assert runs == 1
+    assert first.done
+
+    # A finished stream is replayed on reattach, then a new start runs again
+    events = await collect(await registry.open("demo:1", last_event_id=1))
+    assert [event_type for _, event_type, _ in events] == ["complete"]
+    third, started = registry.start("demo:1", producer)
+    assert started and third is not first
+    third.cancel_event.set()
+    third.task.cancel()
+    await asyncio.gather(third.task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_registry_forgets_finished_streams_after_retention():
+    registry = EventStreamRegistry(buffer_size=10, detach_grace=60, retention=0.05)
+
+    async def producer(stream: EventStream) -> None:
+        await stream.publish("complete", {})
+
+    stream, _ = registry.start("demo:1", producer)
+    await stream.task
+    assert registry.get("demo:1") is stream
+
+    await asyncio.sleep(0.1)
+    assert registry.get("demo:1") is None
+    assert await registry.open("demo:1") is None
+
+
+@pytest.mark.asyncio
+async def test_failing_producer_still_closes_the_stream():
+    registry = EventStreamRegistry(buffer_size=10, detach_grace=60, retention=60)
+
+    async def producer(stream: EventStream) -> None:
+        await stream.publish("init", {})
+        raise RuntimeError("boom")
+
+    stream, _ = registry.start("demo:1", producer)
+    await stream.task
+
+    assert stream.done
+    assert [event_type for _, event_type, _ in await collect(stream.subscribe())] == ["init"]
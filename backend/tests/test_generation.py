@@ -0,0 +1,150 @@
+"""Tests for phased stage generation and the latest-version pointer."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from app.ai.context import ProjectContext
+from app.models.stage import Stage
+from app.services import generation
+
+
+async def latest_stage(session_maker, project_id, stage_type) -> Stage | None:
+    async with session_maker() as db:
+        result = await db.execute(
+            select(Stage)
+            .where(Stage.project_id == project_id)
+            .where(Stage.type == stage_type)
+            .where(Stage.is_latest)
+        )
+        return result.scalars().first()
+
+
+class FailingAgent:
+    async def generate_from_context(self, context):
+        raise RuntimeError("model unavailable")
+
+
+@pytest.mark.asyncio
+async def test_generation_fails_and_previous_version_stays_visible(
+    session_maker, project, monkeypatch
+):
+    async with session_maker() as db:
+        db.add(Stage(
+            project_id=project.id,
+            type="direction",
+            status="completed",
+            version=1,
+            output_data={"directions": [{"id": 1}]},
+        ))
+        retry = Stage(project_id=project.id, type="direction", status="generating", version=2)
+        db.add(retry)
+        await db.commit()
+        retry_id = retry.id
+
+    # While v2 generates, v1 is still the latest version
+    assert (await latest_stage(session_maker, project.id, "direction")).version == 1
+
+    monkeypatch.setattr(generation, "async_session_maker", session_maker)
+    monkeypatch.setattr("app.ai.agents.get_agent", lambda stage_type: FailingAgent())
+    await generation.run_stage_generation(retry_id)
+
+    async with session_maker() as db:
+        failed = await db.get(Stage, retry_id)
+        assert failed.status == "failed"
+        assert "model unavailable" in failed.output_data["error"]
+
+        context = await ProjectContext.load(project.id, db)
+        assert context.stage("direction")["version"] == 1
+        assert context.stage("direction")["output_data"] == {"directions": [{"id": 1}]}
+
+        # The next attempt is numbered after the failed row
+        assert await generation.next_stage_version(db, project.id, "direction") == 3
+
+    assert (await latest_stage(session_maker, project.id, "direction")).version == 1
+
+
+@pytest.mark.asyncio
+async def test_completed_generation_becomes_latest(session_maker, project):
+    async with session_maker() as db:
+        db.add(Stage(project_id=project.id, type="idea", status="confirmed", version=1))
+        retry = Stage(project_id=project.id, type="idea", status="generating", version=2)
+        db.add(retry)
+        await db.commit()
+
+        await generation.save_stage_output(db, retry.id, project.id, "idea", 2, {"content": "v2"})
+        await db.commit()
+
+    latest = await latest_stage(session_maker, project.id, "idea")
+    assert latest.version == 2
+    assert latest.output_data == {"content": "v2"}
+
+
+@pytest.mark.asyncio
+async def test_older_generation_is_superseded(session_maker, project):
+    async with session_maker() as db:
+        older = Stage(project_id=project.id, type="prd", status="generating", version=1)
+        db.add(older)
+        db.add(Stage(project_id=project.id, type="prd", status="generating", version=2))
+        await db.commit()
+
+        with pytest.raises(generation.StageConflictError):
+            await generation.save_stage_output(db, older.id, project.id, "prd", 1, {})
+
+
+@pytest.mark.asyncio
+async def test_reaps_only_generations_without_heartbeat(session_maker, project, monkeypatch):
+    long_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+    async with session_maker() as db:
+        live = Stage(project_id=project.id, type="prd", status="generating", version=1)
+        abandoned = Stage(project_id=project.id, type="testcases", status="generating", version=1)
+        db.add_all([live, abandoned])
+        await db.flush()
+        live.updated_at = long_ago
+        abandoned.updated_at = long_ago
+        await db.commit()
+        live_id, abandoned_id = live.id, abandoned.id
+
+    monkeypatch.setattr(generation, "async_session_maker", session_maker)
+    await generation.heartbeat_generations({live_id})
+    assert await generation.fail_stale_generations(timedelta(minutes=5)) == 1
+
+    async with session_maker() as db:
+        assert (await db.get(Stage, live_id)).status == "generating"
+        assert (await db.get(Stage, abandoned_id)).status == "failed"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_completions_keep_one_latest_version(session_maker, project):
+    async with session_maker() as db:
+        db.add(Stage(project_id=project.id, type="features", status="completed", version=1))
+        second = Stage(project_id=project.id, type="features", status="generating", version=2)
+        third = Stage(project_id=project.id, type="features", status="generating", version=3)
+        db.add_all([second, third])
+        await db.commit()
+
+    async def complete(db, stage_id):
+        await db.execute(
+            update(Stage).where(Stage.id == stage_id).values(status="completed")
+        )
+
+    async with session_maker() as first_db, session_maker() as second_db:
+        await complete(first_db, second.id)
+        # Blocks on the project lock taken by the first transaction's trigger
+        pending = asyncio.create_task(complete(second_db, third.id))
+        await asyncio.sleep(0.2)
+        assert not pending.done()
+
+        await first_db.commit()
+        await pending
+        await second_db.commit()
+
+    async with session_maker() as db:
+        result = await db.execute(
+            select(Stage.version)
+            .where(Stage.project_id == project.id)
+            .where(Stage.type == "features")
+            .where(Stage.is_latest)
+        )
+        assert result.scalars().all() == [3]
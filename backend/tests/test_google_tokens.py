@@ -0,0 +1,121 @@
+"""Tests for Google ID token verification against a fixture JWKS."""
+import time
+from pathlib import Path
+
+import pytest
+from jose import jwt
+
+from app.core.google_tokens import GOOGLE_ISSUERS, GoogleIdTokenVerifier, GoogleTokenError
+
+FIXTURES = Path(__file__).parent / "fixtures"
+JWKS_PATH = FIXTURES / "google_jwks.json"
+SIGNING_KEY = (FIXTURES / "google_signing_key.pem").read_text()
+CLIENT_ID = "test-client.apps.googleusercontent.com"
+
+
+def make_token(kid: str = "test-key-1", **overrides) -> str:
+    now = int(time.time())
+    claims = {
+        "iss": GOOGLE_ISSUERS[1],
+        "aud": CLIENT_ID,
+        "sub": "1234567890",
+        "email": "user@example.com",
+        "iat": now,
+        "exp": now + 3600,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, SIGNING_KEY, algorithm="RS256", headers={"kid": kid})
+
+
+class CountingVerifier(GoogleIdTokenVerifier):
+    """Counts how often the key file is read."""
+
+    reads = 0
+
+    def _read_jwks_file(self):
+        self.reads += 1
+        return super()._read_jwks_file()
+
+
+@pytest.fixture
+def verifier() -> CountingVerifier:
+    return CountingVerifier(client_id=CLIENT_ID, jwks_path=str(JWKS_PATH))
+
+
+@pytest.mark.asyncio
+async def test_valid_token(verifier):
+    claims = await verifier.verify(make_token())
+    assert claims["sub"] == "1234567890"
+    assert claims["email"] == "user@example.com"
+
+
+@pytest.mark.asyncio
+async def test_wrong_audience(verifier):
+    with pytest.raises(GoogleTokenError):
+        await verifier.verify(make_token(aud="someone-else"))
+
+
+@pytest.mark.asyncio
+async def test_expired_token(verifier):
+    issued = int(time.time()) - 7200
+    with pytest.raises(GoogleTokenError):
+        await verifier.verify(make_token(iat=issued, exp=issued + 3600))
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_is_rejected_without_refetching(verifier):
+    await verifier.verify(make_token())
+    assert verifier.reads == 1
+
+    for _ in range(3):
+        with pytest.raises(GoogleTokenError, match="Unknown signing key"):
+            await verifier.verify(make_token(kid="rotated-key"))
+    # Keys were loaded moments ago, so unknown kids do not force a refetch
+    assert verifier.reads == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refetches_after_min_interval():
+    verifier = CountingVerifier(
+        client_id=CLIENT_ID,
+        jwks_path=str(JWKS_PATH),
+        min_refresh_interval=0,
+    )
+    await verifier.verify(make_token())
+
+    with pytest.raises(GoogleTokenError, match="Unknown signing key"):
+        await verifier.verify(make_token(kid="rotated-key"))
+    assert verifier.reads == 2
+
+
+class FlakyVerifier(CountingVerifier):
+    """Fails every key file read after the first one."""
+
+    def _read_jwks_file(self):
+        if self.reads:
+            self.reads += 1
+            raise OSError("certs unavailable")
+        return super()._read_jwks_file()
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_cached_keys_and_backs_off():
+    verifier = FlakyVerifier(client_id=CLIENT_ID, jwks_path=str(JWKS_PATH))
+    await verifier.verify(make_token())
+
+    # The keys expire and the refetch fails: stale keys are still served
+    verifier._expires_at = 0.0
+    claims = await verifier.verify(make_token())
+    assert claims["sub"] == "1234567890"
+    assert verifier.reads == 2
+
+    # The failure pushed the expiry out, so later logins do not retry the fetch
+    await verifier.verify(make_token())
+    assert verifier.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_first_fetch_is_raised():
+    verifier = GoogleIdTokenVerifier(client_id=CLIENT_ID, jwks_path=str(JWKS_PATH.with_name("missing.json")))
+    with pytest.raises(OSError):
+        await verifier.verify(make_token())
@@ -0,0 +1,52 @@
+"""Tests for the shared outbound HTTP client."""
+import json
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from app.core.google_tokens import GoogleIdTokenVerifier
+from app.core.http import close_http_client, get_http_client, start_http_client
+from tests.test_google_tokens import CLIENT_ID, JWKS_PATH, make_token
+
+JWKS_URL = "https://certs.example.test/oauth2/v3/certs"
+
+
+@pytest_asyncio.fixture
+async def certs_requests():
+    """Serve the fixture JWKS through the shared client; yields the requests seen."""
+    seen: list[httpx.Request] = []
+    jwks = json.loads(JWKS_PATH.read_text())
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if str(request.url) != JWKS_URL:
+            return httpx.Response(404)
+        return httpx.Response(200, json=jwks, headers={"Cache-Control": "public, max-age=600"})
+
+    await start_http_client(transport=httpx.MockTransport(handler))
+    yield seen
+    await close_http_client()
+
+
+@pytest.mark.asyncio
+async def test_jwks_fetched_once_through_shared_client(certs_requests):
+    verifier = GoogleIdTokenVerifier(client_id=CLIENT_ID, jwks_url=JWKS_URL)
+
+    first = await verifier.verify(make_token())
+    second = await verifier.verify(make_token())
+
+    assert first["sub"] == second["sub"] == "1234567890"
+    # Keys stay cached for the response's max-age
+    assert len(certs_requests) == 1
+    assert certs_requests[0].method == "GET"
+
+
+@pytest.mark.asyncio
+async def test_shared_client_is_reused(certs_requests):
+    client = get_http_client()
+    assert get_http_client() is client
+
+    response = await client.get(JWKS_URL)
+    assert response.status_code == 200
+    assert response.json()["keys"][0]["kid"] == "test-key-1"
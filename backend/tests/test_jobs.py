@@ -0,0 +1,109 @@
+"""Tests for the in-process generation job runner."""
+import asyncio
+import uuid
+
+import pytest
+
+from app.services.jobs import JobRunner
+
+
+async def settle() -> None:
+    """Let submitted tasks run up to their next await."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_runs_submitted_job():
+    runner = JobRunner(max_concurrency=2)
+    job_id = uuid.uuid4()
+    done = []
+
+    async def job():
+        done.append(job_id)
+
+    runner.submit(job_id, job)
+    assert runner.is_active(job_id)
+    await runner.wait()
+
+    assert done == [job_id]
+    assert not runner.is_active(job_id)
+
+
+@pytest.mark.asyncio
+async def test_limits_concurrency():
+    runner = JobRunner(max_concurrency=2)
+    release = asyncio.Event()
+    running = 0
+    peak = 0
+
+    async def job():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await release.wait()
+        running -= 1
+
+    for _ in range(5):
+        runner.submit(uuid.uuid4(), job)
+    await settle()
+
+    assert runner.stats() == {"max_concurrency": 2, "running": 2, "queued": 3}
+
+    release.set()
+    await runner.wait()
+    assert peak == 2
+    assert runner.stats()["running"] == 0
+    assert runner.stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_poll_reports_queued_until_finished_and_survives_failures():
+    runner = JobRunner(max_concurrency=1)
+    release = asyncio.Event()
+    blocking_id, failing_id = uuid.uuid4(), uuid.uuid4()
+
+    async def blocking():
+        await release.wait()
+
+    async def failing():
+        raise RuntimeError("boom")
+
+    runner.submit(blocking_id, blocking)
+    runner.submit(failing_id, failing)
+    # Submitting an active job again is a no-op
+    runner.submit(blocking_id, failing)
+    await settle()
+
+    assert runner.is_active(blocking_id)
+    assert runner.is_active(failing_id)
+
+    release.set()
+    await runner.wait()
+    assert not runner.is_active(blocking_id)
+    assert not runner.is_active(failing_id)
+
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_outstanding_jobs():
+    runner = JobRunner(max_concurrency=1)
+    cancelled = []
+
+    async def job():
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    running_id, queued_id = uuid.uuid4(), uuid.uuid4()
+    runner.submit(running_id, job)
+    runner.submit(queued_id, job)
+    await settle()
+
+    await runner.shutdown()
+
+    # Only the running job had started; the queued one never ran
+    assert cancelled == [True]
+    assert not runner.is_active(running_id)
+    assert not runner.is_active(queued_id)
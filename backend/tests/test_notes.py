@@ -0,0 +1,58 @@
+"""Tests for stage notes."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.api.v1.notes import list_notes
+from app.models.note import Note
+from app.models.stage import Stage
+
+NOW = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+
+
+async def list_all(session_maker, stage_id, user_id, limit: int) -> list:
+    """Follow next_cursor through every page."""
+    notes = []
+    cursor = None
+    while True:
+        async with session_maker() as db:
+            page = await list_notes(stage_id, user_id, db, limit=limit, cursor=cursor)
+        notes.extend(page.items)
+        assert len(page.items) <= limit
+        if not page.has_more:
+            assert page.next_cursor is None
+            return notes
+        cursor = page.next_cursor
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [1, 2, 4, 200])
+async def test_lists_notes_newest_first_across_pages(session_maker, project, limit):
+    async with session_maker() as db:
+        stage = Stage(project_id=project.id, type="idea", status="completed")
+        other_stage = Stage(project_id=project.id, type="direction", status="completed")
+        db.add_all([stage, other_stage])
+        await db.flush()
+
+        # Notes created in the same instant are ordered by id
+        notes = [
+            Note(
+                stage_id=stage.id,
+                user_id=project.owner_id,
+                content=f"note {n}",
+                created_at=NOW + timedelta(seconds=seconds),
+            )
+            for n, seconds in enumerate((0, 0, 0, 0, -5, 5, 10))
+        ]
+        db.add_all(notes)
+        db.add(Note(stage_id=other_stage.id, user_id=project.owner_id, content="elsewhere"))
+        await db.commit()
+
+    expected = [
+        note.id for note in sorted(notes, key=lambda note: (note.created_at, note.id), reverse=True)
+    ]
+
+    listed = await list_all(session_maker, stage.id, project.owner_id, limit)
+
+    assert [note.id for note in listed] == expected
+    assert {note.user_name for note in listed} == {"Owner"}
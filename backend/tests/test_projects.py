@@ -0,0 +1,85 @@
+"""Tests for the project list."""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.api.v1.projects import list_projects
+from app.models.collaborator import Collaborator
+from app.models.project import Project
+from app.models.user import User
+from app.schemas.user import UserClaims
+
+NOW = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+
+
+def make_user(name: str) -> User:
+    return User(google_id=f"google-{uuid.uuid4()}", email=f"{uuid.uuid4()}@example.com", name=name)
+
+
+async def list_all(session_maker, user_id, limit: int) -> list[uuid.UUID]:
+    """Follow next_cursor through every page."""
+    ids: list[uuid.UUID] = []
+    cursor = None
+    while True:
+        async with session_maker() as db:
+            page = await list_projects(UserClaims(id=user_id), db, limit=limit, cursor=cursor)
+        ids.extend(item.id for item in page.items)
+        assert len(page.items) <= limit
+        if not page.has_more:
+            assert page.next_cursor is None
+            return ids
+        cursor = page.next_cursor
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [1, 2, 3, 100])
+async def test_lists_owned_and_shared_projects_across_pages(session_maker, project, limit):
+    async with session_maker() as db:
+        other = make_user("Other")
+        db.add(other)
+        await db.flush()
+
+        def add(owner_id, minutes, status="active"):
+            row = Project(
+                owner_id=owner_id,
+                title=f"{minutes}",
+                status=status,
+                updated_at=NOW + timedelta(minutes=minutes),
+            )
+            db.add(row)
+            return row
+
+        # Several projects share an updated_at, in both branches of the list
+        owned = [add(project.owner_id, m) for m in (0, 0, 0, -60, 60)]
+        shared = [add(other.id, m) for m in (0, 0, -30, 90)]
+        deleted_owned = add(project.owner_id, 120, status="deleted")
+        deleted_shared = add(other.id, 150, status="deleted")
+        pending = add(other.id, 180)
+        not_shared = add(other.id, 30)
+        await db.flush()
+
+        for row in shared + [deleted_shared]:
+            db.add(Collaborator(project_id=row.id, user_id=project.owner_id, accepted_at=NOW))
+        db.add(Collaborator(project_id=pending.id, user_id=project.owner_id, accepted_at=None))
+        await db.commit()
+
+    visible = [project] + owned + shared
+    expected = [
+        row.id for row in sorted(visible, key=lambda row: (row.updated_at, row.id), reverse=True)
+    ]
+
+    ids = await list_all(session_maker, project.owner_id, limit)
+
+    assert ids == expected
+    assert not {deleted_owned.id, deleted_shared.id, pending.id, not_shared.id} & set(ids)
+
+
+@pytest.mark.asyncio
+async def test_project_list_of_user_without_projects_is_empty(session_maker, project):
+    async with session_maker() as db:
+        stranger = make_user("Stranger")
+        db.add(stranger)
+        await db.commit()
+
+    assert await list_all(session_maker, stranger.id, limit=10) == []
@@ -0,0 +1,69 @@
+"""Tests for the prototype screen image window."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.ai.agents import prototype_agent
+from app.ai.agents.prototype_agent import PrototypeAgent
+from app.ai.gemini_client import ImageGenerationTimeout
+from app.ai.rate_limit import ModelRateLimiter
+
+
+class FakeImageClient:
+    """Times out on screens named "slow", leaving their render thread running."""
+
+    def __init__(self):
+        self.started: list[str] = []
+        self.slow_render = asyncio.get_running_loop().create_future()
+
+    async def generate_image(self, prompt, aspect_ratio="9:16", use_cache=True, timeout=None):
+        name = "slow" if "slow" in prompt else "fast"
+        self.started.append(name)
+        if name == "slow":
+            raise ImageGenerationTimeout(timeout, self.slow_render)
+        return "aW1hZ2U="
+
+
+@pytest.mark.asyncio
+async def test_timed_out_screen_holds_its_window_slot(monkeypatch):
+    monkeypatch.setattr(
+        prototype_agent,
+        "get_settings",
+        lambda: SimpleNamespace(prototype_image_concurrency=1, prototype_image_timeout_seconds=5),
+    )
+    client = FakeImageClient()
+    screens = [{"name": "slow"}, {"name": "fast"}]
+
+    task = asyncio.create_task(
+        PrototypeAgent()._generate_screen_images(screens, "idea", "direction", client)
+    )
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    # The slow screen's thread still runs, so the next screen must wait
+    assert client.started == ["slow"]
+
+    client.slow_render.set_result(None)
+    slow, fast = await task
+
+    assert client.started == ["slow", "fast"]
+    assert slow["image_error"] == "Timed out after 5s"
+    assert fast["image_data"] == "aW1hZ2U="
+
+
+@pytest.mark.asyncio
+async def test_reserved_slot_is_released_once():
+    limiter = ModelRateLimiter("image", rpm=0, tpm=0, max_concurrency=1)
+    release = await limiter.reserve()
+    assert limiter.stats()["in_flight"] == 1
+
+    release()
+    release()
+    assert limiter.stats()["in_flight"] == 0
+
+    # Exactly one slot is free again
+    second = await limiter.reserve()
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(limiter.reserve(), timeout=0.05)
+    second()
@@ -0,0 +1,133 @@
+"""Tests for client-side Gemini rate limiting."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.ai import rate_limit
+from app.ai.rate_limit import ModelRateLimiter, TokenBucket, estimate_tokens
+
+
+class FakeClock:
+    """Monotonic time that only moves when the limiter sleeps."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+        self._real_sleep = asyncio.sleep
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
+        await self._real_sleep(0)
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(asyncio, "sleep", clock.sleep)
+    return clock
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 1
+    assert estimate_tokens("abcdef", None, "abc") == 3
+
+
+def test_token_bucket_refills_evenly(clock):
+    bucket = TokenBucket(per_minute=60)
+    assert bucket.wait_time(60) == 0
+
+    bucket.consume(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    assert bucket.wait_time(30) == pytest.approx(30.0)
+
+    clock.now += 15
+    assert bucket.wait_time(15) == 0
+    assert bucket.wait_time(16) == pytest.approx(1.0)
+
+
+def test_token_bucket_caps_oversized_requests(clock):
+    bucket = TokenBucket(per_minute=60)
+    bucket.consume(1000)
+
+    # Waits for a full bucket, not for more than the bucket can hold
+    assert bucket.tokens == 0
+    assert bucket.wait_time(1000) == pytest.approx(60.0)
+
+
+@pytest.mark.asyncio
+async def test_requests_over_rpm_wait_for_a_refill(clock):
+    limiter = ModelRateLimiter("pro", rpm=2, tpm=0, max_concurrency=0)
+
+    for _ in range(2):
+        async with limiter.acquire():
+            pass
+    assert clock.sleeps == []
+
+    async with limiter.acquire():
+        pass
+
+    assert sum(clock.sleeps) == pytest.approx(30.0)
+    stats = limiter.stats()
+    assert stats["calls"] == 3
+    assert stats["max_wait_ms"] == pytest.approx(30000.0)
+
+
+@pytest.mark.asyncio
+async def test_tokens_are_debited_from_the_tpm_budget(clock):
+    limiter = ModelRateLimiter("flash", rpm=0, tpm=600, max_concurrency=0)
+
+    async with limiter.acquire(tokens=600):
+        pass
+    assert clock.sleeps == []
+
+    # 100 tokens refill in 10 seconds at 600 per minute
+    async with limiter.acquire(tokens=100):
+        pass
+    assert sum(clock.sleeps) == pytest.approx(10.0)
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_served_in_arrival_order(clock):
+    limiter = ModelRateLimiter("pro", rpm=1, tpm=0, max_concurrency=0)
+    async with limiter.acquire():
+        pass
+
+    order: list[str] = []
+
+    async def call(name: str) -> None:
+        async with limiter.acquire():
+            order.append(name)
+
+    tasks = []
+    for name in ("first", "second", "third"):
+        tasks.append(asyncio.create_task(call(name)))
+        await clock._real_sleep(0)
+    await asyncio.gather(*tasks)
+
+    assert order == ["first", "second", "third"]
+    assert sum(clock.sleeps) == pytest.approx(180.0)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_holds_slots_until_release(clock):
+    limiter = ModelRateLimiter("image", rpm=0, tpm=0, max_concurrency=1)
+    release = await limiter.reserve()
+
+    waiter = asyncio.create_task(limiter.reserve())
+    await clock._real_sleep(0)
+    assert not waiter.done()
+    assert limiter.stats()["waiting"] == 1
+
+    release()
+    release()  # Releasing twice frees the slot only once
+    second_release = await asyncio.wait_for(waiter, 1)
+    assert limiter.stats()["in_flight"] == 1
+
+    second_release()
+    assert limiter.stats()["in_flight"] == 0
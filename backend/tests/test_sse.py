@@ -0,0 +1,78 @@
+"""Tests for the SSE helpers."""
+import asyncio
+import json
+
+import pytest
+
+from app.core.sse import coalesce_chunks, encode_json, sse_event
+
+
+async def stream(*items):
+    """Yield strings; a float item pauses the stream for that many seconds."""
+    for item in items:
+        if isinstance(item, float):
+            await asyncio.sleep(item)
+        else:
+            yield item
+
+
+async def collect(chunks) -> list[str]:
+    return [chunk async for chunk in chunks]
+
+
+def test_encode_json_is_compact_and_keeps_unicode():
+    assert encode_json({"name": "首页", "ids": [1, 2]}) == '{"name":"首页","ids":[1,2]}'
+
+
+def test_sse_event_format():
+    assert sse_event("page_progress", {"chunk": "a"}, event_id=7) == (
+        'id: 7\nevent: page_progress\ndata: {"chunk":"a"}\n\n'
+    )
+    assert sse_event("replay_gap", {}) == "event: replay_gap\ndata: {}\n\n"
+
+
+@pytest.mark.asyncio
+async def test_coalesce_flushes_by_size():
+    chunks = await collect(coalesce_chunks(
+        stream("abcd", "efgh", "ijkl", "mnop", "qrst"), max_bytes=10, max_delay=10
+    ))
+
+    assert chunks == ["abcdefghijkl", "mnopqrst"]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_counts_utf8_bytes():
+    # Each character is 3 bytes in UTF-8, so two chunks reach 12 bytes
+    chunks = await collect(coalesce_chunks(
+        stream("首页", "设置", "我的"), max_bytes=12, max_delay=10
+    ))
+
+    assert chunks == ["首页设置", "我的"]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_flushes_after_max_delay():
+    chunks = await collect(coalesce_chunks(
+        stream("a", 0.01, "b", 0.3, "c"), max_bytes=1024, max_delay=0.1
+    ))
+
+    # "a" and "b" arrive within the window; the window ends while waiting for "c"
+    assert chunks == ["ab", "c"]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_passes_chunks_through_without_delay():
+    chunks = await collect(coalesce_chunks(stream("a", "b", "c"), max_bytes=1024, max_delay=0))
+
+    assert chunks == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_keeps_all_text():
+    parts = [json.dumps({"n": n}) for n in range(50)]
+
+    chunks = await collect(coalesce_chunks(stream(*parts), max_bytes=64, max_delay=10))
+
+    assert "".join(chunks) == "".join(parts)
+    # Every flush but the last one waited until max_bytes was reached
+    assert all(len(chunk.encode()) >= 64 for chunk in chunks[:-1])
@@ -0,0 +1,41 @@
+"""Tests for the stage read routes."""
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.stages import get_stage_payload
+from app.models.stage import Stage
+from app.models.user import User
+
+
+@pytest.mark.asyncio
+async def test_stage_payload_hides_stages_of_other_projects(session_maker, project):
+    async with session_maker() as db:
+        stage = Stage(
+            project_id=project.id,
+            type="idea",
+            status="completed",
+            input_data={"content": "secret idea"},
+        )
+        outsider = User(
+            google_id=f"google-{uuid.uuid4()}",
+            email=f"{uuid.uuid4()}@example.com",
+            name="Outsider",
+        )
+        db.add_all([stage, outsider])
+        await db.commit()
+
+    async with session_maker() as db:
+        read = await get_stage_payload(stage.id, project.owner_id, db, fields=None)
+        assert read.input_data == {"content": "secret idea"}
+
+    # An existing stage and a missing one look the same to an outsider
+    async with session_maker() as db:
+        with pytest.raises(HTTPException) as existing:
+            await get_stage_payload(stage.id, outsider.id, db, fields=None)
+        with pytest.raises(HTTPException) as missing:
+            await get_stage_payload(uuid.uuid4(), outsider.id, db, fields=None)
+
+    assert existing.value.status_code == missing.value.status_code == 404
+    assert existing.value.detail == missing.value.detail
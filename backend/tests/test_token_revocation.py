@@ -0,0 +1,69 @@
+"""Tests for single-session and all-session token revocation."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core import token_versions
+from app.core.security import create_user_access_token, decode_access_token
+
+
+@pytest.fixture
+def revocation_db(session_maker, monkeypatch):
+    monkeypatch.setattr(token_versions, "async_session_maker", session_maker)
+    monkeypatch.setattr(token_versions, "_revoked", {})
+    monkeypatch.setattr(token_versions, "_versions", {})
+    return session_maker
+
+
+def issue(user_id, version: int = 0) -> dict:
+    token = create_user_access_token(user_id, "user@example.com", "User", None, version)
+    return decode_access_token(token)
+
+
+def test_tokens_have_unique_ids():
+    first, second = issue("00000000-0000-0000-0000-000000000001"), issue(
+        "00000000-0000-0000-0000-000000000001"
+    )
+    assert first["jti"] != second["jti"]
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_only_that_session(revocation_db, project):
+    user_id = project.owner_id
+    phone, laptop = issue(user_id), issue(user_id)
+
+    async with revocation_db() as db:
+        expires_at = datetime.fromtimestamp(phone["exp"], timezone.utc)
+        await token_versions.revoke_token(user_id, phone["jti"], expires_at, db)
+
+    assert await token_versions.is_token_revoked(phone["jti"])
+    assert not await token_versions.is_token_revoked(laptop["jti"])
+
+    # Another process, with nothing cached, sees the same state
+    token_versions._revoked.clear()
+    assert await token_versions.is_token_revoked(phone["jti"])
+    assert not await token_versions.is_token_revoked(laptop["jti"])
+
+
+@pytest.mark.asyncio
+async def test_revoking_prunes_expired_rows(revocation_db, project):
+    user_id = project.owner_id
+    async with revocation_db() as db:
+        past = datetime.now(timezone.utc) - timedelta(minutes=1)
+        await token_versions.revoke_token(user_id, "expired-jti", past, db)
+        future = datetime.now(timezone.utc) + timedelta(days=1)
+        await token_versions.revoke_token(user_id, "current-jti", future, db)
+
+    token_versions._revoked.clear()
+    assert not await token_versions.is_token_revoked("expired-jti")
+    assert await token_versions.is_token_revoked("current-jti")
+
+
+@pytest.mark.asyncio
+async def test_logout_all_bumps_token_version(revocation_db, project):
+    user_id = project.owner_id
+    async with revocation_db() as db:
+        version = await token_versions.revoke_tokens(user_id, db)
+
+    assert version == 1
+    assert await token_versions.get_token_version(user_id) == 1
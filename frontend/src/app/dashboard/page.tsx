@@ -12,7 +12,8 @@ import { Plus, FolderOpen, Clock, ChevronRight } from 'lucide-react';
 export default function DashboardPage() {
   const router = useRouter();
   const { isAuthenticated, isLoading: authLoading } = useAuthStore();
-  const { projects, fetchProjects, isLoading } = useProjectStore();
+  const { projects, fetchProjects, fetchMoreProjects, hasMore, isLoading, isLoadingMore } =
+    useProjectStore();
 
   useEffect(() => {
     if (!authLoading && !isAuthenticated) {
@@ -100,6 +101,15 @@ export default function DashboardPage() {
                 </div>
               </Link>
             ))}
+            {hasMore && (
+              <button
+                onClick={fetchMoreProjects}
+                disabled={isLoadingMore}
+                className="py-3 text-sm text-gray-600 hover:text-primary-600 disabled:opacity-50 transition-colors"
+              >
+                {isLoadingMore ? '加载中...' : '加载更多'}
+              </button>
+            )}
           </div>
         )}
       </main>
@@ -90,7 +90,7 @@ export function useDemoGeneration(projectId: string) {
                   break;
 
                 case 'page_complete':
-                  store.completePageGeneration(data.page_id, data.code);
+                  store.completePageGeneration(data.page_id, data.code, data.version);
                   break;
 
                 case 'page_error':
@@ -169,6 +169,8 @@ export function useDemoModify(projectId: string) {
         body: JSON.stringify({
           page_id: pageId,
           instruction,
+          // Rejected with 409 if the page was changed since it was loaded
+          version: store.getPageById(pageId)?.version,
         }),
       });
 
@@ -208,7 +210,7 @@ export function useDemoModify(projectId: string) {
                   store.appendPageCode(pageId, data.chunk);
                   break;
                 case 'modify_complete':
-                  store.completePageGeneration(pageId, data.code);
+                  store.completePageGeneration(pageId, data.code, data.version);
                   break;
                 case 'error':
                   store.setError(data.message);
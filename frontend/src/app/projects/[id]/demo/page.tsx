@@ -16,10 +16,14 @@ import {
   ArrowRight,
   Loader2,
   RefreshCw,
+  RotateCw,
   CheckCircle,
 } from 'lucide-react';
 import { getApiBaseUrl, demoApi } from '@/lib/api';
 
+// Shown when a page write is rejected because the page changed meanwhile (409)
+const PAGE_CONFLICT_MESSAGE = '页面已被其他人修改，请刷新后重试';
+
 interface GenerationStatus {
   isGenerating: boolean;
   currentPage: string | null;
@@ -50,9 +54,12 @@ export default function DemoPage() {
     setPaused,
     skipPage: skipPageInStore,
     getFailedPages,
+    getPageById,
   } = useDemoStore();
 
   const [isInitialLoading, setIsInitialLoading] = useState(true);
+  // An interrupted generation left an unfinished draft that can be resumed
+  const [hasDraft, setHasDraft] = useState(false);
   const [status, setStatus] = useState<GenerationStatus>({
     isGenerating: false,
     currentPage: null,
@@ -66,10 +73,15 @@ export default function DemoPage() {
   const canGenerate = featuresStage?.status === 'confirmed';
   const hasExistingDemo = stage?.output_data?.platforms || stage?.output_data?.files;
 
-  // Initial load - fetch stages
+  // Initial load - fetch stages and whether a draft is waiting to be resumed
   useEffect(() => {
     setIsInitialLoading(true);
-    fetchStages(projectId).finally(() => {
+    Promise.all([
+      fetchStages(projectId),
+      demoApi.getStatus(projectId)
+        .then((stats) => setHasDraft(stats.draft))
+        .catch(() => setHasDraft(false)),
+    ]).finally(() => {
       setIsInitialLoading(false);
     });
 
@@ -93,8 +105,8 @@ export default function DemoPage() {
     }
   }, [stages, isInitialLoading, platforms.length, setDemoProject]);
 
-  // SSE streaming generation
-  const startGeneration = useCallback(async () => {
+  // SSE streaming generation; resume continues the unfinished draft instead
+  const startGeneration = useCallback(async (resume = false) => {
     if (abortControllerRef.current) {
       abortControllerRef.current.abort();
     }
@@ -111,7 +123,7 @@ export default function DemoPage() {
 
     const token = localStorage.getItem('token');
     const apiUrl = getApiBaseUrl();
-    const url = `${apiUrl}/api/v1/projects/${projectId}/demo/generate/stream`;
+    const url = `${apiUrl}/api/v1/projects/${projectId}/demo/${resume ? 'resume' : 'generate'}/stream`;
 
     try {
       const response = await fetch(url, {
@@ -160,14 +172,14 @@ export default function DemoPage() {
                     ...s,
                     totalPages: data.total_pages,
                   }));
-                  // Set platforms with pending status
+                  // Set platforms; a resumed draft carries its finished pages
                   if (data.platforms) {
                     const platformsWithStatus = data.platforms.map((p: any) => ({
                       ...p,
                       pages: p.pages?.map((page: any) => ({
                         ...page,
-                        status: 'pending',
-                        code: '',
+                        status: page.status || 'pending',
+                        code: page.code || '',
                       })) || [],
                     }));
                     setPlatforms(platformsWithStatus);
@@ -194,7 +206,7 @@ export default function DemoPage() {
                   break;
 
                 case 'page_complete':
-                  completePageGeneration(data.page_id, data.code);
+                  completePageGeneration(data.page_id, data.code, data.version);
                   setStatus(s => ({
                     ...s,
                     completedPages: s.completedPages + 1,
@@ -211,6 +223,7 @@ export default function DemoPage() {
                     ...s,
                     isGenerating: false,
                   }));
+                  setHasDraft(false);
                   // Don't call fetchStages here - SSE already set the correct data
                   // fetchStages would reload from backend and potentially cause format issues
                   break;
@@ -245,7 +258,7 @@ export default function DemoPage() {
     }
   }, [projectId, reset, setPlatforms, setCurrentPlatform, setCurrentPageId, setPageStatus, appendPageCode, completePageGeneration, fetchStages]);
 
-  // Auto-generate if no existing demo
+  // Auto-generate (or resume the draft) if no existing demo
   useEffect(() => {
     if (
       !isInitialLoading &&
@@ -254,9 +267,9 @@ export default function DemoPage() {
       !status.isGenerating &&
       platforms.length === 0
     ) {
-      startGeneration();
+      startGeneration(hasDraft);
     }
-  }, [isInitialLoading, canGenerate, hasExistingDemo, status.isGenerating, platforms.length, startGeneration]);
+  }, [isInitialLoading, canGenerate, hasExistingDemo, hasDraft, status.isGenerating, platforms.length, startGeneration]);
 
   const handleConfirm = async () => {
     try {
@@ -272,12 +285,18 @@ export default function DemoPage() {
     await startGeneration();
   };
 
+  const handleResumeDraft = async () => {
+    await startGeneration(true);
+  };
+
   // Retry a single failed page
   const handleRetryPage = useCallback(async (pageId: string) => {
     const token = localStorage.getItem('token');
     const apiUrl = getApiBaseUrl();
     const url = `${apiUrl}/api/v1/projects/${projectId}/demo/pages/${pageId}/regenerate`;
 
+    // Rejected with 409 if the page was changed since it was loaded
+    const version = getPageById(pageId)?.version;
     setPageStatus(pageId, 'generating');
 
     try {
@@ -285,10 +304,18 @@ export default function DemoPage() {
         method: 'POST',
         headers: {
           'Authorization': `Bearer ${token}`,
+          'Content-Type': 'application/json',
           'Accept': 'text/event-stream',
         },
+        body: JSON.stringify({ version }),
       });
 
+      if (response.status === 409) {
+        // Someone else changed the page since it was loaded
+        setPageStatus(pageId, 'error');
+        setStatus(s => ({ ...s, error: PAGE_CONFLICT_MESSAGE }));
+        return;
+      }
       if (!response.ok) {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
@@ -325,7 +352,7 @@ export default function DemoPage() {
                   appendPageCode(data.page_id, data.chunk);
                   break;
                 case 'page_complete':
-                  completePageGeneration(data.page_id, data.code);
+                  completePageGeneration(data.page_id, data.code, data.version);
                   break;
                 case 'error':
                   setPageStatus(pageId, 'error');
@@ -341,17 +368,20 @@ export default function DemoPage() {
       console.error('Retry error:', error);
       setPageStatus(pageId, 'error');
     }
-  }, [projectId, setPageStatus, appendPageCode, completePageGeneration]);
+  }, [projectId, getPageById, setPageStatus, appendPageCode, completePageGeneration]);
 
   // Skip a page
   const handleSkipPage = useCallback(async (pageId: string) => {
     try {
-      await demoApi.skipPage(projectId, pageId);
-      skipPageInStore(pageId);
-    } catch (error) {
+      const result = await demoApi.skipPage(projectId, pageId, undefined, getPageById(pageId)?.version);
+      skipPageInStore(pageId, undefined, result.version);
+    } catch (error: any) {
       console.error('Skip error:', error);
+      if (error.response?.status === 409) {
+        setStatus(s => ({ ...s, error: PAGE_CONFLICT_MESSAGE }));
+      }
     }
-  }, [projectId, skipPageInStore]);
+  }, [projectId, getPageById, skipPageInStore]);
 
   // Retry all failed pages
   const handleRetryAllFailed = useCallback(async () => {
@@ -414,6 +444,16 @@ export default function DemoPage() {
         </div>
 
         <div className="flex items-center gap-3">
+          {hasDraft && !status.isGenerating && (
+            <button
+              onClick={handleResumeDraft}
+              className="flex items-center gap-2 px-4 py-2 text-sm text-primary-600 hover:text-primary-700 hover:bg-primary-50 rounded-lg"
+            >
+              <RotateCw className="w-4 h-4" />
+              继续生成
+            </button>
+          )}
+
           {stage?.status !== 'confirmed' && (
             <button
               onClick={handleRegenerate}
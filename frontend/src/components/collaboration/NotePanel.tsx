@@ -15,6 +15,8 @@ interface NotePanelProps {
 export function NotePanel({ stageId }: NotePanelProps) {
   const { user } = useAuthStore();
   const [notes, setNotes] = useState<Note[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [newNote, setNewNote] = useState('');
   const [isLoading, setIsLoading] = useState(true);
   const [isSubmitting, setIsSubmitting] = useState(false);
@@ -26,8 +28,9 @@ export function NotePanel({ stageId }: NotePanelProps) {
   const fetchNotes = async () => {
     setIsLoading(true);
     try {
-      const data = await notesApi.list(stageId);
-      setNotes(data);
+      const page = await notesApi.list(stageId);
+      setNotes(page.items);
+      setNextCursor(page.next_cursor);
     } catch (error) {
       console.error('Failed to fetch notes:', error);
     } finally {
@@ -35,6 +38,23 @@ export function NotePanel({ stageId }: NotePanelProps) {
     }
   };
 
+  const fetchMoreNotes = async () => {
+    if (!nextCursor || isLoadingMore) return;
+    setIsLoadingMore(true);
+    try {
+      const page = await notesApi.list(stageId, nextCursor);
+      setNotes((current) => [
+        ...current,
+        ...page.items.filter((n) => !current.some((existing) => existing.id === n.id)),
+      ]);
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      console.error('Failed to fetch notes:', error);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
     if (!newNote.trim()) return;
@@ -69,7 +89,10 @@ export function NotePanel({ stageId }: NotePanelProps) {
       <div className="flex items-center gap-2 mb-4">
         <MessageSquare className="w-5 h-5 text-gray-500" />
         <h3 className="font-medium text-gray-900">备注</h3>
-        <span className="text-sm text-gray-500">({notes.length})</span>
+        <span className="text-sm text-gray-500">
+          ({notes.length}
+          {nextCursor ? '+' : ''})
+        </span>
       </div>
 
       {/* Add note form */}
@@ -139,6 +162,15 @@ export function NotePanel({ stageId }: NotePanelProps) {
               )}
             </div>
           ))}
+          {nextCursor && (
+            <button
+              onClick={fetchMoreNotes}
+              disabled={isLoadingMore}
+              className="w-full py-2 text-sm text-gray-500 hover:text-primary-600 disabled:opacity-50 transition-colors"
+            >
+              {isLoadingMore ? '加载中...' : '加载更多'}
+            </button>
+          )}
         </div>
       )}
     </div>
@@ -1,7 +1,9 @@
 'use client';
 
+import { useEffect, useState } from 'react';
 import Link from 'next/link';
 import { usePathname } from 'next/navigation';
+import { notesApi } from '@/lib/api';
 import { cn, getStageLabel } from '@/lib/utils';
 import type { StageType, StageInfo } from '@/types';
 import {
@@ -15,6 +17,7 @@ import {
   Check,
   Circle,
   Loader2,
+  MessageSquare,
 } from 'lucide-react';
 
 const STAGE_ICONS: Record<StageType, React.ComponentType<{ className?: string }>> = {
@@ -45,6 +48,14 @@ interface SidebarProps {
 
 export function Sidebar({ projectId, stages, currentStage }: SidebarProps) {
   const pathname = usePathname();
+  const [noteCounts, setNoteCounts] = useState<Record<string, number>>({});
+
+  useEffect(() => {
+    notesApi
+      .counts(projectId)
+      .then(setNoteCounts)
+      .catch((error) => console.error('Failed to fetch note counts:', error));
+  }, [projectId]);
 
   const getStageStatus = (stageType: StageType): StageInfo | undefined => {
     return stages.find((s) => s.type === stageType);
@@ -115,6 +126,12 @@ export function Sidebar({ projectId, stages, currentStage }: SidebarProps) {
                     )}
                   </div>
                   <span>{getStageLabel(stageType)}</span>
+                  {stageInfo && noteCounts[stageInfo.id] > 0 && (
+                    <span className="ml-auto flex items-center gap-1 text-xs text-gray-400">
+                      <MessageSquare className="w-3 h-3" />
+                      {noteCounts[stageInfo.id]}
+                    </span>
+                  )}
                 </Link>
               </li>
             );
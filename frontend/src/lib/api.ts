@@ -2,10 +2,14 @@ import axios from 'axios';
 import type {
   User,
   Project,
+  ProjectPage,
   ProjectWithStages,
   Stage,
+  StagePayloadField,
+  GenerationJob,
   Collaborator,
   Note,
+  NotePage,
   AuthResponse,
   PlatformSelection,
   DemoProject,
@@ -64,8 +68,8 @@ export const authApi = {
 
 // Projects API
 export const projectsApi = {
-  list: async (): Promise<Project[]> => {
-    const { data } = await api.get('/projects');
+  list: async (cursor?: string, limit?: number): Promise<ProjectPage> => {
+    const { data } = await api.get('/projects', { params: { cursor, limit } });
     return data;
   },
 
@@ -91,8 +95,20 @@ export const projectsApi = {
 
 // Stages API
 export const stagesApi = {
-  list: async (projectId: string): Promise<Stage[]> => {
-    const { data } = await api.get(`/projects/${projectId}/stages`);
+  list: async (
+    projectId: string,
+    options?: { fields?: StagePayloadField[]; latestOnly?: boolean }
+  ): Promise<Stage[]> => {
+    const params: Record<string, string | boolean> = {};
+    if (options?.fields) params.fields = options.fields.join(',');
+    if (options?.latestOnly) params.latest_only = true;
+    const { data } = await api.get(`/projects/${projectId}/stages`, { params });
+    return data;
+  },
+
+  getById: async (stageId: string, fields?: StagePayloadField[]): Promise<Stage> => {
+    const params = fields ? { fields: fields.join(',') } : undefined;
+    const { data } = await api.get(`/stages/${stageId}`, { params });
     return data;
   },
 
@@ -101,11 +117,17 @@ export const stagesApi = {
     return data;
   },
 
+  // Starts a background generation; returns the stage row in status "generating"
   generate: async (projectId: string, stageType: string): Promise<Stage> => {
     const { data } = await api.post(`/projects/${projectId}/stages/${stageType}/generate`);
     return data;
   },
 
+  getJob: async (projectId: string, jobId: string): Promise<GenerationJob> => {
+    const { data } = await api.get(`/projects/${projectId}/jobs/${jobId}`);
+    return data;
+  },
+
   select: async (projectId: string, stageType: string, selectedId: number): Promise<Stage> => {
     const { data } = await api.put(`/projects/${projectId}/stages/${stageType}/select`, {
       selected_id: selectedId,
@@ -158,8 +180,14 @@ export const collaboratorsApi = {
 
 // Notes API
 export const notesApi = {
-  list: async (stageId: string): Promise<Note[]> => {
-    const { data } = await api.get(`/stages/${stageId}/notes`);
+  list: async (stageId: string, cursor?: string, limit?: number): Promise<NotePage> => {
+    const { data } = await api.get(`/stages/${stageId}/notes`, { params: { cursor, limit } });
+    return data;
+  },
+
+  // Note count per stage ID for a whole project (stages without notes are omitted)
+  counts: async (projectId: string): Promise<Record<string, number>> => {
+    const { data } = await api.get(`/projects/${projectId}/notes/counts`);
     return data;
   },
 
@@ -205,13 +233,24 @@ export const demoApi = {
     return `${API_URL}/api/v1/projects/${projectId}/demo/modify?token=${token}`;
   },
 
-  skipPage: async (projectId: string, pageId: string, reason?: string): Promise<{ status: string; page_id: string }> => {
-    const { data } = await api.post(`/projects/${projectId}/demo/pages/${pageId}/skip`, { reason });
+  // `version` is the page version last seen; the API answers 409 if the page changed since
+  skipPage: async (
+    projectId: string,
+    pageId: string,
+    reason?: string,
+    version?: number
+  ): Promise<{ status: string; page_id: string; version: number }> => {
+    const { data } = await api.post(`/projects/${projectId}/demo/pages/${pageId}/skip`, { reason, version });
     return data;
   },
 
-  updatePage: async (projectId: string, pageId: string, code: string): Promise<{ status: string; page_id: string; code: string }> => {
-    const { data } = await api.put(`/projects/${projectId}/demo/pages/${pageId}`, { code });
+  updatePage: async (
+    projectId: string,
+    pageId: string,
+    code: string,
+    version?: number
+  ): Promise<{ status: string; page_id: string; code: string; version: number }> => {
+    const { data } = await api.put(`/projects/${projectId}/demo/pages/${pageId}`, { code, version });
     return data;
   },
 
@@ -222,6 +261,7 @@ export const demoApi = {
     skipped: number;
     pending: number;
     generating: number;
+    draft: boolean;  // Counts are for an unfinished draft that can be resumed
   }> => {
     const { data } = await api.get(`/projects/${projectId}/demo/status`);
     return data;
@@ -53,6 +53,7 @@ function convertNewFormatToStoreFormat(data: NewFormatProject): DemoProject {
       order: page.order ?? index,
       status: page.code ? 'completed' as const : 'pending' as const,
       transitions: page.transitions || [],
+      version: page.version,
     }));
 
     return {
@@ -182,10 +183,10 @@ interface DemoState {
   setPaused: (paused: boolean) => void;
   setGenerationProgress: (progress: Partial<DemoGenerationProgress>) => void;
   appendPageCode: (pageId: string, chunk: string) => void;
-  completePageGeneration: (pageId: string, code: string) => void;
+  completePageGeneration: (pageId: string, code: string, version?: number) => void;
   setPageStatus: (pageId: string, status: DemoPage['status']) => void;
   setPageError: (pageId: string, error: string) => void;
-  skipPage: (pageId: string, reason?: string) => void;
+  skipPage: (pageId: string, reason?: string, version?: number) => void;
   updatePageCode: (pageId: string, code: string) => void;
   getFailedPages: () => DemoPage[];
   getStatusStats: () => { total: number; completed: number; error: number; skipped: number; pending: number; generating: number };
@@ -351,7 +352,7 @@ export const useDemoStore = create<DemoState>((set, get) => ({
     });
   },
 
-  completePageGeneration: (pageId, code) => {
+  completePageGeneration: (pageId, code, version) => {
     const { platforms, generationProgress, generatingPageCode } = get();
 
     // Update page in platforms
@@ -359,7 +360,7 @@ export const useDemoStore = create<DemoState>((set, get) => ({
       ...platform,
       pages: platform.pages.map((page) =>
         page.id === pageId
-          ? { ...page, code, status: 'completed' as const }
+          ? { ...page, code, status: 'completed' as const, version: version ?? page.version }
           : page
       ),
     }));
@@ -406,14 +407,14 @@ export const useDemoStore = create<DemoState>((set, get) => ({
     set({ platforms: updatedPlatforms });
   },
 
-  skipPage: (pageId, reason) => {
+  skipPage: (pageId, reason, version) => {
     const { platforms } = get();
 
     const updatedPlatforms = platforms.map((platform) => ({
       ...platform,
       pages: platform.pages.map((page) =>
         page.id === pageId
-          ? { ...page, status: 'skipped' as const, skip_reason: reason }
+          ? { ...page, status: 'skipped' as const, skip_reason: reason, version: version ?? page.version }
           : page
       ),
     }));
@@ -4,11 +4,15 @@ import { projectsApi } from '@/lib/api';
 
 interface ProjectState {
   projects: Project[];
+  nextCursor: string | null;
+  hasMore: boolean;
   currentProject: ProjectWithStages | null;
   isLoading: boolean;
+  isLoadingMore: boolean;
   error: string | null;
 
   fetchProjects: () => Promise<void>;
+  fetchMoreProjects: () => Promise<void>;
   fetchProject: (id: string) => Promise<void>;
   createProject: (title: string, idea: string, description?: string) => Promise<ProjectWithStages>;
   updateProject: (id: string, updates: Partial<Project>) => Promise<void>;
@@ -18,20 +22,48 @@ interface ProjectState {
 
 export const useProjectStore = create<ProjectState>((set, get) => ({
   projects: [],
+  nextCursor: null,
+  hasMore: false,
   currentProject: null,
   isLoading: false,
+  isLoadingMore: false,
   error: null,
 
   fetchProjects: async () => {
     set({ isLoading: true, error: null });
     try {
-      const projects = await projectsApi.list();
-      set({ projects, isLoading: false });
+      const page = await projectsApi.list();
+      set({
+        projects: page.items,
+        nextCursor: page.next_cursor,
+        hasMore: page.has_more,
+        isLoading: false,
+      });
     } catch (error: any) {
       set({ error: error.message, isLoading: false });
     }
   },
 
+  fetchMoreProjects: async () => {
+    const { nextCursor, isLoadingMore } = get();
+    if (!nextCursor || isLoadingMore) return;
+    set({ isLoadingMore: true, error: null });
+    try {
+      const page = await projectsApi.list(nextCursor);
+      set((state) => ({
+        projects: [
+          ...state.projects,
+          ...page.items.filter((p) => !state.projects.some((existing) => existing.id === p.id)),
+        ],
+        nextCursor: page.next_cursor,
+        hasMore: page.has_more,
+        isLoadingMore: false,
+      }));
+    } catch (error: any) {
+      set({ error: error.message, isLoadingMore: false });
+    }
+  },
+
   fetchProject: async (id) => {
     set({ isLoading: true, error: null });
     try {
@@ -2,6 +2,22 @@ import { create } from 'zustand';
 import type { Stage, StageType, PlatformSelection } from '@/types';
 import { stagesApi } from '@/lib/api';
 
+const JOB_POLL_INTERVAL_MS = 2000;
+
+// Poll a background generation until it completes or fails
+async function waitForGeneration(projectId: string, jobId: string): Promise<void> {
+  for (;;) {
+    const job = await stagesApi.getJob(projectId, jobId);
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'AI generation failed');
+    }
+    if (job.status !== 'generating') {
+      return;
+    }
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+  }
+}
+
 interface WorkflowState {
   stages: Stage[];
   currentStage: Stage | null;
@@ -27,7 +43,9 @@ export const useWorkflowStore = create<WorkflowState>((set, get) => ({
 
   fetchStages: async (projectId) => {
     try {
-      const stages = await stagesApi.list(projectId);
+      // Latest version of each stage with its payload, in one consistent
+      // read (the stage pages render input_data, output_data and selected_option)
+      const stages = await stagesApi.list(projectId, { latestOnly: true });
       set({ stages, error: null });
     } catch (error: any) {
       set({ error: error.message });
@@ -46,7 +64,9 @@ export const useWorkflowStore = create<WorkflowState>((set, get) => ({
   generate: async (projectId, stageType) => {
     set({ isGenerating: true, error: null });
     try {
-      const stage = await stagesApi.generate(projectId, stageType);
+      const job = await stagesApi.generate(projectId, stageType);
+      await waitForGeneration(projectId, job.id);
+      const stage = await stagesApi.getById(job.id);
       set((state) => ({
         stages: [...state.stages.filter((s) => s.type !== stageType), stage],
         currentStage: stage,
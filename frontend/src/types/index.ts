@@ -21,6 +21,12 @@ export interface Project {
   updated_at: string;
 }
 
+export interface ProjectPage {
+  items: Project[];
+  next_cursor: string | null;
+  has_more: boolean;
+}
+
 export interface ProjectWithStages extends Project {
   stages: StageInfo[];
 }
@@ -34,7 +40,7 @@ export interface StageInfo {
 
 // Stage types
 export type StageType = 'idea' | 'direction' | 'platform' | 'features' | 'demo' | 'prd' | 'testcases';
-export type StageStatus = 'pending' | 'generating' | 'completed' | 'confirmed';
+export type StageStatus = 'pending' | 'generating' | 'completed' | 'confirmed' | 'failed';
 
 // Platform types
 export interface PlatformSelection {
@@ -52,6 +58,22 @@ export interface Stage {
   output_data: Record<string, any> | null;
   selected_option: Record<string, any> | null;
   version: number;
+  payload_size?: number | null;
+  created_at: string;
+  updated_at: string;
+}
+
+export type StagePayloadField = 'input_data' | 'output_data' | 'selected_option';
+
+// Background stage generation (the job ID is the generating stage's ID)
+export interface GenerationJob {
+  job_id: string;
+  project_id: string;
+  stage_type: StageType;
+  status: StageStatus;
+  version: number;
+  error: string | null;
+  queued: boolean;
   created_at: string;
   updated_at: string;
 }
@@ -105,6 +127,12 @@ export interface Note {
   user_avatar: string | null;
 }
 
+export interface NotePage {
+  items: Note[];
+  next_cursor: string | null;
+  has_more: boolean;
+}
+
 // Demo types
 export interface DemoProject {
   project_name: string;
@@ -133,6 +161,7 @@ export interface DemoPage {
   status: 'pending' | 'generating' | 'completed' | 'error' | 'skipped';
   transitions: PageTransition[];
   error?: string;
+  version?: number;  // Sent back with page writes; a stale version is rejected (409)
 }
 
 export interface PageTransition {